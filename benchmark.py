@@ -0,0 +1,171 @@
+import argparse
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import main
+
+
+# Dataset -> (source file, stats column, fill column, encode column, primary
+# key column). Ames gets its "Order" id as primary key, so the keyset paths
+# (batched fill, encode, head/foot paging) are timed; HDI stays unkeyed
+DATASETS = {
+    'ames': ('AmesHousing.csv', 'SalePrice', 'Lot_Frontage', 'Neighborhood', 'Order_'),
+    'hdi': ('HDI.csv', 'col_2019', 'col_1990', 'Country', None),
+}
+
+
+def scale_dataset(source_path, target_path, scale):
+    # Stream `scale` copies of the data rows; an integer first column (the
+    # Ames "Order" id) is offset per copy so it stays unique
+    with open(source_path, 'r', encoding='utf-8', newline='') as source:
+        reader = csv.reader(source)
+        header = next(reader)
+        rows = list(reader)
+
+    offset_first = all(row and row[0].isdigit() for row in rows) and header[0].lower() == 'order'
+    with open(target_path, 'w', encoding='utf-8', newline='') as target:
+        writer = csv.writer(target)
+        writer.writerow(header)
+        for copy in range(scale):
+            if offset_first and copy:
+                writer.writerows([str(int(row[0]) + copy * len(rows))] + row[1:] for row in rows)
+            else:
+                writer.writerows(rows)
+    return len(rows) * scale
+
+
+def add_primary_key(connection, table_name, key_column):
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"ALTER TABLE {table_name} ADD PRIMARY KEY ({key_column})")
+    finally:
+        cursor.close()
+    main.schema_cache.invalidate(connection, table_name)
+    main.result_cache.invalidate(connection, table_name)
+
+
+def timed(results, dataset, scale, operation, function, *args, **kwargs):
+    start = time.perf_counter()
+    value = function(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    results.append({'dataset': dataset, 'scale': scale, 'operation': operation, 'seconds': round(elapsed, 6)})
+    print(f"{dataset:<6} {scale:>4}x {operation:<12} {elapsed:>9.3f}s")
+    return value
+
+
+def run_dataset(manager, connection, dataset, scale, data_dir):
+    source, stats_column, fill_column, encode_column, key_column = DATASETS[dataset]
+    path = os.path.join(data_dir, f"{dataset}_{scale}x.csv")
+    if not os.path.exists(path):
+        scale_dataset(source, path, scale)
+
+    table_name = f"bench_{dataset}_{scale}x"
+    cursor = connection.cursor()
+    cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
+    cursor.close()
+    main.schema_cache.invalidate(connection, table_name)
+
+    results = []
+    imported = timed(results, dataset, scale, 'import', main.import_data, connection, table_name, path,
+                     resumable=False)
+    # import_data reports errors and returns None; timing the rest against a
+    # missing or partial table would record meaningless numbers
+    with open(source, 'r', encoding='utf-8', newline='') as f:
+        expected = (sum(1 for _ in csv.reader(f)) - 1) * scale
+    if imported != expected:
+        raise RuntimeError(f"Import of '{path}' into {table_name} returned {imported} rows, expected {expected}")
+    if key_column:
+        timed(results, dataset, scale, 'primary_key', add_primary_key, connection, table_name, key_column)
+    timed(results, dataset, scale, 'stats', main.column_stats, connection, table_name, stats_column,
+          use_cache=False)
+    timed(results, dataset, scale, 'stats_client', main.column_stats, connection, table_name, stats_column,
+          pushdown=False, use_cache=False)
+    # Same client-side statistics through the pure-Python path, for comparison
+    timed(results, dataset, scale, 'stats_python', main.stream_column_stats, connection, table_name, stats_column,
+          vectorized=False)
+    timed(results, dataset, scale, 'stats_float', main.column_stats, connection, table_name, stats_column,
+          pushdown=False, use_cache=False, decimal_policy='float')
+    timed(results, dataset, scale, 'fill', main.fill_columns, connection, table_name, {fill_column: '2'})
+    timed(results, dataset, scale, 'encode', main.label_encode_column, connection, table_name, encode_column,
+          f"{encode_column}_code")
+    timed(results, dataset, scale, 'corr', main.correlation_matrix, connection, table_name,
+          use_cache=False)
+    timed(results, dataset, scale, 'head', main.head_rows, connection, table_name, 100)
+    timed(results, dataset, scale, 'foot', main.foot_rows, connection, table_name, 100)
+    return results
+
+
+def compare(results, baseline_path, threshold):
+    # Flag operations that got slower than the baseline by more than threshold
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {
+            (entry['dataset'], entry['scale'], entry['operation']): entry['seconds']
+            for entry in json.load(f)['results']
+        }
+    regressions = []
+    for entry in results:
+        before = baseline.get((entry['dataset'], entry['scale'], entry['operation']))
+        if before and entry['seconds'] > before * (1 + threshold):
+            regressions.append((entry, before))
+            print(f"REGRESSION {entry['dataset']} {entry['scale']}x {entry['operation']}: "
+                  f"{before:.3f}s -> {entry['seconds']:.3f}s")
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark PySql operations on scaled copies of the bundled datasets.")
+    parser.add_argument('--host', default=os.environ.get('MYSQL_HOST', 'localhost'))
+    parser.add_argument('--user', default=os.environ.get('MYSQL_USER', 'root'))
+    parser.add_argument('--password', default=os.environ.get('MYSQL_PWD', ''))
+    parser.add_argument('--database', default=os.environ.get('MYSQL_DATABASE', 'pysql_bench'))
+    parser.add_argument('--datasets', nargs='+', choices=sorted(DATASETS), default=sorted(DATASETS))
+    parser.add_argument('--scales', nargs='+', type=int, default=[1, 10, 100])
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'pysql_bench'))
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', metavar='BASELINE', help='earlier results file to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed slowdown before flagging (0.2 = 20%%)')
+    options = parser.parse_args(argv)
+
+    os.makedirs(options.data_dir, exist_ok=True)
+    manager = main.ConnectionManager(options.user, options.password, options.host, options.database,
+                                     pool_size=4)
+
+    results = []
+    with manager.connection() as connection:
+        for dataset in options.datasets:
+            for scale in options.scales:
+                results += run_dataset(manager, connection, dataset, scale, options.data_dir)
+    manager.close()
+
+    report = {
+        'revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(options.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to '{options.output}'")
+
+    if options.compare:
+        return 1 if compare(results, options.compare, options.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_benchmark())
@@ -1,55 +1,650 @@
-import mysql.connector
-from mysql.connector import Error
-from collections import Counter
+import argparse
+import cProfile
+from contextlib import contextmanager
 import csv
+import datetime
+import glob
+import gzip
+import hashlib
+import io
+import itertools
 import json
-from decimal import Decimal
+import math
+import os
+import pstats
+import random
+import re
+import shutil
+import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from statistics import NormalDist
+
+# mysql.connector is imported on first connect (see load_connector) so the
+# CLI starts quickly; until then nothing can raise the connector's errors
+mysql = None
+pooling = None
+
+
+class Error(Exception):
+    pass
+
+
+def load_connector():
+    global mysql, pooling, Error
+    if mysql is None:
+        import mysql.connector
+        from mysql.connector import Error, pooling
+    return mysql
+
+
+def row_bytes(row):
+    # Rough payload size of a fetched row (text/binary length, 8 bytes otherwise)
+    values = row.values() if isinstance(row, dict) else row
+    return sum(len(value) if isinstance(value, (str, bytes, bytearray)) else 8 for value in values)
+
+
+class Instrumentation:
+    # Per-operation wall time, time spent inside cursor calls (server plus
+    # network), client CPU time, query count, rows and approximate bytes
+    def __init__(self):
+        self.enabled = os.environ.get('PYSQL_INSTRUMENT') == '1'
+        self.slow_query_seconds = None
+        self.slow_query_log = None
+        self.profile = False
+        self.operations = {}
+        self._current = '(no operation)'
+        self._lock = threading.Lock()
+
+    def _metrics(self, name):
+        return self.operations.setdefault(name, {
+            'calls': 0, 'wall_seconds': 0.0, 'db_seconds': 0.0, 'cpu_seconds': 0.0,
+            'queries': 0, 'rows': 0, 'bytes': 0
+        })
+
+    @contextmanager
+    def operation(self, name):
+        if not self.enabled:
+            yield
+            return
+        previous, self._current = self._current, name
+        profiler = cProfile.Profile() if self.profile else None
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        if profiler:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+            with self._lock:
+                metrics = self._metrics(name)
+                metrics['calls'] += 1
+                metrics['wall_seconds'] += time.perf_counter() - wall_start
+                metrics['cpu_seconds'] += time.process_time() - cpu_start
+            self._current = previous
+            if profiler:
+                print(f"\nPython-side profile of '{name}':")
+                pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
+
+    def record(self, seconds, statement=None, rows=0, nbytes=0):
+        with self._lock:
+            metrics = self._metrics(self._current)
+            metrics['db_seconds'] += seconds
+            metrics['rows'] += rows
+            metrics['bytes'] += nbytes
+            if statement is not None:
+                metrics['queries'] += 1
+        if statement is not None and self.slow_query_seconds is not None and seconds >= self.slow_query_seconds:
+            line = f"{time.strftime('%Y-%m-%d %H:%M:%S')}\t{seconds:.3f}s\t{self._current}\t{' '.join(str(statement).split())}\n"
+            if self.slow_query_log:
+                with self._lock, open(self.slow_query_log, 'a', encoding='utf-8') as log:
+                    log.write(line)
+            else:
+                sys.stderr.write(line)
+
+    def summary(self, stream=None):
+        stream = stream or sys.stdout
+        print(f"{'operation':<20} {'calls':>6} {'wall s':>9} {'db s':>9} {'client s':>9} {'cpu s':>9} "
+              f"{'queries':>8} {'rows':>10} {'bytes':>12}", file=stream)
+        print("=" * 100, file=stream)
+        for name, metrics in self.operations.items():
+            client = max(metrics['wall_seconds'] - metrics['db_seconds'], 0.0)
+            print(f"{name[:20]:<20} {metrics['calls']:>6} {metrics['wall_seconds']:>9.3f} {metrics['db_seconds']:>9.3f} "
+                  f"{client:>9.3f} {metrics['cpu_seconds']:>9.3f} {metrics['queries']:>8} {metrics['rows']:>10} "
+                  f"{metrics['bytes']:>12}", file=stream)
+
+    def to_json(self, file_path):
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(self.operations, f, indent=2)
+
+    def wrap(self, connection):
+        return InstrumentedConnection(connection, self) if self.enabled else connection
+
+
+class InstrumentedCursor:
+    # Times every execute/fetch and counts rows; everything else passes through
+    def __init__(self, cursor, recorder):
+        self._cursor = cursor
+        self._recorder = recorder
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        iterator = iter(self._cursor)
+        while True:
+            start = time.perf_counter()
+            try:
+                row = next(iterator)
+            except StopIteration:
+                return
+            self._recorder.record(time.perf_counter() - start, rows=1, nbytes=row_bytes(row))
+            yield row
+
+    def execute(self, operation, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(operation, *args, **kwargs)
+        finally:
+            self._recorder.record(time.perf_counter() - start, operation)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        seq_params = list(seq_params)
+        start = time.perf_counter()
+        try:
+            return self._cursor.executemany(operation, seq_params, *args, **kwargs)
+        finally:
+            self._recorder.record(time.perf_counter() - start, operation, rows=len(seq_params),
+                                  nbytes=sum(row_bytes(row) for row in seq_params))
+
+    def _fetch(self, method, *args):
+        start = time.perf_counter()
+        result = method(*args)
+        rows = [] if result is None else [result] if method == self._cursor.fetchone else result
+        self._recorder.record(time.perf_counter() - start, rows=len(rows), nbytes=sum(row_bytes(row) for row in rows))
+        return result
+
+    def fetchone(self):
+        return self._fetch(self._cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self._fetch(self._cursor.fetchmany, *args)
+
+    def fetchall(self):
+        return self._fetch(self._cursor.fetchall)
+
+
+class InstrumentedConnection:
+    def __init__(self, connection, recorder):
+        self._connection = connection
+        self._recorder = recorder
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._connection.cursor(*args, **kwargs), self._recorder)
+
+
+instrumentation = Instrumentation()
+
+
+class PreparedStatements:
+    # Server-side prepared statements for the queries run over and over
+    # (batched fill UPDATEs, checkpoint writes, sample probes): one prepared
+    # cursor per (session, query text), so each is parsed once per session.
+    # Statements live on the session, which a pool checkout doesn't reset.
+    # Past max_statements on a session its oldest one is closed (by the
+    # thread holding that session, as a cursor is never shared).
+    def __init__(self, max_statements=64):
+        self.max_statements = max_statements
+        self._cursors = {}
+        self._lock = threading.Lock()
+
+    def execute(self, connection, query, params=()):
+        key = (connection.connection_id, query)
+        evicted = None
+        with self._lock:
+            entry = self._cursors.get(key)
+            if entry is None:
+                entry = self._cursors[key] = (connection.cursor(prepared=True), query)
+                session = [other for other in self._cursors if other[0] == key[0]]
+                if len(session) > self.max_statements:
+                    evicted = self._cursors.pop(session[0])
+        if evicted is not None:
+            try:
+                evicted[0].close()
+            except Error:
+                pass
+        cursor, prepared_query = entry
+        # The very same string object, so the cursor sees an already prepared statement
+        cursor.execute(prepared_query, params)
+        return cursor
+
+    def forget(self, session=None):
+        # Close the statements of one session (all of them without one)
+        with self._lock:
+            keys = [key for key in self._cursors if session is None or key[0] == session]
+            entries = [self._cursors.pop(key) for key in keys]
+        for cursor, _ in entries:
+            try:
+                cursor.close()
+            except Error:
+                pass
+
+
+prepared_statements = PreparedStatements()
+
+
+class ConnectionManager:
+    # Pooled connections that are health-checked on checkout, so long idle
+    # gaps don't surface as "MySQL server has gone away", and that can be
+    # handed to several workers at once
+    def __init__(self, username, password, host, database, pool_size=5, pool_name="pysql",
+                 allow_local_infile=False):
+        load_connector()
+        self.database = database
+        self.pool_size = pool_size
+        # Kept so worker processes can open their own connections
+        self.connection_config = {
+            'host': host,
+            'user': username,
+            'password': password,
+            'database': database,
+            'allow_local_infile': allow_local_infile
+        }
+        # Session reset would deallocate prepared statements, so keep it off
+        self._pool = pooling.MySQLConnectionPool(
+            pool_name=pool_name,
+            pool_size=pool_size,
+            pool_reset_session=False,
+            **self.connection_config
+        )
+        # The pool raises instead of blocking when exhausted; make callers wait
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._closed = False
+
+    def get_connection(self):
+        self._slots.acquire()
+        try:
+            connection = self._pool.get_connection()
+            self.ensure_alive(connection)
+            return instrumentation.wrap(connection)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, connection):
+        try:
+            if self._closed:
+                connection.disconnect()
+            connection.close()
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        connection = self.get_connection()
+        try:
+            yield connection
+        except Exception:
+            try:
+                connection.rollback()
+            except Error:
+                pass
+            raise
+        finally:
+            self.release(connection)
+
+    def ensure_alive(self, connection, attempts=3, delay=1):
+        old_id = connection.connection_id
+        connection.ping(reconnect=True, attempts=attempts, delay=delay)
+        if connection.connection_id != old_id:
+            # Statements prepared on the dropped session are gone
+            prepared_statements.forget(old_id)
+
+    def close(self):
+        # The pool has no public call to close its connections, so check out
+        # each idle one and disconnect it; any still checked out disconnect
+        # on release
+        self._closed = True
+        prepared_statements.forget()
+        while self._slots.acquire(blocking=False):
+            try:
+                connection = self._pool.get_connection()
+            except Error:
+                break
+            try:
+                connection.disconnect()
+            finally:
+                connection.close()
 
 
 def create_mysql_connection(username, password, host, database):
+    # A single unpooled connection, for callers that don't need a pool
+    load_connector()
     try:
-        connection = mysql.connector.connect(
-            host=host,
-            user=username,
-            password=password,
-            database=database
-        )
+        connection = mysql.connector.connect(host=host, user=username, password=password, database=database)
         if connection.is_connected():
             print(f"Connected to MySQL database '{database}'")
-            return connection
+            return instrumentation.wrap(connection)
     except Error as e:
         print(f"Error: {e}")
-        return None
+    return None
 
 
-def get_table_and_column_names(connection):
+def create_connection_pool(username, password, host, database, pool_size=5, allow_local_infile=False):
+    load_connector()
     try:
+        manager = ConnectionManager(username, password, host, database, pool_size,
+                                    allow_local_infile=allow_local_infile)
+        print(f"Connection pool of {pool_size} created for MySQL database '{database}'")
+        return manager
+    except Error as e:
+        print(f"Error: {e}")
+        return None
+
+
+def as_text(value):
+    # information_schema values come back as bytes on some connector versions
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode()
+    return value
+
+
+class SchemaCache:
+    # Table lists, column types and primary keys keyed by (database, table),
+    # reused for ttl seconds or until something that alters a table
+    # invalidates it
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._entries = {}
+        self._databases = {}
+        self._lock = threading.Lock()
+
+    def database(self, connection):
+        # Resolve the schema once per server session
+        session = connection.connection_id
+        database = self._databases.get(session)
+        if database is None:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT DATABASE()")
+                database = as_text(cursor.fetchone()[0])
+            finally:
+                cursor.close()
+            self._databases[session] = database
+        return database
+
+    def _get(self, connection, table_name, kind, query, params=()):
+        key = (self.database(connection), table_name, kind)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                return entry[1]
+
         cursor = connection.cursor()
+        try:
+            cursor.execute(query, params)
+            value = [tuple(as_text(item) for item in row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
 
-        # Get the list of tables in the database
-        cursor.execute("SHOW TABLES")
-        tables = [table[0] for table in cursor.fetchall()]
+        with self._lock:
+            self._entries[key] = (now, value)
+        return value
 
-        if not tables:
-            print("No tables found in the database.")
-            return None, None
+    def tables(self, connection):
+        return [row[0] for row in self._get(connection, None, 'tables', "SHOW TABLES")]
 
-        # Choose a table
-        print("Available tables:")
-        for idx, table in enumerate(tables):
-            print(f"{idx + 1}. {table}")
+    def columns(self, connection, table_name):
+        # [(column name, lower-case data type)] in table order
+        rows = self._get(
+            connection, table_name, 'columns',
+            "SELECT COLUMN_NAME, DATA_TYPE FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s ORDER BY ORDINAL_POSITION",
+            (table_name,)
+        )
+        return [(column_name, data_type.lower()) for column_name, data_type in rows]
+
+    def primary_key(self, connection, table_name):
+        rows = self._get(
+            connection, table_name, 'primary_key',
+            "SELECT COLUMN_NAME FROM information_schema.KEY_COLUMN_USAGE "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND CONSTRAINT_NAME = 'PRIMARY' "
+            "ORDER BY ORDINAL_POSITION",
+            (table_name,)
+        )
+        return [row[0] for row in rows]
+
+    def numeric_formats(self, connection, table_name):
+        # {column name: (NUMERIC_PRECISION, NUMERIC_SCALE)}, Nones where they don't apply
+        rows = self._get(
+            connection, table_name, 'numeric_formats',
+            "SELECT COLUMN_NAME, NUMERIC_PRECISION, NUMERIC_SCALE FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            (table_name,)
+        )
+        return {
+            column_name: tuple(None if item is None else int(item) for item in (precision, scale))
+            for column_name, precision, scale in rows
+        }
+
+    def octet_lengths(self, connection, table_name):
+        # {column name: CHARACTER_OCTET_LENGTH}, None for non-character columns
+        rows = self._get(
+            connection, table_name, 'octet_lengths',
+            "SELECT COLUMN_NAME, CHARACTER_OCTET_LENGTH FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            (table_name,)
+        )
+        return {column_name: None if length is None else int(length) for column_name, length in rows}
+
+    def invalidate(self, connection=None, table_name=None):
+        # No arguments drops everything; a table also drops the table list.
+        # The database is looked up (and remembered) even for a connection
+        # that hasn't read anything through the cache yet.
+        database = None if connection is None else self.database(connection)
+        with self._lock:
+            if connection is None:
+                self._entries.clear()
+                return
+            for key in list(self._entries):
+                if key[0] == database and (table_name is None or key[1] in (table_name, None)):
+                    del self._entries[key]
+
+
+schema_cache = SchemaCache()
+
+
+def encode_cached_value(value):
+    # JSON can't hold the connector's Decimal/date values; tag them instead
+    if isinstance(value, Decimal):
+        return {'__decimal__': str(value)}
+    if isinstance(value, datetime.datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {'__date__': value.isoformat()}
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+def decode_cached_value(value):
+    if '__decimal__' in value:
+        return Decimal(value['__decimal__'])
+    if '__datetime__' in value:
+        return datetime.datetime.fromisoformat(value['__datetime__'])
+    if '__date__' in value:
+        return datetime.date.fromisoformat(value['__date__'])
+    return value
+
+
+class ResultCache:
+    # Column statistics and correlation matrices on disk, one directory per
+    # (database, table). An entry is reused only while the table's change
+    # fingerprint is unchanged, so untouched tables never get rescanned.
+    def __init__(self, directory=None):
+        self.directory = directory or os.environ.get(
+            'PYSQL_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'pysql')
+        )
+        self.enabled = os.environ.get('PYSQL_NO_CACHE') != '1'
+        # Keep column states up to date through imports, fills and encodings
+        # (see ColumnStateTracker)
+        self.track_states = os.environ.get('PYSQL_TRACK_STATES') == '1'
+        # (database, table) -> CHECKSUM TABLE result and what it was taken
+        # against, also kept on disk for later processes
+        self._checksums = {}
+        self._lock = threading.Lock()
+
+    def _table_directory(self, connection, table_name):
+        database = schema_cache.database(connection)
+        return os.path.join(self.directory, re.sub(r'[^\w.-]', '_', database or ''), re.sub(r'[^\w.-]', '_', table_name))
+
+    def _path(self, connection, table_name, kind, params):
+        digest = hashlib.sha1(json.dumps([kind, params], default=str).encode('utf-8')).hexdigest()
+        return os.path.join(self._table_directory(connection, table_name), f"{kind}-{digest}.json")
+
+    def _write(self, path, entry):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so concurrent readers never see half a file
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, default=encode_cached_value)
+        os.replace(temporary, path)
+
+    def _checksum_path(self, connection, table_name):
+        # Inside the table directory, so invalidate() drops it with the results
+        return os.path.join(self._table_directory(connection, table_name), 'checksum.json')
+
+    def _checksum(self, connection, cursor, table_name, table_state):
+        # UPDATE_TIME is NULL until a table is first written after a server
+        # restart (or after InnoDB evicts it from the dictionary cache). A
+        # checksum is reused while the server hasn't restarted and
+        # CREATE_TIME/TABLE_ROWS/DATA_LENGTH are as they were; our own writes
+        # invalidate it, and so does seeing UPDATE_TIME set (_forget_checksum)
+        cursor.execute("SHOW GLOBAL STATUS LIKE 'Uptime'")
+        boot_time = time.time() - int(cursor.fetchone()[1])
+        key = (schema_cache.database(connection), table_name)
+        path = self._checksum_path(connection, table_name)
+        with self._lock:
+            memo = self._checksums.get(key)
+        if memo is None and self.enabled:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    memo = json.load(f)
+            except (OSError, ValueError):
+                memo = None
+        # A few seconds of slack for the client/server clock drifting apart
+        if memo is not None and memo.get('table') == table_state and abs(memo['boot_time'] - boot_time) < 5:
+            checksum = memo['checksum']
+        else:
+            cursor.execute(f"CHECKSUM TABLE {table_name}")
+            checksum = cursor.fetchone()[1]
+            memo = {'boot_time': boot_time, 'table': table_state, 'checksum': checksum}
+            if self.enabled:
+                self._write(path, memo)
+        with self._lock:
+            self._checksums[key] = memo
+        return checksum
+
+    def _forget_checksum(self, connection, table_name):
+        with self._lock:
+            self._checksums.pop((schema_cache.database(connection), table_name), None)
+        try:
+            os.remove(self._checksum_path(connection, table_name))
+        except OSError:
+            pass
+
+    def fingerprint(self, connection, table_name):
+        # UPDATE_TIME/row estimate/size from information_schema when the
+        # server tracks them, otherwise a (memoized) CHECKSUM TABLE; the
+        # column definitions are included so ALTERs invalidate too
+        cursor = connection.cursor()
+        try:
+            try:
+                # MySQL 8 caches these statistics for a day by default
+                cursor.execute("SET SESSION information_schema_stats_expiry = 0")
+            except Error:
+                pass
+            cursor.execute(
+                "SELECT UPDATE_TIME, TABLE_ROWS, DATA_LENGTH, CREATE_TIME FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                (table_name,)
+            )
+            result = cursor.fetchone()
+            if result is None or result[0] is None:
+                table_state = [str(item) for item in (result or (None,) * 4)[1:]]
+                result = ('checksum', self._checksum(connection, cursor, table_name, table_state), *table_state)
+            else:
+                # Written since any checksum was taken
+                self._forget_checksum(connection, table_name)
+        finally:
+            cursor.close()
+        return json.dumps([[str(item) for item in result], schema_cache.columns(connection, table_name)])
+
+    def get(self, connection, table_name, kind, params, fingerprint):
+        if not self.enabled:
+            return None
+        try:
+            with open(self._path(connection, table_name, kind, params), 'r', encoding='utf-8') as f:
+                entry = json.load(f, object_hook=decode_cached_value)
+        except (OSError, ValueError):
+            return None
+        return entry['value'] if entry.get('fingerprint') == fingerprint else None
+
+    def put(self, connection, table_name, kind, params, fingerprint, value):
+        if not self.enabled:
+            return
+        self._write(self._path(connection, table_name, kind, params), {'fingerprint': fingerprint, 'value': value})
+
+    def invalidate(self, connection, table_name):
+        with self._lock:
+            self._checksums.pop((schema_cache.database(connection), table_name), None)
+        shutil.rmtree(self._table_directory(connection, table_name), ignore_errors=True)
+
+    def _states_path(self, connection, table_name):
+        # Beside the table directory rather than in it, so invalidate() keeps
+        # the incrementally maintained column states
+        return self._table_directory(connection, table_name) + '.states.json'
+
+    def load_states(self, connection, table_name, fingerprint):
+        # {column name: ColumnState} if they describe the table as it is now
+        if not self.enabled:
+            return None
+        try:
+            with open(self._states_path(connection, table_name), 'r', encoding='utf-8') as f:
+                entry = json.load(f, object_hook=decode_cached_value)
+        except (OSError, ValueError):
+            return None
+        if entry.get('fingerprint') != fingerprint:
+            return None
+        return {column: ColumnState.from_dict(state) for column, state in entry['columns'].items()}
+
+    def save_states(self, connection, table_name, fingerprint, states):
+        if not self.enabled:
+            return
+        self._write(self._states_path(connection, table_name), {
+            'fingerprint': fingerprint, 'columns': {column: state.to_dict() for column, state in states.items()}
+        })
 
-        table_idx = int(input("Enter the index of the table: ")) - 1
 
-        if table_idx < 0 or table_idx >= len(tables):
-            print("Invalid table index.")
-            return None, None
+result_cache = ResultCache()
+
 
-        table_name = tables[table_idx]
+def get_table_and_column_names(connection):
+    try:
+        table_name = get_table_name(connection)
+        if table_name is None:
+            return None, None
 
         # Get the list of columns in the chosen table
-        cursor.execute(f"SHOW COLUMNS FROM {table_name}")
-        columns = [column[0] for column in cursor.fetchall()]
+        columns = get_column_names(connection, table_name)
 
         # Choose a column
         print("Available columns:")
@@ -69,37 +664,196 @@ def get_table_and_column_names(connection):
     except Error as e:
         print(f"Error getting table and column names: {e}")
         return None, None
-    finally:
-        if 'cursor' in locals():
-            cursor.close()
 
 
 def describe_table(connection, table_name):
     try:
-        cursor = connection.cursor(dictionary=True)
-
-        # Get column information from information_schema.COLUMNS
-        describe_query = f"SELECT COLUMN_NAME, DATA_TYPE FROM information_schema.COLUMNS WHERE TABLE_NAME = '{table_name}'"
-        cursor.execute(describe_query)
-        columns_info = cursor.fetchall()
+        # Column information from information_schema.COLUMNS, via the schema cache
+        columns_info = schema_cache.columns(connection, table_name)
 
         # Display column information
         print(f"\nColumn Information for '{table_name}':")
         print("===================================")
-        for col_info in columns_info:
-            print(f"{col_info['COLUMN_NAME']:<20} {col_info['DATA_TYPE']:<20}")
+        for column_name, data_type in columns_info:
+            print(f"{column_name:<20} {data_type:<20}")
 
     except Error as e:
         print(f"Error describing table: {e}")
+
+
+def get_primary_key(connection, table_name):
+    return schema_cache.primary_key(connection, table_name)
+
+
+def table_is_empty(connection, table_name):
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"SELECT 1 FROM {table_name} LIMIT 1")
+        return cursor.fetchone() is None
     finally:
-        if 'cursor' in locals():
+        cursor.close()
+
+
+PROGRESS_TABLE = 'pysql_progress'
+
+
+class JobProgress:
+    # Checkpoint row of one resumable import or fill. save() runs on the
+    # job's own connection right before each batch commit, so a batch and its
+    # checkpoint commit together: a job that dies resumes right after its
+    # last committed batch, never repeating or skipping one. The row is
+    # cleared in the job's final commit, so only jobs in flight have one.
+    def __init__(self, connection, kind, table_name, key):
+        self.connection = connection
+        self.kind = kind
+        self.table_name = table_name
+        self.key = key
+        self.job_id = f"{kind}:{hashlib.sha1(f'{table_name}:{key}'.encode('utf-8')).hexdigest()}"
+        self.position = 0
+        self.detail = None
+
+    def load(self, restart=False):
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {PROGRESS_TABLE} ("
+                f"job_id VARCHAR(64) PRIMARY KEY, kind VARCHAR(16) NOT NULL, table_name VARCHAR(64) NOT NULL, "
+                f"job_key TEXT, position BIGINT NOT NULL DEFAULT 0, detail TEXT, "
+                f"updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP) ENGINE=InnoDB"
+            )
+            if restart:
+                cursor.execute(f"DELETE FROM {PROGRESS_TABLE} WHERE job_id = %s", (self.job_id,))
+                self.connection.commit()
+            cursor.execute(f"SELECT position, detail FROM {PROGRESS_TABLE} WHERE job_id = %s", (self.job_id,))
+            row = cursor.fetchone()
+        finally:
             cursor.close()
 
+        if row is not None:
+            self.position = row[0]
+            self.detail = None if row[1] is None else json.loads(as_text(row[1]), object_hook=decode_cached_value)
+        return self
+
+    def save(self, position, detail=None):
+        # Part of the caller's transaction; the caller commits
+        prepared_statements.execute(
+            self.connection,
+            f"INSERT INTO {PROGRESS_TABLE} (job_id, kind, table_name, job_key, position, detail) "
+            f"VALUES (%s, %s, %s, %s, %s, %s) "
+            f"ON DUPLICATE KEY UPDATE position = VALUES(position), detail = VALUES(detail)",
+            (self.job_id, self.kind, self.table_name, self.key, position,
+             None if detail is None else json.dumps(detail, default=encode_cached_value))
+        )
+        self.position, self.detail = position, detail
+
+    def clear(self):
+        # Also part of the caller's (final) transaction
+        prepared_statements.execute(self.connection, f"DELETE FROM {PROGRESS_TABLE} WHERE job_id = %s", (self.job_id,))
+
+
+def fill_columns(connection, table_name, fill_methods, batch_size=50000, resumable=True, restart=False):
+    # fill_methods maps column name -> fill method ("1" mean, "2" median, "3" mode)
+    result_cache.invalidate(connection, table_name)
+    tracker = ColumnStateTracker(connection, table_name).begin()
+    progress = None
+    if resumable:
+        progress = JobProgress(connection, 'fill', table_name, json.dumps(sorted(fill_methods.items()))).load(restart)
+
+    if progress is not None and progress.detail:
+        # The rows already filled would skew a recomputed mean or median, so
+        # an interrupted fill carries on with the values it started with
+        fill_values = progress.detail
+        print(f"Resuming fill of '{table_name}' from key {progress.position}.")
+    else:
+        fill_values = {}
+        for column_name, fill_method in fill_methods.items():
+            fill_value = calculate_fill_value(connection, table_name, column_name, fill_method)
+            if fill_value is not None:
+                fill_values[column_name] = fill_value
+    if not fill_values:
+        return 0
+
+    # Every column is filled by the same UPDATE, so the table is scanned once
+    set_clause = ', '.join(f"{column} = COALESCE({column}, %s)" for column in fill_values)
+    null_clause = ' OR '.join(f"{column} IS NULL" for column in fill_values)
+    params = tuple(fill_values.values())
+
+    cursor = connection.cursor()
+    try:
+        primary_key = get_primary_key(connection, table_name)
+        if len(primary_key) != 1:
+            cursor.execute(f"UPDATE {table_name} SET {set_clause} WHERE {null_clause}", params)
+            connection.commit()
+            updated = cursor.rowcount
+        else:
+            updated = fill_key_ranges(connection, cursor, table_name, primary_key[0], set_clause, null_clause,
+                                      params, batch_size, progress, fill_values)
+    finally:
+        cursor.close()
+
+    # Every NULL in a filled column now holds its fill value
+    for column_name, fill_value in fill_values.items():
+        tracker.fill(column_name, fill_value)
+    tracker.commit()
+    return updated
+
+
+def fill_key_ranges(connection, cursor, table_name, key, set_clause, null_clause, params, batch_size,
+                    progress=None, fill_values=None):
+    # Walk the primary key in batches of batch_size rows and commit each one,
+    # so a large table isn't locked by one huge transaction. Each batch ends
+    # at the key batch_size rows further on (found through the index), so
+    # sparse keys cost no empty UPDATEs. With a progress row each commit also
+    # records where the next batch starts, and a resumed fill starts there.
+    # The statements repeated per batch are prepared once.
+    cursor.execute(f"SELECT MIN({key}) FROM {table_name}")
+    start = cursor.fetchone()[0]
+    if start is None:
+        return 0
+    if not isinstance(start, int):
+        cursor.execute(f"UPDATE {table_name} SET {set_clause} WHERE {null_clause}", params)
+        connection.commit()
+        return cursor.rowcount
+
+    if progress is not None and progress.detail:
+        start = max(start, progress.position)
+    updated = 0
+    while True:
+        rows = prepared_statements.execute(
+            connection,
+            f"SELECT {key} FROM {table_name} WHERE {key} >= %s ORDER BY {key} LIMIT 1 OFFSET {batch_size}",
+            (start,)
+        ).fetchall()
+        end = rows[0][0] if rows else None
+        if end is None:
+            update = prepared_statements.execute(
+                connection,
+                f"UPDATE {table_name} SET {set_clause} WHERE {key} >= %s AND ({null_clause})",
+                params + (start,)
+            )
+        else:
+            update = prepared_statements.execute(
+                connection,
+                f"UPDATE {table_name} SET {set_clause} WHERE {key} >= %s AND {key} < %s AND ({null_clause})",
+                params + (start, end)
+            )
+        updated += update.rowcount
+        if progress is not None:
+            if end is None:
+                progress.clear()
+            else:
+                progress.save(end, fill_values)
+        connection.commit()
+        if end is None:
+            return updated
+        start = end
+
 
 def fill_missing_values(connection):
     try:
-        cursor = connection.cursor()
         table_name, column_name = get_table_and_column_names(connection)
+        if table_name is None:
+            return
 
         # Prompt user for fill method
         print("Choose fill method:")
@@ -112,177 +866,1175 @@ def fill_missing_values(connection):
             print("Invalid choice.")
             return
 
-        # Calculate fill value based on the chosen method
-        fill_value = calculate_fill_value(connection, table_name, column_name, fill_method_choice)
+        # Calculate fill values and update the table in one pass
+        updated = fill_columns(connection, table_name, {column_name: fill_method_choice})
 
-        # Update the table to fill missing values
-        update_query = f"UPDATE {table_name} SET {column_name} = {fill_value} WHERE {column_name} IS NULL"
-        cursor.execute(update_query)
-
-        # Commit the changes
-        connection.commit()
-
-        print(f"Missing values filled in column '{column_name}' using method {fill_method_choice}.")
+        print(f"{updated} missing values filled in column '{column_name}' using method {fill_method_choice}.")
 
     except Error as e:
         print(f"Error filling missing values: {e}")
-    finally:
-        if 'cursor' in locals():
-            cursor.close()
 
 
 def calculate_fill_value(connection, table_name, column_name, fill_method):
-    cursor = connection.cursor()
-
-    # Get all values from the specified column
-    cursor.execute(f"SELECT {column_name} FROM {table_name} WHERE {column_name} IS NOT NULL")
-    values = [row[0] for row in cursor.fetchall()]
-
-    # Calculate fill value based on the chosen method
+    # All three methods run in the database; only the fill value comes back
     if fill_method == "1":
-        fill_value = sum(values) / len(values) if values else None  # Mean
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"SELECT AVG({column_name}) FROM {table_name}")
+            return cursor.fetchone()[0]  # Mean
+        finally:
+            cursor.close()
     elif fill_method == "2":
-        values.sort()
-        n = len(values)
-        fill_value = (values[n // 2] + values[(n - 1) // 2]) / 2 if values else None  # Median
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"SELECT COUNT({column_name}) FROM {table_name}")
+            n = cursor.fetchone()[0]
+        finally:
+            cursor.close()
+        if n == 0:
+            return None
+        order_stats = query_column_order_stats(connection, table_name, column_name, [n // 2, (n - 1) // 2])
+        return (order_stats[n // 2] + order_stats[(n - 1) // 2]) / 2  # Median
     elif fill_method == "3":
-        fill_value = max(set(values), key=values.count) if values else None  # Mode
+        return query_column_mode(connection, table_name, column_name)  # Mode
     else:
         print("Invalid fill method.")
-        fill_value = None
+        return None
 
-    cursor.close()
-    return fill_value
+
+def stream_rows(connection, query, params=()):
+    # Rows are yielded as they arrive instead of being buffered client-side
+    cursor = connection.cursor(dictionary=True, buffered=False)
+    try:
+        cursor.execute(query, params)
+        for row in cursor:
+            yield row
+    finally:
+        cursor.close()
+
+
+def page_rows(connection, table_name, key, num_rows, after=None, before=None, last=False):
+    # Keyset pagination on the primary key: every page is an index range
+    # scan, no OFFSET, and rows always come back in ascending key order
+    order = ', '.join(key)
+    descending = ', '.join(f"{column} DESC" for column in key)
+    placeholders = ', '.join(['%s' for _ in key])
+
+    if after is not None:
+        query = f"SELECT * FROM {table_name} WHERE ({order}) > ({placeholders}) ORDER BY {order} LIMIT {num_rows}"
+        params = tuple(after)
+    elif before is not None or last:
+        condition = f"WHERE ({order}) < ({placeholders}) " if before is not None else ""
+        query = (
+            f"SELECT * FROM (SELECT * FROM {table_name} {condition}ORDER BY {descending} LIMIT {num_rows}) AS page "
+            f"ORDER BY {order}"
+        )
+        params = tuple(before) if before is not None else ()
+    else:
+        query = f"SELECT * FROM {table_name} ORDER BY {order} LIMIT {num_rows}"
+        params = ()
+    return stream_rows(connection, query, params)
+
+
+def print_rows(rows, key):
+    # Print rows one by one and return the keys of the first and last row
+    first_key = last_key = None
+    for row in rows:
+        print(row)
+        if key:
+            last_key = tuple(row[column] for column in key)
+            if first_key is None:
+                first_key = last_key
+    return first_key, last_key
+
+
+def head_rows(connection, table_name, num_rows=5):
+    key = get_primary_key(connection, table_name)
+    if key:
+        return list(page_rows(connection, table_name, key, num_rows))
+    return list(stream_rows(connection, f"SELECT * FROM {table_name} LIMIT {num_rows}"))
+
+
+def foot_rows(connection, table_name, num_rows=5):
+    key = get_primary_key(connection, table_name)
+    if key:
+        return list(page_rows(connection, table_name, key, num_rows, last=True))
+    # Without a key there is no order to reverse; skip to the last rows of a
+    # plain scan instead of sorting the whole table
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+        total = cursor.fetchone()[0]
+    finally:
+        cursor.close()
+    return list(stream_rows(connection, f"SELECT * FROM {table_name} LIMIT {num_rows} OFFSET {max(total - num_rows, 0)}"))
 
 
 def head(connection, table_name, num_rows=5):
     try:
-        cursor = connection.cursor(dictionary=True)
-        query = f"SELECT * FROM {table_name} LIMIT {num_rows}"
-        cursor.execute(query)
-        rows = cursor.fetchall()
-
+        rows = head_rows(connection, table_name, num_rows)
+        key = get_primary_key(connection, table_name)
         print(f"Top {num_rows} rows of table '{table_name}':")
-        for row in rows:
-            print(row)
+        return key, print_rows(rows, key)
 
     except Error as e:
         print(f"Error fetching data: {e}")
-    finally:
-        if 'cursor' in locals():
-            cursor.close()
+        return None, (None, None)
 
 
 def foot(connection, table_name, num_rows=5):
     try:
-        cursor = connection.cursor(dictionary=True)
-        query = f"SELECT * FROM {table_name} ORDER BY 1 DESC LIMIT {num_rows}"
-        cursor.execute(query)
-        rows = cursor.fetchall()
-
+        rows = foot_rows(connection, table_name, num_rows)
+        key = get_primary_key(connection, table_name)
         print(f"Bottom {num_rows} rows of table '{table_name}':")
-        for row in rows:
-            print(row)
+        return key, print_rows(rows, key)
 
     except Error as e:
         print(f"Error fetching data: {e}")
-    finally:
-        if 'cursor' in locals():
-            cursor.close()
+        return None, (None, None)
 
 
-def create_categorical_encoding(connection):
-    try:
-        cursor = connection.cursor()
-        table_name, existing_column = get_table_and_column_names(connection)
+def browse_pages(connection, table_name, key, num_rows, first_key, last_key):
+    # Interactive next/previous paging after head or foot
+    if not key or first_key is None:
+        return
+    while True:
+        direction = input("Enter n for next page, p for previous page, anything else to stop: ").strip().lower()
+        if direction == "n":
+            rows = page_rows(connection, table_name, key, num_rows, after=last_key)
+        elif direction == "p":
+            rows = page_rows(connection, table_name, key, num_rows, before=first_key)
+        else:
+            return
+        try:
+            page_first, page_last = print_rows(rows, key)
+        except Error as e:
+            print(f"Error fetching data: {e}")
+            return
+        if page_first is None:
+            print("No more rows.")
+        else:
+            first_key, last_key = page_first, page_last
 
-        new_column = input("Enter new column name for encoding: ")
 
-        # Build the SQL query to create a new column for categorical encoding
-        query = f"ALTER TABLE {table_name} ADD COLUMN {new_column} INT"
-        cursor.execute(query)
+# InnoDB's index key limit, and the types it can't index whole at any length
+INDEX_KEY_BYTES = 3072
+UNINDEXABLE_TYPES = ('tinytext', 'text', 'mediumtext', 'longtext',
+                     'tinyblob', 'blob', 'mediumblob', 'longblob', 'json')
 
-        # Get distinct values from the existing column
-        distinct_values_query = f"SELECT DISTINCT {existing_column} FROM {table_name} WHERE {existing_column} IS NOT NULL"
-        cursor.execute(distinct_values_query)
-        distinct_values = [row[0] for row in cursor.fetchall()]
 
-        # Create a mapping dictionary for encoding
-        encoding_map = {value: index + 1 for index, value in enumerate(distinct_values)}
+def label_encode_column(connection, table_name, existing_column, new_column, mapping_table=None):
+    # Existing columns are untouched, so their states carry over the ALTER
+    tracker = ColumnStateTracker(connection, table_name).begin()
+    if mapping_table and mapping_table in schema_cache.tables(connection):
+        hashed = any(name == 'category_hash' for name, _ in schema_cache.columns(connection, mapping_table))
+    else:
+        # Values that can't be a UNIQUE key whole (a VARCHAR(1024) is 4KB in
+        # utf8mb4) are keyed (and joined) by their SHA-256 instead; shorter
+        # ones join directly on the collated value
+        data_type = get_column_data_type(connection, table_name, existing_column)
+        octet_length = schema_cache.octet_lengths(connection, table_name).get(existing_column)
+        hashed = (data_type or '').lower() in UNINDEXABLE_TYPES or (octet_length or 0) > INDEX_KEY_BYTES
+    category_key = 'category_hash' if hashed else 'category'
+    key_columns = "category_hash BINARY(32) NOT NULL, " if hashed else ""
+    key_select = f", UNHEX(SHA2({existing_column}, 256)) AS category_hash" if hashed else ""
+    source_key = f"UNHEX(SHA2(t.{existing_column}, 256))" if hashed else f"t.{existing_column}"
 
-        # Update the new column with categorical encoding based on the existing column
-        for value, encoding in encoding_map.items():
-            update_query = f"UPDATE {table_name} SET {new_column} = {encoding} WHERE {existing_column} = '{value}'"
-            cursor.execute(update_query)
+    cursor = connection.cursor()
+    try:
+        # The codes live in a mapping table keyed by category; a persistent
+        # one is only topped up with unseen categories, so earlier codes are
+        # reused. The ALTER commits implicitly, so a failed UPDATE leaves the
+        # new column in place with NULL codes
+        if mapping_table:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {mapping_table} "
+                f"(code INT AUTO_INCREMENT PRIMARY KEY, {key_columns}UNIQUE KEY ({category_key})) "
+                f"SELECT {existing_column} AS category{key_select} FROM {table_name} WHERE 1 = 0"
+            )
+            schema_cache.invalidate(connection, mapping_table)
+            cursor.execute(
+                f"INSERT INTO {mapping_table} (category{', category_hash' if hashed else ''}) "
+                f"SELECT DISTINCT t.{existing_column}{f', {source_key}' if hashed else ''} FROM {table_name} AS t "
+                f"LEFT JOIN {mapping_table} AS m ON {source_key} = m.{category_key} "
+                f"WHERE t.{existing_column} IS NOT NULL AND m.{category_key} IS NULL "
+                f"ORDER BY t.{existing_column}"
+            )
+            map_name = mapping_table
+        else:
+            # Hashed so long table and column names stay within 64 characters
+            map_name = f"tmp_codes_{hashlib.sha1(f'{table_name}.{existing_column}'.encode('utf-8')).hexdigest()[:16]}"
+            cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {map_name}")
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {map_name} "
+                f"(code INT AUTO_INCREMENT PRIMARY KEY, {key_columns}UNIQUE KEY ({category_key})) "
+                f"SELECT DISTINCT {existing_column} AS category{key_select} FROM {table_name} "
+                f"WHERE {existing_column} IS NOT NULL ORDER BY {existing_column}"
+            )
+
+        cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN {new_column} INT")
+        schema_cache.invalidate(connection, table_name)
+        result_cache.invalidate(connection, table_name)
+
+        # One joined UPDATE instead of a full scan per distinct value
+        cursor.execute(
+            f"UPDATE {table_name} AS t JOIN {map_name} AS m ON {source_key} = m.{category_key} "
+            f"SET t.{new_column} = m.code"
+        )
 
-        # Commit the changes
+        if not mapping_table:
+            cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {map_name}")
         connection.commit()
+        tracker.commit()
+    finally:
+        cursor.close()
 
-        print(f"New categorical encoding column '{new_column}' created in MySQL table '{table_name}'")
-    except Error as e:
-        print(f"Error creating categorical encoding column in MySQL: {e}")
+
+def one_hot_encode_column(connection, table_name, existing_column, prefix, max_categories=64):
+    cursor = connection.cursor()
+    try:
+        cursor.execute(
+            f"SELECT DISTINCT {existing_column} FROM {table_name} "
+            f"WHERE {existing_column} IS NOT NULL ORDER BY {existing_column} LIMIT {max_categories + 1}"
+        )
+        categories = [row[0] for row in cursor.fetchall()]
+        if len(categories) > max_categories:
+            print(f"Column '{existing_column}' has more than {max_categories} categories; use label encoding instead.")
+            return []
+
+        new_columns = []
+        for value in categories:
+            column = f"{prefix}_{re.sub(r'[^0-9A-Za-z_]', '_', str(value))}"
+            # Distinct values can collapse to the same name once sanitised
+            while column in new_columns:
+                column += "_"
+            new_columns.append(column)
+
+        # Add every indicator column in one ALTER and fill them in one UPDATE
+        tracker = ColumnStateTracker(connection, table_name).begin()
+        cursor.execute(
+            f"ALTER TABLE {table_name} "
+            f"{', '.join(f'ADD COLUMN {column} TINYINT NOT NULL DEFAULT 0' for column in new_columns)}"
+        )
+        schema_cache.invalidate(connection, table_name)
+        result_cache.invalidate(connection, table_name)
+        cursor.execute(
+            f"UPDATE {table_name} SET "
+            f"{', '.join(f'{column} = ({existing_column} <=> %s)' for column in new_columns)}",
+            tuple(categories)
+        )
+        connection.commit()
+        tracker.commit()
+        return new_columns
     finally:
-        if 'cursor' in locals():
-            cursor.close()
+        cursor.close()
 
 
-def calculate_stats(data):
-    count = len(data)
-    total = sum(data)
-    mean = total / count if count > 0 else None
-    sorted_data = sorted(data)
-    mid = count // 2
-    median = (sorted_data[mid] + sorted_data[mid - 1]) / 2 if count % 2 == 0 else sorted_data[mid]
-    mode_result = Counter(data).most_common(1)
-    mode = mode_result[0][0] if mode_result else None
-    variance = float(sum((x - mean) ** 2 for x in data) / count) if count > 0 else None
-    std_dev = variance ** 0.5 if variance is not None else None
-    min_value = min(data) if count > 0 else None
-    max_value = max(data) if count > 0 else None
-    range_value = max_value - min_value if count > 0 else None
-    interquartile_range = (
-            sorted_data[int(0.75 * count)] - sorted_data[int(0.25 * count)]
-    ) if count > 0 else None
-    skewness = (
-            float(float((sum((x - mean) ** 3 for x in data)) / count)) /
-            ((variance ** 1.5) if variance is not None else None)
-    ) if count > 0 else None
-    kurtosis = (
-                       (float(sum((x - mean) ** 4 for x in data)) / count) /
-                       ((variance ** 2) if variance is not None else None)
-               ) - 3 if count > 0 else None
+def create_categorical_encoding(connection):
+    try:
+        table_name, existing_column = get_table_and_column_names(connection)
+        if table_name is None:
+            return
+
+        print("Choose encoding:")
+        print("1. Label (one integer column)")
+        print("2. One-hot (one 0/1 column per category)")
+        encoding_choice = input("Enter your choice: ")
+
+        if encoding_choice == "1":
+            new_column = input("Enter new column name for encoding: ")
+            mapping_table = input("Enter mapping table to persist codes in (blank for none): ").strip()
+            label_encode_column(connection, table_name, existing_column, new_column, mapping_table or None)
+            print(f"New categorical encoding column '{new_column}' created in MySQL table '{table_name}'")
+        elif encoding_choice == "2":
+            prefix = input("Enter prefix for the new columns: ")
+            new_columns = one_hot_encode_column(connection, table_name, existing_column, prefix)
+            if new_columns:
+                print(f"{len(new_columns)} one-hot columns created in MySQL table '{table_name}'")
+        else:
+            print("Invalid choice.")
+    except Error as e:
+        print(f"Error creating categorical encoding column in MySQL: {e}")
+
 
+NUMERIC_TYPES = {
+    'tinyint', 'smallint', 'mediumint', 'int', 'integer', 'bigint',
+    'decimal', 'numeric', 'float', 'double', 'real', 'bit', 'year'
+}
+
+
+def get_column_data_type(connection, table_name, column_name):
+    for name, data_type in schema_cache.columns(connection, table_name):
+        if name == column_name:
+            return data_type
+    return None
+
+
+def moments_to_stats(count, mean, m2, m3, m4):
+    # m2..m4 are sums of squared/cubed/fourth-power deviations from the mean
+    if count == 0:
+        return None, None, None, None
+    variance = float(m2) / count
+    std_dev = variance ** 0.5
+    if variance == 0:
+        return variance, std_dev, None, None
+    skewness = (float(m3) / count) / variance ** 1.5
+    kurtosis = (float(m4) / count) / variance ** 2 - 3
+    return variance, std_dev, skewness, kurtosis
+
+
+class MomentAccumulator:
+    # One-pass mean/central moment update (Welford, extended to 3rd and 4th
+    # moments as in Pebay 2008), so values never need to be held in memory.
+    # Accumulators built over separate chunks or workers can be merged.
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min_value = None
+        self.max_value = None
+
+    def update(self, value):
+        if value is None:
+            return
+        n1 = self.count
+        self.count += 1
+        n = self.count
+        self.total += value
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+        if self.max_value is None or value > self.max_value:
+            self.max_value = value
+
+        x = float(value)
+        delta = x - self.mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+        self.mean += delta_n
+        self.m4 += term1 * delta_n2 * (n * n - 3 * n + 3) + 6 * delta_n2 * self.m2 - 4 * delta_n * self.m3
+        self.m3 += term1 * delta_n * (n - 2) - 3 * delta_n * self.m2
+        self.m2 += term1
+
+    def update_many(self, values):
+        for value in values:
+            self.update(value)
+        return self
+
+    def update_repeated(self, value, times):
+        # `times` copies of one value have no spread, so this is a single merge
+        if value is None or times <= 0:
+            return self
+        other = MomentAccumulator()
+        other.count = times
+        other.total = value * times
+        other.mean = float(value)
+        other.min_value = other.max_value = value
+        return self.merge(other)
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+
+        na, nb = self.count, other.count
+        n = na + nb
+        delta = other.mean - self.mean
+        delta2 = delta * delta
+
+        m2 = self.m2 + other.m2 + delta2 * na * nb / n
+        m3 = (self.m3 + other.m3
+              + delta2 * delta * na * nb * (na - nb) / n ** 2
+              + 3 * delta * (na * other.m2 - nb * self.m2) / n)
+        m4 = (self.m4 + other.m4
+              + delta2 * delta2 * na * nb * (na * na - na * nb + nb * nb) / n ** 3
+              + 6 * delta2 * (na * na * other.m2 + nb * nb * self.m2) / n ** 2
+              + 4 * delta * (na * other.m3 - nb * self.m3) / n)
+
+        self.mean += delta * nb / n
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        self.count = n
+        self.total += other.total
+        self.min_value = min(self.min_value, other.min_value)
+        self.max_value = max(self.max_value, other.max_value)
+        return self
+
+    def result(self):
+        variance, std_dev, skewness, kurtosis = moments_to_stats(self.count, self.mean, self.m2, self.m3, self.m4)
+        count = self.count
+        return {
+            'count': count,
+            'sum': self.total,
+            'mean': self.mean if count > 0 else None,
+            'std_dev': std_dev,
+            'variance': variance,
+            'min_value': self.min_value,
+            'max_value': self.max_value,
+            'range': self.max_value - self.min_value if count > 0 else None,
+            'skewness': skewness,
+            'kurtosis': kurtosis
+        }
+
+
+class QuantileSketch:
+    # KLL-style sketch: a stack of compactors where level h holds items of
+    # weight 2**h. Memory is O(1 / error) items and rank queries are off by
+    # roughly error * count. Until the first compaction the answers are exact.
+    def __init__(self, error=0.001):
+        self.error = error
+        self.k = max(8, int(math.ceil(2.0 / error)))
+        self.compactors = [[]]
+        self.count = 0
+        self.size = 0
+        self.max_size = self._capacity(0)
+
+    def _capacity(self, level):
+        height = len(self.compactors)
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** (height - level - 1))))
+
+    def _grow(self):
+        self.compactors.append([])
+        self.max_size = sum(self._capacity(level) for level in range(len(self.compactors)))
+
+    def _compress(self):
+        for level in range(len(self.compactors)):
+            if len(self.compactors[level]) >= self._capacity(level):
+                if level + 1 >= len(self.compactors):
+                    self._grow()
+                items = sorted(self.compactors[level])
+                # Odd item out stays behind so total weight is preserved
+                keep = [items.pop()] if len(items) % 2 else []
+                offset = random.randint(0, 1)
+                self.compactors[level + 1].extend(items[offset::2])
+                self.compactors[level] = keep
+                self.size = sum(len(compactor) for compactor in self.compactors)
+                if self.size < self.max_size:
+                    break
+
+    def update(self, value):
+        if value is None:
+            return
+        self.compactors[0].append(value)
+        self.count += 1
+        self.size += 1
+        if self.size >= self.max_size:
+            self._compress()
+
+    def update_many(self, values):
+        for value in values:
+            self.update(value)
+        return self
+
+    def update_repeated(self, value, times):
+        # Each set bit of `times` is one item at that level's weight
+        if value is None or times <= 0:
+            return self
+        self.count += times
+        level = 0
+        while times:
+            if times & 1:
+                while len(self.compactors) <= level:
+                    self._grow()
+                self.compactors[level].append(value)
+            times >>= 1
+            level += 1
+        self.size = sum(len(compactor) for compactor in self.compactors)
+        while self.size >= self.max_size:
+            self._compress()
+        return self
+
+    def merge(self, other):
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.count += other.count
+        self.size = sum(len(compactor) for compactor in self.compactors)
+        while self.size >= self.max_size:
+            self._compress()
+        return self
+
+    @classmethod
+    def from_sorted(cls, values, error=0.001):
+        # Build straight from an already sorted sequence: every 2**h-th item at
+        # level h, with the leftover weight split over the lower levels, so the
+        # result is what compacting the full input would roughly give
+        sketch = cls(error)
+        count = len(values)
+        level = 0
+        while count >> level > sketch.k // 2:
+            level += 1
+        while len(sketch.compactors) <= level:
+            sketch._grow()
+        step = 2 ** level
+        sketch.compactors[level] = list(values[step - 1::step])
+        remainder = count - len(sketch.compactors[level]) * step
+        position = count - remainder
+        for lower in range(level - 1, -1, -1):
+            if remainder & (2 ** lower):
+                sketch.compactors[lower].append(values[position + 2 ** lower - 1])
+                position += 2 ** lower
+        sketch.count = count
+        sketch.size = sum(len(compactor) for compactor in sketch.compactors)
+        return sketch
+
+    def value_at(self, position):
+        # Value at a 0-based position of the sorted input (approximate once compacted)
+        weighted = sorted(
+            (value, 2 ** level)
+            for level, items in enumerate(self.compactors)
+            for value in items
+        )
+        cumulative = 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative > position:
+                return value
+        return weighted[-1][0] if weighted else None
+
+    def quantile(self, q):
+        return self.value_at(int(q * self.count))
+
+
+def calculate_stats(data, quantile_error=0.001, frequency_capacity=1024):
+    # Single pass: moments, quantile sketch and frequency sketch are all fed
+    # from the same iteration, so data can be any iterable (e.g. a cursor).
+    # Memory stays bounded: the mode comes from at most frequency_capacity
+    # counters, exact whenever the column has no more distinct values.
+    moments = MomentAccumulator()
+    sketch = QuantileSketch(quantile_error)
+    frequencies = FrequencySketch(frequency_capacity)
+    for value in data:
+        if value is None:
+            continue
+        moments.update(value)
+        sketch.update(value)
+        frequencies.update(value)
+
+    return sketch_stats(moments, sketch, frequencies.mode())
+
+
+def calculate_categorical_stats(data, quantile_error=0.001, frequency_capacity=1024):
+    # Text and temporal columns have no moments: one pass for the count,
+    # min/max, lower median, mode and a HyperLogLog distinct count, all in
+    # bounded memory like calculate_stats
+    sketch = QuantileSketch(quantile_error)
+    frequencies = FrequencySketch(frequency_capacity)
+    distinct = HyperLogLog()
+    min_value = max_value = None
+    for value in data:
+        if value is None:
+            continue
+        sketch.update(value)
+        frequencies.update(value)
+        distinct.add(value)
+        if min_value is None or value < min_value:
+            min_value = value
+        if max_value is None or value > max_value:
+            max_value = value
+
+    count = sketch.count
     return {
         'count': count,
-        'sum': total,
-        'mean': mean,
-        'median': median,
-        'mode': mode,
-        'std_dev': std_dev,
-        'variance': variance,
+        'sum': None,
+        'mean': None,
+        'std_dev': None,
+        'variance': None,
         'min_value': min_value,
         'max_value': max_value,
-        'range': range_value,
-        'interquartile_range': interquartile_range,
-        'skewness': skewness,
-        'kurtosis': kurtosis
+        'range': None,
+        'skewness': None,
+        'kurtosis': None,
+        'median': sketch.value_at(max(count - 1, 0) // 2) if count else None,
+        'mode': frequencies.mode(),
+        'interquartile_range': None,
+        'distinct': round(distinct.count()),
     }
 
 
-def show_column_stats(connection, table_name, column_name):
+def sketch_stats(moments, sketch, mode):
+    stats = moments.result()
+    count = stats['count']
+    mid = count // 2
+    if count == 0:
+        median = None
+    elif count % 2 == 0:
+        median = (sketch.value_at(mid) + sketch.value_at(mid - 1)) / 2
+    else:
+        median = sketch.value_at(mid)
+
+    stats['median'] = median
+    stats['mode'] = mode
+    stats['interquartile_range'] = (
+        sketch.value_at(int(0.75 * count)) - sketch.value_at(int(0.25 * count))
+    ) if count > 0 else None
+    return stats
+
+
+class FrequencySketch:
+    # Misra-Gries heavy hitters: at most `capacity` counters. When full, the
+    # median counter is subtracted from all of them and the non-positive ones
+    # dropped, so each count is low by at most `offset` and any value seen
+    # more than count / capacity times is kept. Mergeable like the others.
+    # When every counter ties (e.g. all values distinct) a purge empties the
+    # sketch, so the top counter before each purge is kept as the candidate
+    # mode: with no survivor, no value is known to be more frequent.
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.counts = {}
+        self.offset = 0
+        self.candidate = None
+
+    def update(self, value, times=1):
+        if value is None or times <= 0:
+            return
+        self.counts[value] = self.counts.get(value, 0) + times
+        if len(self.counts) > self.capacity:
+            self._purge()
+
+    def _purge(self):
+        self.candidate = self.mode()
+        cut = sorted(self.counts.values())[len(self.counts) // 2]
+        self.offset += cut
+        self.counts = {value: count - cut for value, count in self.counts.items() if count > cut}
+
+    def merge(self, other):
+        for value, count in other.counts.items():
+            self.counts[value] = self.counts.get(value, 0) + count
+        self.offset += other.offset
+        if self.candidate is None:
+            self.candidate = other.candidate
+        while len(self.counts) > self.capacity:
+            self._purge()
+        return self
+
+    def mode(self):
+        return max(self.counts.items(), key=lambda item: item[1])[0] if self.counts else self.candidate
+
+    @classmethod
+    def from_counts(cls, values, counts, convert, capacity=1024):
+        # Exact (value, count) arrays: keep the largest `capacity`, the next
+        # largest count bounds what was dropped
+        import numpy as np
+        sketch = cls(capacity)
+        order = np.argsort(counts, kind='stable')[::-1]
+        sketch.counts = {convert(values[idx]): int(counts[idx]) for idx in order[:capacity]}
+        sketch.offset = int(counts[order[capacity]]) if len(order) > capacity else 0
+        return sketch
+
+
+class ColumnState:
+    # Everything calculate_stats needs for one column, kept as mergeable
+    # sketches so appended or filled rows are folded in without a rescan
+    def __init__(self, quantile_error=0.001):
+        self.moments = MomentAccumulator()
+        self.sketch = QuantileSketch(quantile_error)
+        self.frequencies = FrequencySketch()
+        self.nulls = 0
+
+    def update(self, value):
+        if value is None:
+            self.nulls += 1
+            return
+        self.moments.update(value)
+        self.sketch.update(value)
+        self.frequencies.update(value)
+
+    def update_many(self, values):
+        for value in values:
+            self.update(value)
+        return self
+
+    def fill_nulls(self, value):
+        # Every NULL seen so far now holds `value`
+        self.moments.update_repeated(value, self.nulls)
+        self.sketch.update_repeated(value, self.nulls)
+        self.frequencies.update(value, self.nulls)
+        self.nulls = 0
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        self.frequencies.merge(other.frequencies)
+        self.nulls += other.nulls
+        return self
+
+    def result(self):
+        return sketch_stats(self.moments, self.sketch, self.frequencies.mode())
+
+    @classmethod
+    def from_array(cls, column, quantile_error=0.001):
+        # Same state the row-at-a-time updates would reach, from a ColumnArray
+        state = cls(quantile_error)
+        if column.count:
+            moments = state.moments
+            moments.count = column.count
+            moments.total = column.total
+            moments.mean = column.mean
+            moments.m2, moments.m3, moments.m4 = column.central_sums
+            moments.min_value = column.convert(column.sorted_values[0])
+            moments.max_value = column.convert(column.sorted_values[-1])
+        sketch = QuantileSketch.from_sorted(column.sorted_values, quantile_error)
+        sketch.compactors = [[column.convert(value) for value in items] for items in sketch.compactors]
+        state.sketch = sketch
+        state.frequencies = FrequencySketch.from_counts(column.distinct_values, column.distinct_counts, column.convert)
+        state.nulls = column.nulls
+        return state
+
+    def to_dict(self):
+        frequencies = dict(vars(self.frequencies), counts=list(self.frequencies.counts.items()))
+        return {'moments': vars(self.moments), 'sketch': vars(self.sketch), 'frequencies': frequencies,
+                'nulls': self.nulls}
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls.__new__(cls)
+        state.moments = MomentAccumulator.__new__(MomentAccumulator)
+        state.moments.__dict__.update(data['moments'])
+        state.sketch = QuantileSketch.__new__(QuantileSketch)
+        state.sketch.__dict__.update(data['sketch'])
+        state.frequencies = FrequencySketch.__new__(FrequencySketch)
+        state.frequencies.candidate = None  # states saved before it existed
+        state.frequencies.__dict__.update(data['frequencies'], counts=dict(map(tuple, data['frequencies']['counts'])))
+        state.nulls = data['nulls']
+        return state
+
+
+def query_column_mode(connection, table_name, column_name):
+    cursor = connection.cursor()
     try:
-        cursor = connection.cursor()
+        cursor.execute(
+            f"SELECT {column_name}, COUNT(*) AS frequency FROM {table_name} "
+            f"WHERE {column_name} IS NOT NULL GROUP BY {column_name} ORDER BY frequency DESC LIMIT 1"
+        )
+        result = cursor.fetchone()
+        return result[0] if result else None
+    finally:
+        cursor.close()
+
+
+def query_column_order_stats(connection, table_name, column_name, positions):
+    # Fetch the values at the given 0-based positions of the sorted column,
+    # so only a handful of scalars come back instead of the whole column
+    positions = sorted(set(positions))
+    if not positions:
+        return {}
+    cursor = connection.cursor()
+    try:
+        try:
+            cursor.execute(
+                f"SELECT rn, value FROM ("
+                f"SELECT {column_name} AS value, ROW_NUMBER() OVER (ORDER BY {column_name}) AS rn "
+                f"FROM {table_name} WHERE {column_name} IS NOT NULL) AS ranked "
+                f"WHERE rn IN ({', '.join(['%s' for _ in positions])})",
+                tuple(position + 1 for position in positions)
+            )
+            return {rn - 1: value for rn, value in cursor.fetchall()}
+        except Error:
+            # Servers without window functions: one indexed seek per position
+            values = {}
+            for position in positions:
+                cursor.execute(
+                    f"SELECT {column_name} FROM {table_name} WHERE {column_name} IS NOT NULL "
+                    f"ORDER BY {column_name} LIMIT 1 OFFSET {position}"
+                )
+                result = cursor.fetchone()
+                values[position] = result[0] if result else None
+            return values
+    finally:
+        cursor.close()
+
+
+def add_order_stats(connection, table_name, column_name, stats):
+    count = stats['count']
+    if count == 0:
+        stats['median'] = None
+        stats['interquartile_range'] = None
+        stats['mode'] = None
+        return stats
 
-        # Retrieve data from the column
+    mid = count // 2
+    q1_pos = int(0.25 * count)
+    q3_pos = int(0.75 * count)
+    positions = [mid, q1_pos, q3_pos]
+    if count % 2 == 0:
+        positions.append(mid - 1)
+    order_stats = query_column_order_stats(connection, table_name, column_name, positions)
+
+    try:
+        if count % 2 == 0:
+            stats['median'] = (order_stats[mid] + order_stats[mid - 1]) / 2
+        else:
+            stats['median'] = order_stats[mid]
+    except TypeError:
+        # Non-numeric columns: take the lower median instead of averaging
+        stats['median'] = order_stats[mid - 1]
+    try:
+        stats['interquartile_range'] = order_stats[q3_pos] - order_stats[q1_pos]
+    except TypeError:
+        stats['interquartile_range'] = None
+    stats['mode'] = query_column_mode(connection, table_name, column_name)
+    return stats
+
+
+def aggregate_column_stats(connection, table_name, column_name):
+    # Push count/sum/min/max and the central moments down into one aggregate
+    # query; the mean comes from a derived table so the moments stay stable
+    data_type = get_column_data_type(connection, table_name, column_name)
+    cursor = connection.cursor()
+    try:
+        if data_type in NUMERIC_TYPES:
+            cursor.execute(
+                f"SELECT COUNT({column_name}), SUM({column_name}), MIN({column_name}), MAX({column_name}), "
+                f"AVG({column_name}), "
+                f"SUM(POW({column_name} - m.mean, 2)), "
+                f"SUM(POW({column_name} - m.mean, 3)), "
+                f"SUM(POW({column_name} - m.mean, 4)) "
+                f"FROM {table_name}, (SELECT AVG({column_name}) AS mean FROM {table_name}) AS m"
+            )
+            count, total, min_value, max_value, mean, m2, m3, m4 = cursor.fetchone()
+            variance, std_dev, skewness, kurtosis = moments_to_stats(count, mean, m2 or 0, m3 or 0, m4 or 0)
+            stats = {
+                'count': count,
+                'sum': total,
+                'mean': mean,
+                'std_dev': std_dev,
+                'variance': variance,
+                'min_value': min_value,
+                'max_value': max_value,
+                'range': max_value - min_value if count > 0 else None,
+                'skewness': skewness,
+                'kurtosis': kurtosis
+            }
+        else:
+            # Moments are meaningless for text/temporal columns
+            cursor.execute(f"SELECT COUNT({column_name}), MIN({column_name}), MAX({column_name}) FROM {table_name}")
+            count, min_value, max_value = cursor.fetchone()
+            stats = {
+                'count': count,
+                'sum': None,
+                'mean': None,
+                'std_dev': None,
+                'variance': None,
+                'min_value': min_value,
+                'max_value': max_value,
+                'range': None,
+                'skewness': None,
+                'kurtosis': None
+            }
+    finally:
+        cursor.close()
+
+    return add_order_stats(connection, table_name, column_name, stats)
+
+
+DECIMAL_POLICIES = ('scaled', 'float', 'exact')
+
+
+class ColumnArray:
+    # One numeric column held as a sorted NumPy array, every statistic
+    # computed with vectorized kernels. DECIMAL columns follow a policy:
+    #   scaled - DECIMAL(p, s) with p <= 18 kept as int64 multiples of 10**-s,
+    #            so sum, min/max, median, IQR and mode are exact Decimals
+    #   float  - converted to float64 (about 15 significant digits)
+    #   exact  - not vectorized; calculate_stats over the connector's Decimals
+    # Moments are float64 in every case, as they are in MomentAccumulator.
+    def __init__(self, values, kind, scale=0, nulls=0):
+        import numpy as np
+        self.kind = kind
+        self.scale = scale
+        self.nulls = nulls
+        self.sorted_values = np.sort(values)
+        self.count = len(values)
+        if self.count == 0:
+            return
+
+        values = self.sorted_values
+        if kind == 'float':
+            self.total = float(values.sum())
+        else:
+            # Split in 32-bit halves so the int64 sums can't overflow
+            units = (int((values >> 32).sum()) << 32) + int((values & 0xFFFFFFFF).sum())
+            self.total = Decimal(units).scaleb(-scale) if kind == 'decimal' else units
+
+        floats = values.astype(np.float64)
+        if kind == 'decimal':
+            floats /= 10 ** scale
+        self.mean = float(self.total) / self.count
+        deltas = floats - self.mean
+        squares = deltas * deltas
+        self.central_sums = (float(squares.sum()), float((squares * deltas).sum()), float((squares * squares).sum()))
+
+        starts = np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+        self.distinct_values = values[starts]
+        self.distinct_counts = np.diff(np.append(starts, self.count))
+
+    def convert(self, value):
+        # NumPy scalar -> the type the connector returns for this column
+        if self.kind == 'float':
+            return float(value)
+        if self.kind == 'decimal':
+            return Decimal(int(value)).scaleb(-self.scale)
+        return int(value)
+
+    def value_at(self, position):
+        return self.convert(self.sorted_values[position])
+
+    def stats(self):
+        count = self.count
+        if count == 0:
+            return calculate_stats(())
+        variance, std_dev, skewness, kurtosis = moments_to_stats(count, self.mean, *self.central_sums)
+        min_value, max_value = self.value_at(0), self.value_at(-1)
+        mid = count // 2
+        if count % 2 == 0:
+            median = (self.value_at(mid) + self.value_at(mid - 1)) / 2
+        else:
+            median = self.value_at(mid)
+        return {
+            'count': count,
+            'sum': self.total,
+            'mean': self.mean,
+            'std_dev': std_dev,
+            'variance': variance,
+            'min_value': min_value,
+            'max_value': max_value,
+            'range': max_value - min_value,
+            'skewness': skewness,
+            'kurtosis': kurtosis,
+            'median': median,
+            'mode': self.convert(self.distinct_values[self.distinct_counts.argmax()]),
+            'interquartile_range': self.value_at(int(0.75 * count)) - self.value_at(int(0.25 * count))
+        }
+
+
+def fetch_column_array(connection, table_name, column_name, decimal_policy='scaled', batch_size=100000):
+    # Raw-mode cursor: values arrive as the server's text and are parsed by
+    # NumPy a batch at a time, never becoming int/Decimal objects. Returns
+    # None when the column can't be vectorized under the policy.
+    import numpy as np
+    data_type = get_column_data_type(connection, table_name, column_name)
+    precision, scale = schema_cache.numeric_formats(connection, table_name).get(column_name, (None, None))
+    if data_type in FLOAT_TYPES:
+        kind = 'float'
+    elif data_type in ('decimal', 'numeric'):
+        if decimal_policy == 'float':
+            kind = 'float'
+        elif decimal_policy == 'scaled' and precision is not None and precision <= 18:
+            kind = 'decimal'
+        else:
+            return None
+    elif data_type in TRACKED_TYPES and (precision is None or precision <= 19):
+        # BIGINT UNSIGNED (precision 20) doesn't fit in int64
+        kind = 'int'
+    else:
+        return None
+
+    chunks = []
+    nulls = 0
+    cursor = connection.cursor(raw=True, buffered=False)
+    try:
         cursor.execute(f"SELECT {column_name} FROM {table_name}")
-        data = [row[0] for row in cursor.fetchall()]
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            text = np.array([bytes(row[0]) for row in rows if row[0] is not None], dtype='S')
+            nulls += len(rows) - len(text)
+            if not len(text):
+                continue
+            if kind == 'decimal':
+                # "-12.5" -> "-1250" for scale 2: whole digits, then the
+                # fraction padded out to the column's scale
+                parts = np.char.partition(text, b'.')
+                text = np.char.add(parts[:, 0], np.char.ljust(parts[:, 2], scale, b'0'))
+            chunks.append(text.astype(np.float64 if kind == 'float' else np.int64))
+    finally:
+        cursor.close()
 
-        if not data:
-            print(f"No data found in column '{column_name}' of table '{table_name}'.")
+    dtype = np.float64 if kind == 'float' else np.int64
+    values = np.concatenate(chunks) if chunks else np.empty(0, dtype=dtype)
+    return ColumnArray(values, kind, scale or 0, nulls)
+
+
+def stream_column_stats(connection, table_name, column_name, quantile_error=0.001, decimal_policy='scaled',
+                        vectorized=True):
+    # Client-side path when the aggregate can't be pushed down. Numeric
+    # columns go through NumPy; anything else is one pass over an
+    # unbuffered cursor, only the accumulator and sketch state kept in memory
+    numeric = get_column_data_type(connection, table_name, column_name) in NUMERIC_TYPES
+    if vectorized and numeric:
+        column = fetch_column_array(connection, table_name, column_name, decimal_policy)
+        if column is not None:
+            return column.stats()
+
+    cursor = connection.cursor(buffered=False)
+    try:
+        cursor.execute(f"SELECT {column_name} FROM {table_name} WHERE {column_name} IS NOT NULL")
+        values = (row[0] for row in cursor)
+        if numeric:
+            return calculate_stats(values, quantile_error)
+        return calculate_categorical_stats(values, quantile_error)
+    finally:
+        cursor.close()
+
+
+def compute_column_stats(connection, table_name, column_name, pushdown=True, decimal_policy='scaled'):
+    if pushdown:
+        try:
+            return aggregate_column_stats(connection, table_name, column_name)
+        except Error as e:
+            print(f"Aggregate pushdown failed ({e}), falling back to streaming statistics.")
+    return stream_column_stats(connection, table_name, column_name, decimal_policy=decimal_policy)
+
+
+FLOAT_TYPES = {'float', 'double', 'real'}
+TRACKED_TYPES = NUMERIC_TYPES - {'bit'}
+
+
+def coerce_column_value(value, data_type, scale):
+    # Python value the connector would return once `value` is stored in a
+    # column of this type, so tracked states match a rescan
+    if value is None or value == '':
+        return None
+    if data_type in FLOAT_TYPES:
+        return float(value)
+    number = Decimal(str(value).strip())
+    if scale is not None:
+        number = number.quantize(Decimal(1).scaleb(-scale), ROUND_HALF_UP)
+    if data_type in ('decimal', 'numeric'):
+        return number
+    return int(number)
+
+
+class ColumnStateTracker:
+    # Carries a table's stored column states across one write (an import, a
+    # fill, an added column). begin() before writing picks up states that
+    # still match the table -- or empty ones if the table has no rows --
+    # the write reports its delta, and commit() stores them under the new
+    # fingerprint. A write that never commits leaves the stored fingerprint
+    # stale, so the states are simply rebuilt on the next streaming pass.
+    # Folding every written row in costs far more than the INSERT itself, so
+    # tracking is opt-in (result_cache.track_states). Rows are counted here,
+    # not with COUNT(*): writes by other sessions in the meantime aren't
+    # detected, and callers sharing a table (import_many) don't track.
+    def __init__(self, connection, table_name):
+        self.connection = connection
+        self.table_name = table_name
+        self.states = None
+        self.types = {}
+        self.rows = 0
+
+    def begin(self):
+        if not result_cache.enabled or not result_cache.track_states:
+            return self
+        formats = schema_cache.numeric_formats(self.connection, self.table_name)
+        self.types = {
+            column: (data_type, formats.get(column, (None, None))[1])
+            for column, data_type in schema_cache.columns(self.connection, self.table_name)
+            if data_type in TRACKED_TYPES
+        }
+        fingerprint = result_cache.fingerprint(self.connection, self.table_name)
+        self.states = result_cache.load_states(self.connection, self.table_name, fingerprint)
+        if self.states:
+            state = next(iter(self.states.values()))
+            self.rows = state.moments.count + state.nulls
+        elif self.states is None:
+            if table_is_empty(self.connection, self.table_name):
+                self.states = {column: ColumnState() for column in self.types}
+        return self
+
+    def observe(self, columns, rows):
+        # Pass rows through unchanged, folding their tracked values in;
+        # untouched when not tracking, so the import loop pays nothing
+        if self.states is None:
+            return rows
+        return self._observe(columns, rows)
+
+    def _observe(self, columns, rows):
+        tracked = [
+            (idx, self.states[column], self.types[column]) for idx, column in enumerate(columns)
+            if column in self.states and column in self.types
+        ]
+        for row in rows:
+            if self.states is not None:
+                try:
+                    for idx, state, (data_type, scale) in tracked:
+                        state.update(coerce_column_value(row[idx], data_type, scale))
+                except (InvalidOperation, ValueError, TypeError):
+                    # The server will coerce this differently; stop tracking
+                    self.states = None
+            self.rows += 1
+            yield row
+
+    def fill(self, column, value):
+        if self.states is None or column not in self.states or column not in self.types:
+            return
+        data_type, scale = self.types[column]
+        try:
+            self.states[column].fill_nulls(coerce_column_value(value, data_type, scale))
+        except (InvalidOperation, ValueError, TypeError):
+            del self.states[column]
+
+    def commit(self):
+        if self.states is None:
+            return
+        # Every state must account for every row written through observe()
+        if any(state.moments.count + state.nulls != self.rows for state in self.states.values()):
+            self.states = None
             return
+        schema_cache.invalidate(self.connection, self.table_name)
+        fingerprint = result_cache.fingerprint(self.connection, self.table_name)
+        result_cache.save_states(self.connection, self.table_name, fingerprint, self.states)
+
+
+def column_stats(connection, table_name, column_name, pushdown=True, use_cache=True, decimal_policy='scaled',
+                 approximate=False):
+    # approximate=True lets incrementally maintained states answer: median
+    # and IQR then come from the quantile sketch and the mode from the
+    # frequency sketch (arbitrary when no value is frequent), and the
+    # result carries 'approximate': True
+    if not use_cache or not result_cache.enabled:
+        return compute_column_stats(connection, table_name, column_name, pushdown, decimal_policy)
+
+    fingerprint = result_cache.fingerprint(connection, table_name)
+    params = {'column': column_name, 'pushdown': pushdown, 'decimal_policy': decimal_policy}
+    stats = result_cache.get(connection, table_name, 'stats', params, fingerprint)
+    if stats is not None:
+        return stats
+
+    # Incrementally maintained states answer without touching the table
+    states = result_cache.load_states(connection, table_name, fingerprint) or {}
+    if approximate and column_name in states:
+        return dict(states[column_name].result(), approximate=True)
+
+    column = None
+    if not pushdown and get_column_data_type(connection, table_name, column_name) in TRACKED_TYPES:
+        column = fetch_column_array(connection, table_name, column_name, decimal_policy)
+    if column is not None:
+        # The client-side pass reads every value anyway, so keep its state
+        # for later appends and fills to build on
+        states[column_name] = ColumnState.from_array(column)
+        stats = column.stats()
+        result_cache.save_states(connection, table_name, fingerprint, states)
+    else:
+        stats = compute_column_stats(connection, table_name, column_name, pushdown, decimal_policy)
+    result_cache.put(connection, table_name, 'stats', params, fingerprint, stats)
+    return stats
+
 
-        # Calculate and display statistics
-        stats = calculate_stats(data)
+def show_column_stats(connection, table_name, column_name, pushdown=True):
+    try:
+        stats = column_stats(connection, table_name, column_name, pushdown)
+
+        if not stats['count']:
+            print(f"No data found in column '{column_name}' of table '{table_name}'.")
+            return
 
         print("\nColumn Statistics:")
         print("===================")
@@ -302,298 +2054,1863 @@ def show_column_stats(connection, table_name, column_name):
 
     except Error as e:
         print(f"Error retrieving column statistics: {e}")
-    finally:
-        if 'cursor' in locals():
-            cursor.close()
 
 
-def calculate_column_correlation(connection, table_name):
+def estimated_row_count(connection, table_name):
+    # InnoDB's statistics estimate; avoids a COUNT(*) scan
+    cursor = connection.cursor()
     try:
-        import pandas as pd
-        # Fetch data into a Pandas DataFrame
-        query = f"SELECT * FROM {table_name}"
-        df = pd.read_sql_query(query, connection)
+        cursor.execute(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            (table_name,)
+        )
+        result = cursor.fetchone()
+        return int(result[0]) if result and result[0] is not None else 0
+    finally:
+        cursor.close()
+
+
+def sample_rows(connection, table_name, columns, sample_size=10000, probes_per_query=500):
+    # Primary-key sampling: every row is the first one at or after its own
+    # random key, so rows are independent draws (unlike consecutive blocks,
+    # which are correlated on key-ordered data) and the intervals built on
+    # them hold. The single-row index lookups are batched into UNION ALL
+    # statements (prepared, as all but the last share one text); a row two
+    # probes land on is kept once. Tables without an integer key fall back
+    # to a Bernoulli sample with RAND() sized from the estimated row count.
+    select = ', '.join(columns)
+    key = get_primary_key(connection, table_name)
+    total = estimated_row_count(connection, table_name)
+    cursor = connection.cursor()
+    try:
+        if len(key) == 1 and total > sample_size:
+            cursor.execute(f"SELECT MIN({key[0]}), MAX({key[0]}) FROM {table_name}")
+            low, high = cursor.fetchone()
+            if isinstance(low, int):
+                starts = sorted(random.randint(low, high) for _ in range(sample_size))
+                probe = f"(SELECT {key[0]}, {select} FROM {table_name} WHERE {key[0]} >= %s ORDER BY {key[0]} LIMIT 1)"
+                rows = {}
+                for offset in range(0, len(starts), probes_per_query):
+                    batch = starts[offset:offset + probes_per_query]
+                    probes = prepared_statements.execute(connection, " UNION ALL ".join([probe] * len(batch)),
+                                                         tuple(batch))
+                    for row in probes.fetchall():
+                        rows[row[0]] = row[1:]
+                return list(rows.values())
+
+        fraction = min(1.0, 1.2 * sample_size / total) if total else 1.0
+        cursor.execute(f"SELECT {select} FROM {table_name} WHERE RAND() < %s LIMIT {sample_size}", (fraction,))
+        return cursor.fetchall()
+    finally:
+        cursor.close()
 
-        # Filter out non-numerical columns
-        numerical_columns = df.select_dtypes(include=['number']).columns
 
-        # Calculate and print correlation between numerical columns
-        correlation_table = df[numerical_columns].corr()
+class HyperLogLog:
+    # Distinct-count sketch with 2**precision registers, standard error
+    # about 1.04 / sqrt(2**precision). Registers can be filled client-side
+    # with add() or computed by the server (hll_distinct_count).
+    def __init__(self, precision=12):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = [0] * self.m
 
-        print("Correlation Table:")
-        print(correlation_table)
+    def add(self, value):
+        if value is None:
+            return
+        # First 32 bits of MD5, the same hash the server-side query uses
+        hashed = int(hashlib.md5(str(value).encode('utf-8')).hexdigest()[:8], 16)
+        self.update_register(hashed & (self.m - 1), hashed >> self.precision)
+
+    def update_register(self, index, remaining):
+        width = 32 - self.precision
+        rank = width - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        self.registers = [max(a, b) for a, b in zip(self.registers, other.registers)]
+        return self
+
+    def relative_error(self):
+        return 1.04 / math.sqrt(self.m)
+
+    def count(self):
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            return self.m * math.log(self.m / zeros)  # small-range correction
+        if estimate > (1 << 32) / 30:
+            return -(1 << 32) * math.log(1 - estimate / (1 << 32))  # large-range correction
+        return estimate
+
+
+def hll_distinct_count(connection, table_name, column_name, precision=12):
+    # The server hashes and buckets every value; only 2**precision register
+    # maxima come back over the wire
+    sketch = HyperLogLog(precision)
+    width = 32 - precision
+    cursor = connection.cursor()
+    try:
+        cursor.execute(
+            f"SELECT h & {sketch.m - 1} AS bucket, "
+            f"MAX(IF(h >> {precision} = 0, {width + 1}, {width} - FLOOR(LOG2(h >> {precision})))) "
+            f"FROM (SELECT CAST(CONV(LEFT(MD5({column_name}), 8), 16, 10) AS UNSIGNED) AS h "
+            f"FROM {table_name} WHERE {column_name} IS NOT NULL) AS hashed "
+            f"GROUP BY bucket"
+        )
+        for bucket, rank in cursor.fetchall():
+            sketch.registers[int(bucket)] = int(rank)
+    finally:
+        cursor.close()
+    return sketch
+
+
+def order_stat_interval(sorted_values, q, z):
+    # Distribution-free confidence interval for the q-quantile from order statistics
+    n = len(sorted_values)
+    spread = z * math.sqrt(n * q * (1 - q))
+    low = max(int(math.floor(n * q - spread)), 0)
+    high = min(int(math.ceil(n * q + spread)), n - 1)
+    return sorted_values[min(int(q * n), n - 1)], sorted_values[low], sorted_values[high]
+
+
+def sampled_column_stats(connection, table_name, column_name, sample_size=10000, confidence=0.95, distinct=False):
+    # Every statistic is an (estimate, low, high) tuple at the given confidence.
+    # distinct=True adds a HyperLogLog distinct count, which hashes every row
+    # of the table: a full scan, unlike the rest of this function.
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    sample = [row[0] for row in sample_rows(connection, table_name, [column_name], sample_size)]
+    values = sorted(value for value in sample if value is not None)
+    n = len(values)
+    total_rows = max(estimated_row_count(connection, table_name), len(sample))
+
+    present = n / len(sample) if sample else 0.0
+    present_error = z * math.sqrt(present * (1 - present) / len(sample)) if sample else 0.0
+    count = (present * total_rows,
+             max(present - present_error, 0.0) * total_rows,
+             min(present + present_error, 1.0) * total_rows)
+    stats = {'sample_size': len(sample), 'estimated_rows': total_rows, 'count': count}
+
+    if n and get_column_data_type(connection, table_name, column_name) in NUMERIC_TYPES:
+        moments = MomentAccumulator().update_many(values).result()
+        mean, std_dev = moments['mean'], moments['std_dev'] or 0.0
+        mean_error = z * std_dev / math.sqrt(n)
+        # Large-sample standard error of s depends on the kurtosis
+        excess = moments['kurtosis'] or 0.0
+        std_error = z * std_dev * math.sqrt(max(excess + 2, 0.0) / (4 * n))
+        stats['mean'] = (mean, mean - mean_error, mean + mean_error)
+        stats['std_dev'] = (std_dev, max(std_dev - std_error, 0.0), std_dev + std_error)
+        stats['sum'] = tuple(count[0] * value for value in stats['mean'])
+        stats['median'] = order_stat_interval(values, 0.5, z)
+        stats['q1'] = order_stat_interval(values, 0.25, z)
+        stats['q3'] = order_stat_interval(values, 0.75, z)
+        stats['min_value'] = (values[0], None, None)
+        stats['max_value'] = (values[-1], None, None)
+
+    if distinct:
+        sketch = hll_distinct_count(connection, table_name, column_name)
+        estimate = sketch.count()
+        error = z * sketch.relative_error() * estimate
+        stats['distinct'] = (estimate, max(estimate - error, 0.0), estimate + error)
+    return stats
+
+
+def show_sampled_column_stats(connection, table_name, column_name, sample_size=10000, confidence=0.95,
+                              distinct=False):
+    try:
+        stats = sampled_column_stats(connection, table_name, column_name, sample_size, confidence, distinct)
+
+        print(f"\nApproximate Column Statistics ({stats['sample_size']} sampled of ~{stats['estimated_rows']} rows, "
+              f"{confidence:.0%} CI):")
+        print("===================")
+        for name, label in (('count', 'Count'), ('sum', 'Sum'), ('mean', 'Mean'), ('median', 'Median'),
+                            ('std_dev', 'Standard Deviation'), ('q1', 'First Quartile'), ('q3', 'Third Quartile'),
+                            ('min_value', 'Sample Min'), ('max_value', 'Sample Max'), ('distinct', 'Distinct (HLL)')):
+            if name not in stats:
+                continue
+            estimate, low, high = stats[name]
+            if low is None:
+                print(f"{label}: {estimate}")
+            else:
+                print(f"{label}: {estimate} ({low} .. {high})")
 
     except Error as e:
-        print(f"Error calculating correlation table: {e}")
+        print(f"Error retrieving column statistics: {e}")
 
 
-def get_column_types(data):
-    column_types = {}
+def get_table_name(connection):
+    try:
+        # Get the list of tables in the database, less the checkpoint table
+        tables = [table for table in schema_cache.tables(connection) if table != PROGRESS_TABLE]
 
-    for record in data:
-        for key, value in record.items():
-            if key not in column_types:
-                # Determine data type for the column based on the first non-empty value
-                if value is not None and not isinstance(value, (int, float)):
-                    column_types[key] = 'VARCHAR(255)'
-                elif isinstance(value, (int, float)):
-                    column_types[key] = 'DOUBLE'
-                else:
-                    column_types[key] = 'VARCHAR(255)'
+        if not tables:
+            print("No tables found in the database.")
+            return None
 
-    return column_types
+        # Choose a table
+        print("Available tables:")
+        for idx, table in enumerate(tables):
+            print(f"{idx + 1}. {table}")
 
+        table_idx = int(input("Enter the index of the table: ")) - 1
 
-def get_column_type(data):
-    column_types = {}
+        if table_idx < 0 or table_idx >= len(tables):
+            print("Invalid table index.")
+            return None
 
-    for row in data:
-        for col_idx, value in enumerate(row):
-            col_name = f'column_{col_idx + 1}'  # Generate a placeholder column name
-            if col_name not in column_types:
-                # Determine data type for the column based on the first non-empty value
-                if value is not None and not isinstance(value, (int, float, Decimal)):
-                    column_types[col_name] = 'VARCHAR(255)'
-                elif isinstance(value, (int, float)):
-                    column_types[col_name] = 'DOUBLE'
-                else:
-                    column_types[col_name] = 'VARCHAR(255)'
+        return tables[table_idx]
 
-    return column_types
+    except Error as e:
+        print(f"Error getting table names: {e}")
+        return None
 
 
-def import_data(connection, table_name, file_path):
-    try:
-        cursor = connection.cursor()
+def get_column_names(connection, table_name):
+    return [column_name for column_name, _ in schema_cache.columns(connection, table_name)]
 
-        # Determine file type based on extension
-        file_extension = file_path.split('.')[-1].lower()
 
-        if file_extension == 'csv':
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as csvfile:
-                csv_reader = csv.reader(csvfile)
-                header = next(csv_reader)
-
-                # Read a few rows to determine column types
-                sample_data = [next(csv_reader) for _ in range(5)]
-
-                # Create table if it doesn't exist
-                column_types = get_column_type(sample_data)
-                create_table_query = f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(f'{col} {column_types[col]}' for col in column_types)})"
-                cursor.execute(create_table_query)
-
-                # Insert data into the table
-                insert_query = f"INSERT INTO {table_name} ({', '.join(column_types)}) VALUES ({', '.join(['%s' for _ in column_types])})"
-                for row in csv_reader:
-                    cursor.execute(insert_query, row)
-
-        elif file_extension == 'json':
-            with open(file_path, 'r') as jsonfile:
-                data = json.load(jsonfile)
-                if not data:
-                    print("JSON file is empty.")
-                    return
+def profile_column(manager, table_name, column_name):
+    with manager.connection() as connection:
+        try:
+            return aggregate_column_stats(connection, table_name, column_name)
+        except Error:
+            return stream_column_stats(connection, table_name, column_name)
 
-                # Extract column names from the first record
-                header = list(data[0].keys())
 
-                # Create table if it doesn't exist
-                column_types = get_column_type(data)
-                create_table_query = f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(f'{col} {column_types[col]}' for col in column_types)})"
-                cursor.execute(create_table_query)
+def profile_column_client_side(connection_config, table_name, column_name):
+    # Runs in a worker process: its own connection, math done locally
+    load_connector()
+    connection = mysql.connector.connect(**connection_config)
+    try:
+        return stream_column_stats(connection, table_name, column_name)
+    finally:
+        connection.close()
 
-                # Insert data into the table
-                insert_query = f"INSERT INTO {table_name} ({', '.join(column_types)}) VALUES ({', '.join(['%s' for _ in column_types])})"
-                for row in data:
-                    cursor.execute(insert_query, tuple(row.values()))
 
-        else:
-            print("Unsupported file format. Only CSV and JSON are supported.")
+def profile_table(manager, table_name, workers=None, use_processes=False):
+    with manager.connection() as connection:
+        columns = get_column_names(connection, table_name)
 
-        # Commit the changes
-        connection.commit()
-        print(f"Data imported from {file_extension.upper()} '{file_path}' to table '{table_name}'")
+    workers = workers or manager.pool_size
+    report = {}
+    start_time = time.perf_counter()
 
-    except Error as e:
-        print(f"Error importing data: {e}")
+    # Threads overlap the per-column aggregate queries on pooled connections;
+    # processes are for client-side math, which would otherwise hold the GIL
+    if use_processes:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        submit = lambda column: executor.submit(profile_column_client_side, manager.connection_config, table_name, column)
+    else:
+        executor = ThreadPoolExecutor(max_workers=min(workers, manager.pool_size))
+        submit = lambda column: executor.submit(profile_column, manager, table_name, column)
+
+    with executor:
+        futures = {submit(column): column for column in columns}
+        for future in as_completed(futures):
+            column = futures[future]
+            try:
+                report[column] = future.result()
+            except Exception as e:
+                # Worker processes can fail in more ways than the connector's
+                # errors; one bad column still leaves the rest of the report
+                print(f"Error profiling column '{column}': {e}")
+                report[column] = None
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Profiled {len(columns)} columns of '{table_name}' in {elapsed:.2f}s")
+    # Keep the table's column order rather than completion order
+    return {column: report[column] for column in columns}
+
+
+def print_profile_report(table_name, report):
+    def fmt(value):
+        if value is None:
+            return '-'
+        if isinstance(value, float):
+            return f"{value:.4g}"
+        return str(value)
+
+    headings = ['count', 'mean', 'std_dev', 'min_value', 'median', 'max_value', 'mode', 'skewness', 'kurtosis']
+    print(f"\nProfile of '{table_name}':")
+    print(f"{'column':<24}" + ''.join(f"{heading:>14}" for heading in headings))
+    print("=" * (24 + 14 * len(headings)))
+    for column, stats in report.items():
+        if stats is None:
+            print(f"{column:<24}" + f"{'error':>14}")
+            continue
+        print(f"{column:<24}" + ''.join(f"{fmt(stats[heading])[:13]:>14}" for heading in headings))
+
+
+class AsyncBackend:
+    # asyncio front end over the blocking connector: every call runs on its
+    # own pooled connection in a worker thread, and a semaphore caps how many
+    # are in flight, so whole-schema passes overlap the round trips of many
+    # queries without ever waiting on an exhausted pool. asyncio is only
+    # imported here, so other commands don't pay for it at startup
+    def __init__(self, manager, concurrency=None):
+        import asyncio
+        self.manager = manager
+        self.concurrency = max(1, min(concurrency or manager.pool_size, manager.pool_size))
+        self._limit = asyncio.Semaphore(self.concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+
+    async def run(self, function, *args, **kwargs):
+        # function(connection, *args, **kwargs) off the event loop
+        import asyncio
+
+        def call():
+            with self.manager.connection() as connection:
+                return function(connection, *args, **kwargs)
+
+        async with self._limit:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    async def tables(self):
+        # The checkpoint table is bookkeeping, not data
+        return [table for table in await self.run(schema_cache.tables) if table != PROGRESS_TABLE]
+
+    async def describe_table(self, table_name):
+        return await self.run(schema_cache.columns, table_name)
+
+    async def head(self, table_name, num_rows=5):
+        return await self.run(head_rows, table_name, num_rows)
+
+    async def foot(self, table_name, num_rows=5):
+        return await self.run(foot_rows, table_name, num_rows)
+
+    async def column_stats(self, table_name, column_name, pushdown=True):
+        return await self.run(column_stats, table_name, column_name, pushdown)
+
+    async def describe_schema(self, tables=None):
+        import asyncio
+        tables = tables or await self.tables()
+        described = await asyncio.gather(*(self.describe_table(table) for table in tables))
+        return dict(zip(tables, described))
+
+    async def profile_table(self, table_name):
+        return (await self.profile_schema([table_name]))[table_name]
+
+    async def profile_schema(self, tables=None):
+        # Every (table, column) is queued at once, so the limiter keeps the
+        # pool busy across table boundaries instead of table by table
+        import asyncio
+        start_time = time.perf_counter()
+        schema = await self.describe_schema(tables)
+        jobs = [(table, column) for table, columns in schema.items() for column, _ in columns]
+
+        async def profile(table, column):
+            try:
+                return await self.column_stats(table, column)
+            except Exception as e:
+                print(f"Error profiling column '{table}.{column}': {e}")
+                return None
+
+        results = await asyncio.gather(*(profile(table, column) for table, column in jobs))
+        report = {table: {} for table in schema}
+        for (table, column), stats in zip(jobs, results):
+            report[table][column] = stats
+
+        elapsed = time.perf_counter() - start_time
+        print(f"Profiled {len(jobs)} columns in {len(schema)} tables in {elapsed:.2f}s "
+              f"({self.concurrency} concurrent queries)")
+        return report
+
+    def close(self):
+        self._executor.shutdown()
+
+
+def run_async(manager, coroutine_function, *args, concurrency=None):
+    # Synchronous entry point: one event loop for the whole batch of calls
+    import asyncio
+    backend = AsyncBackend(manager, concurrency)
+    try:
+        return asyncio.run(coroutine_function(backend, *args))
     finally:
-        if 'cursor' in locals():
-            cursor.close()
+        backend.close()
+
+
+def get_numeric_columns(connection, table_name):
+    return [
+        column_name for column_name, data_type in schema_cache.columns(connection, table_name)
+        if data_type in NUMERIC_TYPES
+    ]
+
+
+def correlation_from_sums(n, sum_x, sum_y, sum_xx, sum_yy, sum_xy):
+    # Pearson r from pairwise sums; entries with fewer than two rows or no
+    # variance come out as NaN, like pandas' DataFrame.corr()
+    import numpy as np
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = sum_xy - sum_x * sum_y / n
+        var_x = sum_xx - sum_x * sum_x / n
+        var_y = sum_yy - sum_y * sum_y / n
+        matrix = cov / np.sqrt(var_x * var_y)
+    matrix[n < 2] = np.nan
+    return np.clip(matrix, -1.0, 1.0)
+
+
+def accumulate_correlation(chunks, k):
+    # Only k x k running sums are kept, whatever the number of rows. Missing
+    # values are excluded pairwise through the mask products.
+    # Returns (pairwise row counts, correlation matrix).
+    import numpy as np
+    n = np.zeros((k, k))
+    sum_x = np.zeros((k, k))
+    sum_xx = np.zeros((k, k))
+    sum_xy = np.zeros((k, k))
+    shift = None
+
+    for rows in chunks:
+        chunk = np.array(rows, dtype=object).reshape(len(rows), k)
+        chunk[chunk == None] = np.nan  # noqa: E711
+        chunk = chunk.astype(np.float64)
+
+        # Shift by the first chunk's means to avoid cancellation in the sums
+        if shift is None:
+            with np.errstate(invalid='ignore'):
+                shift = np.nan_to_num(np.nanmean(chunk, axis=0)) if len(chunk) else np.zeros(k)
+        mask = ~np.isnan(chunk)
+        values = np.where(mask, chunk - shift, 0.0)
+        weights = mask.astype(np.float64)
+
+        n += weights.T @ weights
+        sum_x += values.T @ weights
+        sum_xx += (values * values).T @ weights
+        sum_xy += values.T @ values
+
+    return n, correlation_from_sums(n, sum_x, sum_x.T, sum_xx, sum_xx.T, sum_xy)
+
+
+def stream_correlation_matrix(connection, table_name, columns, chunk_size=10000):
+    query = f"SELECT {', '.join(columns)} FROM {table_name}"
+    return accumulate_correlation(iter_row_batches(connection, query, batch_size=chunk_size), len(columns))[1]
+
+
+def sampled_correlation_matrix(connection, table_name, columns, sample_size=10000, confidence=0.95):
+    # Pearson r on a sample, with Fisher-z confidence bounds per pair
+    import numpy as np
+    rows = sample_rows(connection, table_name, columns, sample_size)
+    n, matrix = accumulate_correlation([rows] if rows else [], len(columns))
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fisher = np.arctanh(np.clip(matrix, -0.999999, 0.999999))
+        half_width = z / np.sqrt(n - 3)
+        lower = np.tanh(fisher - half_width)
+        upper = np.tanh(fisher + half_width)
+    lower[n <= 3] = np.nan
+    upper[n <= 3] = np.nan
+    return matrix, lower, upper
+
+
+def pushdown_correlation_matrix(connection, table_name, columns):
+    # The server computes every pairwise sum in one aggregate query. a * b is
+    # NULL unless both are present, and adding 0 * b restricts a to the same rows.
+    import numpy as np
+    k = len(columns)
+    means = ', '.join(f"AVG({column}) AS m{idx}" for idx, column in enumerate(columns))
+    centred = [f"({column} - m.m{idx})" for idx, column in enumerate(columns)]
+    pairs = [(i, j) for i in range(k) for j in range(i, k)]
+    expressions = []
+    for i, j in pairs:
+        a, b = centred[i], centred[j]
+        expressions += [
+            f"COUNT({a} * {b})",
+            f"SUM({a} + 0 * {b})",
+            f"SUM({b} + 0 * {a})",
+            f"SUM({a} * {a} + 0 * {b})",
+            f"SUM({b} * {b} + 0 * {a})",
+            f"SUM({a} * {b})"
+        ]
 
+    cursor = connection.cursor()
+    try:
+        cursor.execute(
+            f"SELECT {', '.join(expressions)} FROM {table_name}, (SELECT {means} FROM {table_name}) AS m"
+        )
+        result = [float(value) if value is not None else 0.0 for value in cursor.fetchone()]
+    finally:
+        cursor.close()
+
+    sums = np.zeros((6, k, k))
+    for idx, (i, j) in enumerate(pairs):
+        n, sa, sb, saa, sbb, sab = result[idx * 6:idx * 6 + 6]
+        sums[:, i, j] = (n, sa, sb, saa, sbb, sab)
+        sums[:, j, i] = (n, sb, sa, sbb, saa, sab)
+    return correlation_from_sums(*sums)
+
+
+def correlation_matrix(connection, table_name, pushdown=False, chunk_size=10000, sample_size=None, use_cache=True):
+    # Returns (numeric column names, k x k NumPy matrix)
+    numerical_columns = get_numeric_columns(connection, table_name)
+    if not numerical_columns:
+        return [], None
+    if sample_size:
+        return numerical_columns, sampled_correlation_matrix(connection, table_name, numerical_columns, sample_size)[0]
+
+    if use_cache and result_cache.enabled:
+        import numpy as np
+        fingerprint = result_cache.fingerprint(connection, table_name)
+        cached = result_cache.get(connection, table_name, 'corr', {}, fingerprint)
+        if cached is not None and cached['columns'] == numerical_columns:
+            return numerical_columns, np.array(cached['matrix'], dtype=np.float64)
+
+    if pushdown:
+        matrix = pushdown_correlation_matrix(connection, table_name, numerical_columns)
+    else:
+        matrix = stream_correlation_matrix(connection, table_name, numerical_columns, chunk_size)
 
-def main():
-    connection = None
+    if use_cache and result_cache.enabled:
+        result_cache.put(connection, table_name, 'corr', {}, fingerprint,
+                         {'columns': numerical_columns, 'matrix': matrix.tolist()})
+    return numerical_columns, matrix
 
-    while True:
-        print("\n===== Menu =====")
-        print("1. Connect to MySQL")
-        print("2. Create a new column with categorical encoding")
-        print("3. Describe Column")
-        print("4. Describe Table")
-        print("5. fill NULL using central tendencies")
-        print("6. Correlation table")
-        print("7. Head")
-        print("8. Foot")
-        print("A. Import CSV/JSON")
-        print("B. Export CSV/JSON")
-        print("0. Exit")
 
-        choice = input("Enter your choice: ")
+def calculate_column_correlation(connection, table_name, pushdown=False, chunk_size=10000, sample_size=None):
+    try:
+        import pandas as pd
 
-        if choice == "1":
-            # Connect to MySQL
-            if connection is not None:
-                print("Already connected to MySQL.")
-            else:
-                username = input("Enter MySQL username: ")
-                password = input("Enter MySQL password: ")
-                host = input("Enter MySQL host: ")
-                database = input("Enter MySQL database: ")
-                connection = create_mysql_connection(username, password, host, database)
-                if connection is not None:
-                    print("Connected to MySQL.")
-
-        elif choice == "2":
-            # Create a new column with categorical encoding
-            if connection is None:
-                print("Please connect to MySQL first.")
-            else:
-                create_categorical_encoding(connection)
+        # Only fetch columns whose declared type is numeric
+        numerical_columns = get_numeric_columns(connection, table_name)
+        if not numerical_columns:
+            print(f"No numeric columns found in table '{table_name}'.")
+            return None
+
+        if sample_size:
+            matrix, lower, upper = sampled_correlation_matrix(connection, table_name, numerical_columns, sample_size)
+            print(f"Approximate, from a sample of up to {sample_size} rows (95% CI per pair):")
+            print(pd.DataFrame(lower, index=numerical_columns, columns=numerical_columns).round(3).astype(str)
+                  + " .. " + pd.DataFrame(upper, index=numerical_columns, columns=numerical_columns).round(3).astype(str))
+        else:
+            matrix = correlation_matrix(connection, table_name, pushdown, chunk_size)[1]
 
-        elif choice == "3":
-            if connection is None:
-                print("Please connect to MySQL first.")
-            else:
-                table_name, column_name = get_table_and_column_names(connection)
-                show_column_stats(connection, table_name, column_name)
+        correlation_table = pd.DataFrame(matrix, index=numerical_columns, columns=numerical_columns)
 
-        elif choice == "4":
-            # Describe a table
-            if connection is None:
-                print("Please connect to MySQL first.")
-            else:
-                table_name = input("Enter table name: ")
-                describe_table(connection, table_name)
+        print("Correlation Table:")
+        print(correlation_table)
+        return correlation_table
 
-        elif choice == "5":
-            # fill values
-            if connection is None:
-                print("Please connect to MySQL first.")
-            else:
-                fill_missing_values(connection)
+    except Error as e:
+        print(f"Error calculating correlation table: {e}")
 
-        elif choice == "6":
 
-            if connection is None:
-                print("Please connect to MySQL first.")
+INTEGER_TYPES = [
+    ('TINYINT', -2 ** 7, 2 ** 7 - 1),
+    ('SMALLINT', -2 ** 15, 2 ** 15 - 1),
+    ('MEDIUMINT', -2 ** 23, 2 ** 23 - 1),
+    ('INT', -2 ** 31, 2 ** 31 - 1),
+    ('BIGINT', -2 ** 63, 2 ** 63 - 1)
+]
+INTEGER_PATTERN = re.compile(r'^[+-]?\d+$')
+DECIMAL_PATTERN = re.compile(r'^[+-]?(\d*)\.(\d+)$')
+FLOAT_PATTERN = re.compile(r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$')
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+TEXT_TYPES = ('VARCHAR', 'TEXT')
+# Missing-value markers seen in real exports (HDI.csv uses "..")
+NULL_MARKERS = {'', '..', 'NULL', '\\N'}
+
+
+def valid_date(text):
+    # The pattern alone accepts 2019-02-30, which the INSERT then rejects
+    try:
+        datetime.date.fromisoformat(text)
+        return True
+    except ValueError:
+        return False
+
+
+class ColumnTypeState:
+    # Narrowest type that still fits every value seen so far. States built
+    # over separate chunks of a file are merged before picking the type.
+    def __init__(self):
+        self.kinds = {'int', 'decimal', 'float', 'date'}
+        self.min_int = None
+        self.max_int = None
+        self.int_digits = 0
+        self.scale = 0
+        self.max_length = 0
+        self.non_null = 0
+
+    def update(self, value):
+        if value is None:
+            return
+        if not isinstance(value, str):
+            # Native JSON values
+            if isinstance(value, bool):
+                value = str(int(value))
+            elif isinstance(value, (int, float, Decimal)):
+                value = str(value)
             else:
-                cursor = connection.cursor()
-
-                # Get the list of tables in the database
-                cursor.execute("SHOW TABLES")
-                tables = [table[0] for table in cursor.fetchall()]
-
-                if not tables:
-                    print("No tables found in the database.")
-                    return None, None
-
-                # Choose a table
-                print("Available tables:")
-                for idx, table in enumerate(tables):
-                    print(f"{idx + 1}. {table}")
-
-                table_idx = int(input("Enter the index of the table: ")) - 1
+                value = json.dumps(value)
+        if value.strip() in NULL_MARKERS:
+            # prepare_row only turns markers into NULL in non-text columns;
+            # in a text column the marker itself is stored, so it must fit
+            self.max_length = max(self.max_length, len(value))
+            return
+        self.non_null += 1
+        self.max_length = max(self.max_length, len(value))
+        if not self.kinds:
+            return
 
-                if table_idx < 0 or table_idx >= len(tables):
-                    print("Invalid table index.")
-                    return None, None
+        text = value.strip()
+        digits = text.lstrip('+-')
+        # Zero-padded codes (e.g. "0526301100") must keep their padding
+        padded = len(digits) > 1 and digits[0] == '0' and digits[1] != '.'
+
+        is_int = not padded and INTEGER_PATTERN.match(text) is not None
+        decimal_match = None if padded else DECIMAL_PATTERN.match(text)
+        if is_int:
+            number = int(text)
+            self.min_int = number if self.min_int is None else min(self.min_int, number)
+            self.max_int = number if self.max_int is None else max(self.max_int, number)
+            self.int_digits = max(self.int_digits, len(digits))
+        else:
+            self.kinds.discard('int')
+        if decimal_match:
+            self.int_digits = max(self.int_digits, len(decimal_match.group(1).lstrip('0')))
+            self.scale = max(self.scale, len(decimal_match.group(2)))
+        elif not is_int:
+            self.kinds.discard('decimal')
+        if padded or FLOAT_PATTERN.match(text) is None:
+            self.kinds.discard('float')
+        if 'date' in self.kinds and not (DATE_PATTERN.match(text) and valid_date(text)):
+            self.kinds.discard('date')
+
+    def merge(self, other):
+        self.kinds &= other.kinds
+        for attribute, pick in (('min_int', min), ('max_int', max)):
+            mine, theirs = getattr(self, attribute), getattr(other, attribute)
+            setattr(self, attribute, theirs if mine is None else mine if theirs is None else pick(mine, theirs))
+        self.int_digits = max(self.int_digits, other.int_digits)
+        self.scale = max(self.scale, other.scale)
+        self.max_length = max(self.max_length, other.max_length)
+        self.non_null += other.non_null
+        return self
+
+    def sql_type(self):
+        if self.non_null == 0:
+            return 'VARCHAR(255)'
+        if 'int' in self.kinds:
+            for type_name, low, high in INTEGER_TYPES:
+                if low <= self.min_int and self.max_int <= high:
+                    return type_name
+            if self.int_digits <= 65:
+                return f'DECIMAL({self.int_digits},0)'
+        if 'decimal' in self.kinds:
+            precision = max(self.int_digits + self.scale, 1)
+            if precision <= 65 and self.scale <= 30:
+                return f'DECIMAL({precision},{self.scale})'
+        if 'float' in self.kinds:
+            return 'DOUBLE'
+        if 'date' in self.kinds:
+            return 'DATE'
+        # Keep rows well inside MySQL's 64KB row limit for wide files
+        if self.max_length <= 2048:
+            return f'VARCHAR({self.max_length})'
+        return 'TEXT'
+
+
+# MySQL 8 reserved words: unusable as unquoted identifiers
+MYSQL_RESERVED_WORDS = {
+    'ACCESSIBLE', 'ADD', 'ALL', 'ALTER', 'ANALYZE', 'AND', 'AS', 'ASC', 'ASENSITIVE', 'BEFORE', 'BETWEEN',
+    'BIGINT', 'BINARY', 'BLOB', 'BOTH', 'BY', 'CALL', 'CASCADE', 'CASE', 'CHANGE', 'CHAR', 'CHARACTER', 'CHECK',
+    'COLLATE', 'COLUMN', 'CONDITION', 'CONSTRAINT', 'CONTINUE', 'CONVERT', 'CREATE', 'CROSS', 'CUBE',
+    'CUME_DIST', 'CURRENT_DATE', 'CURRENT_TIME', 'CURRENT_TIMESTAMP', 'CURRENT_USER', 'CURSOR', 'DATABASE',
+    'DATABASES', 'DAY_HOUR', 'DAY_MICROSECOND', 'DAY_MINUTE', 'DAY_SECOND', 'DEC', 'DECIMAL', 'DECLARE',
+    'DEFAULT', 'DELAYED', 'DELETE', 'DENSE_RANK', 'DESC', 'DESCRIBE', 'DETERMINISTIC', 'DISTINCT',
+    'DISTINCTROW', 'DIV', 'DOUBLE', 'DROP', 'DUAL', 'EACH', 'ELSE', 'ELSEIF', 'EMPTY', 'ENCLOSED', 'ESCAPED',
+    'EXCEPT', 'EXISTS', 'EXIT', 'EXPLAIN', 'FALSE', 'FETCH', 'FIRST_VALUE', 'FLOAT', 'FLOAT4', 'FLOAT8', 'FOR',
+    'FORCE', 'FOREIGN', 'FROM', 'FULLTEXT', 'FUNCTION', 'GENERATED', 'GET', 'GRANT', 'GROUP', 'GROUPING',
+    'GROUPS', 'HAVING', 'HIGH_PRIORITY', 'HOUR_MICROSECOND', 'HOUR_MINUTE', 'HOUR_SECOND', 'IF', 'IGNORE', 'IN',
+    'INDEX', 'INFILE', 'INNER', 'INOUT', 'INSENSITIVE', 'INSERT', 'INT', 'INT1', 'INT2', 'INT3', 'INT4', 'INT8',
+    'INTEGER', 'INTERSECT', 'INTERVAL', 'INTO', 'IO_AFTER_GTIDS', 'IO_BEFORE_GTIDS', 'IS', 'ITERATE', 'JOIN',
+    'JSON_TABLE', 'KEY', 'KEYS', 'KILL', 'LAG', 'LAST_VALUE', 'LATERAL', 'LEAD', 'LEADING', 'LEAVE', 'LEFT',
+    'LIKE', 'LIMIT', 'LINEAR', 'LINES', 'LOAD', 'LOCALTIME', 'LOCALTIMESTAMP', 'LOCK', 'LONG', 'LONGBLOB',
+    'LONGTEXT', 'LOOP', 'LOW_PRIORITY', 'MASTER_BIND', 'MASTER_SSL_VERIFY_SERVER_CERT', 'MATCH', 'MAXVALUE',
+    'MEDIUMBLOB', 'MEDIUMINT', 'MEDIUMTEXT', 'MIDDLEINT', 'MINUTE_MICROSECOND', 'MINUTE_SECOND', 'MOD',
+    'MODIFIES', 'NATURAL', 'NOT', 'NO_WRITE_TO_BINLOG', 'NTH_VALUE', 'NTILE', 'NULL', 'NUMERIC', 'OF', 'ON',
+    'OPTIMIZE', 'OPTIMIZER_COSTS', 'OPTION', 'OPTIONALLY', 'OR', 'ORDER', 'OUT', 'OUTER', 'OUTFILE', 'OVER',
+    'PARTITION', 'PERCENT_RANK', 'PRECISION', 'PRIMARY', 'PROCEDURE', 'PURGE', 'RANGE', 'RANK', 'READ', 'READS',
+    'READ_WRITE', 'REAL', 'RECURSIVE', 'REFERENCES', 'REGEXP', 'RELEASE', 'RENAME', 'REPEAT', 'REPLACE',
+    'REQUIRE', 'RESIGNAL', 'RESTRICT', 'RETURN', 'REVOKE', 'RIGHT', 'RLIKE', 'ROW', 'ROWS', 'ROW_NUMBER',
+    'SCHEMA', 'SCHEMAS', 'SECOND_MICROSECOND', 'SELECT', 'SENSITIVE', 'SEPARATOR', 'SET', 'SHOW', 'SIGNAL',
+    'SMALLINT', 'SPATIAL', 'SPECIFIC', 'SQL', 'SQLEXCEPTION', 'SQLSTATE', 'SQLWARNING', 'SQL_BIG_RESULT',
+    'SQL_CALC_FOUND_ROWS', 'SQL_SMALL_RESULT', 'SSL', 'STARTING', 'STORED', 'STRAIGHT_JOIN', 'SYSTEM', 'TABLE',
+    'TERMINATED', 'THEN', 'TINYBLOB', 'TINYINT', 'TINYTEXT', 'TO', 'TRAILING', 'TRIGGER', 'TRUE', 'UNDO',
+    'UNION', 'UNIQUE', 'UNLOCK', 'UNSIGNED', 'UPDATE', 'USAGE', 'USE', 'USING', 'UTC_DATE', 'UTC_TIME',
+    'UTC_TIMESTAMP', 'VALUES', 'VARBINARY', 'VARCHAR', 'VARCHARACTER', 'VARYING', 'VIRTUAL', 'WHEN', 'WHERE',
+    'WHILE', 'WINDOW', 'WITH', 'WRITE', 'XOR', 'YEAR_MONTH', 'ZEROFILL'
+}
+
+
+def sanitize_column_names(header):
+    # Header names become plain identifiers so every later query can use them unquoted
+    names = []
+    for idx, name in enumerate(header):
+        column = re.sub(r'\W+', '_', str(name)).strip('_')[:60]
+        if not column:
+            column = f'column_{idx + 1}'
+        elif column.isdigit():
+            column = f'col_{column}'
+        elif column.upper() in MYSQL_RESERVED_WORDS:
+            # "Order" -> "Order_", so later queries can still use it bare
+            column += '_'
+        while column.lower() in (existing.lower() for existing in names):
+            column += '_'
+        names.append(column)
+    return names
+
+
+IMPORT_EXTENSIONS = ('csv', 'json', 'ndjson', 'jsonl')
+
+
+def source_name(source):
+    # A source is a file path or an (archive path, member name) pair
+    if isinstance(source, tuple):
+        return f"{source[0]}!{source[1]}"
+    return source
+
+
+def source_format(source):
+    name = (source[1] if isinstance(source, tuple) else source).lower()
+    compressed = name.endswith('.gz')
+    if compressed:
+        name = name[:-3]
+    return name.rsplit('.', 1)[-1], compressed
+
+
+def open_import_source(source):
+    # Archive members and .gz files are decompressed on the fly, never extracted
+    if isinstance(source, tuple):
+        with zipfile.ZipFile(source[0]) as archive:
+            member = archive.open(source[1])
+        return io.TextIOWrapper(member, encoding='utf-8-sig', errors='replace', newline='')
+    if source.lower().endswith('.gz'):
+        return gzip.open(source, 'rt', encoding='utf-8-sig', errors='replace', newline='')
+    return open(source, 'r', encoding='utf-8-sig', errors='replace', newline='')
+
+
+def infer_chunk_types(file_path, start, end, num_columns):
+    # Scan the records that *start* in [start, end) of the file. None when
+    # a quoted newline straddles either end, as a chunk then starts reading
+    # mid-record
+    states = [ColumnTypeState() for _ in range(num_columns)]
+    with open(file_path, 'rb') as f:
+        if start > 0:
+            f.seek(start - 1)
+            if f.read(1) != b'\n':
+                f.readline()  # partial line belongs to the previous chunk
+        else:
+            f.seek(start)
+        position = f.tell()
+
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            # A quoted field may contain newlines; keep reading until quotes balance
+            while line.count(b'"') % 2:
+                if position >= end:
+                    return None
+                more = f.readline()
+                if not more:
+                    break
+                line += more
+                position += len(more)
+            try:
+                for row in csv.reader([line.decode('utf-8', errors='replace')]):
+                    for idx, value in enumerate(row[:num_columns]):
+                        states[idx].update(value)
+            except csv.Error:
+                return None
+    return states
+
+
+def infer_stream_column_states(stream):
+    # Sequential inference for sources that can't be seeked (archives, .gz)
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if header is None:
+        return [], []
+    states = [ColumnTypeState() for _ in header]
+    for row in reader:
+        for idx, value in enumerate(row[:len(header)]):
+            states[idx].update(value)
+    return header, states
+
+
+def infer_csv_column_types(file_path, workers=None, chunk_bytes=8 * 1024 * 1024):
+    header, states = infer_csv_column_states(file_path, workers, chunk_bytes)
+    return dict(zip(sanitize_column_names(header), (state.sql_type() for state in states)))
+
+
+def infer_csv_column_states(file_path, workers=None, chunk_bytes=8 * 1024 * 1024):
+    # Full-file type inference, split into byte ranges scanned in parallel.
+    # Returns the raw header and one unmerged ColumnTypeState per column.
+    if isinstance(file_path, tuple) or source_format(file_path)[1]:
+        with open_import_source(file_path) as stream:
+            return infer_stream_column_states(stream)
+
+    with open(file_path, 'rb') as f:
+        header_line = f.readline()
+        data_start = f.tell()
+    header = next(csv.reader([header_line.decode('utf-8-sig', errors='replace')]))
+
+    size = os.path.getsize(file_path)
+    workers = workers or os.cpu_count() or 1
+    num_chunks = max(1, min(workers, (size - data_start) // chunk_bytes))
+    step = max((size - data_start) // num_chunks, 1)
+    bounds = [data_start + step * idx for idx in range(num_chunks)] + [size]
+    ranges = list(zip(bounds[:-1], bounds[1:]))
+
+    if len(ranges) == 1:
+        chunk_states = [infer_chunk_types(file_path, data_start, size, len(header))]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunk_states = list(executor.map(
+                infer_chunk_types,
+                itertools.repeat(file_path), [start for start, _ in ranges], [end for _, end in ranges],
+                itertools.repeat(len(header))
+            ))
+    if any(states is None for states in chunk_states):
+        # Chunk boundaries can't be trusted; read the file in one pass
+        with open_import_source(file_path) as stream:
+            return infer_stream_column_states(stream)
+
+    states = chunk_states[0]
+    for other in chunk_states[1:]:
+        for state, other_state in zip(states, other):
+            state.merge(other_state)
+    return header, states
+
+
+def infer_record_types(records):
+    keys, states = infer_record_states(records)
+    return keys, dict(zip(sanitize_column_names(keys), (state.sql_type() for state in states)))
+
+
+def infer_record_states(records):
+    # JSON records: columns in first-seen key order, types from every value
+    states = {}
+    for record in records:
+        for key, value in record.items():
+            states.setdefault(key, ColumnTypeState()).update(value)
+    return list(states), list(states.values())
+
+
+def infer_source_states(source, workers=None):
+    # (keys, ColumnTypeStates) of one CSV or JSON source; keys are the CSV
+    # header or the JSON keys, before sanitising
+    if source_format(source)[0] == 'csv':
+        return infer_csv_column_states(source, workers)
+    return infer_record_states(iter_json_records(source))
+
+
+def merge_source_types(inferred):
+    # One column set for several sources sharing a table: columns matched
+    # by (case-insensitive) name in first-seen order, each type wide enough
+    # for the values of every source
+    merged = {}
+    for keys, states in inferred:
+        for name, state in zip(sanitize_column_names(keys), states):
+            merged.setdefault(name.lower(), (name, ColumnTypeState()))[1].merge(state)
+    return {name: state.sql_type() for name, state in merged.values()}
+
+
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def iter_json_records(source, chunk_size=1024 * 1024):
+    # Incremental parser for a top-level array, NDJSON or concatenated
+    # objects: only the current chunk plus one partial record is buffered
+    decoder = json.JSONDecoder()
+    with open_import_source(source) as jsonfile:
+        buffer = jsonfile.read(chunk_size)
+        eof = not buffer
+        pos = JSON_WHITESPACE.match(buffer).end()
+        in_array = buffer.startswith('[', pos)
+        if in_array:
+            pos += 1
+
+        while True:
+            # Skip whitespace and, inside an array, the commas between records
+            pos = JSON_WHITESPACE.match(buffer, pos).end()
+            while in_array and buffer.startswith(',', pos):
+                pos = JSON_WHITESPACE.match(buffer, pos + 1).end()
+
+            if pos >= len(buffer) or not eof and len(buffer) - pos < 2:
+                if eof:
+                    return
+                more = jsonfile.read(chunk_size)
+                eof = not more
+                buffer = buffer[pos:] + more
+                pos = 0
+                continue
+            if in_array and buffer[pos] == ']':
+                return
+
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # Record cut off at the end of the chunk
+                more = jsonfile.read(chunk_size)
+                eof = not more
+                buffer = buffer[pos:] + more
+                pos = 0
+                continue
+            yield record
+            pos = end
+
+
+def record_values(record, keys):
+    # Values in column order, whatever order the keys appear in the record
+    values = []
+    for key in keys:
+        value = record.get(key)
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value)
+        values.append(value)
+    return values
+
+
+def prepare_row(row, width, non_text_positions):
+    # Missing markers become NULL in non-text columns; short rows are padded
+    row = list(row[:width]) + [None] * (width - len(row))
+    for idx in non_text_positions:
+        value = row[idx]
+        if isinstance(value, str):
+            value = value.strip()
+            row[idx] = value if value not in NULL_MARKERS else None
+    return row
+
+
+def iter_batches(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def insert_batches(connection, cursor, insert_query, rows, batch_size=1000, commit_every=10000, progress=None):
+    # executemany() rewrites a plain INSERT into multi-row VALUES statements,
+    # so every batch costs one round trip instead of one per row. A progress
+    # row is advanced inside each commit, counting rows of the source.
+    total = 0
+    uncommitted = 0
+    start_time = time.perf_counter()
+
+    for batch in iter_batches(rows, batch_size):
+        cursor.executemany(insert_query, batch)
+        total += len(batch)
+        uncommitted += len(batch)
+
+        if uncommitted >= commit_every:
+            if progress is not None:
+                progress.save(progress.position + uncommitted)
+            connection.commit()
+            uncommitted = 0
+            elapsed = time.perf_counter() - start_time
+            print(f"{total} rows committed ({total / elapsed:.0f} rows/s)")
+
+    if progress is not None:
+        progress.clear()
+    connection.commit()
+    elapsed = time.perf_counter() - start_time
+    rate = total / elapsed if elapsed > 0 else float(total)
+    print(f"{total} rows inserted in {elapsed:.2f}s ({rate:.0f} rows/s)")
+    return total
+
+
+def local_infile_enabled(connection):
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SHOW GLOBAL VARIABLES LIKE 'local_infile'")
+        result = cursor.fetchone()
+        return result is not None and str(result[1]).upper() in ("ON", "1")
+    finally:
+        cursor.close()
+
+
+def detect_line_terminator(file_path):
+    # LOAD DATA needs the file's own line ending, or every last field keeps a \r
+    with open(file_path, 'rb') as f:
+        return '\\r\\n' if f.readline().endswith(b'\r\n') else '\\n'
+
+
+def load_data_infile(connection, cursor, table_name, file_path, column_types, progress=None):
+    # Let the server parse the whole file; only used when local_infile is ON
+    # and the connection was opened with allow_local_infile=True
+    start_time = time.perf_counter()
+    escaped_path = file_path.replace('\\', '\\\\').replace("'", "\\'")
+    variables = [f"@v{idx}" for idx in range(len(column_types))]
+    assignments = [
+        f"{column} = @v{idx}" if column_types[column].startswith(TEXT_TYPES)
+        else f"{column} = IF(TRIM(@v{idx}) IN ({', '.join(repr(marker) for marker in sorted(NULL_MARKERS))}), NULL, TRIM(@v{idx}))"
+        for idx, column in enumerate(column_types)
+    ]
+    load_query = (
+        f"LOAD DATA LOCAL INFILE '{escaped_path}' INTO TABLE {table_name} "
+        f"CHARACTER SET utf8mb4 "
+        f"FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+        f"LINES TERMINATED BY '{detect_line_terminator(file_path)}' IGNORE 1 LINES ({', '.join(variables)}) "
+        f"SET {', '.join(assignments)}"
+    )
+    cursor.execute(load_query)
+    total = cursor.rowcount
+    if progress is not None:
+        progress.clear()
+    connection.commit()
+    elapsed = time.perf_counter() - start_time
+    rate = total / elapsed if elapsed > 0 else float(total)
+    print(f"{total} rows loaded in {elapsed:.2f}s ({rate:.0f} rows/s)")
+    return total
+
+
+def source_column_types(keys, table_types):
+    # This source's columns, in its own order, typed as the shared table
+    by_lower = {name.lower(): (name, sql_type) for name, sql_type in table_types.items()}
+    return dict(by_lower[name.lower()] for name in sanitize_column_names(keys))
+
+
+def import_job_key(source):
+    # The same file, unchanged, is the same job, so rerunning a command resumes it
+    path = source[0] if isinstance(source, tuple) else source
+    stat = os.stat(path)
+    return f"{source_name(source)}:{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def import_data(connection, table_name, file_path, batch_size=1000, commit_every=10000, use_load_data=False,
+                workers=None, resumable=True, restart=False, table_types=None):
+    # table_types: column name -> SQL type of an already created table
+    # (import_many's merged types); the file's own inferred types otherwise
+    try:
+        # Determine file type based on extension (after any .gz)
+        file_extension, compressed = source_format(file_path)
+        plain_file = not compressed and not isinstance(file_path, tuple)
+
+        progress = None
+        if resumable and file_extension in ('csv', 'json', 'ndjson', 'jsonl'):
+            progress = JobProgress(connection, 'import', table_name, import_job_key(file_path)).load()
+            schema_cache.invalidate(connection, table_name)
+            if progress.position and (restart or table_name not in schema_cache.tables(connection)):
+                # The rows an interrupted run committed can't be told apart
+                # from the table's other rows, so restarting over them would
+                # import them twice. A dropped table, or one emptied before
+                # a restart, starts over
+                if table_name in schema_cache.tables(connection) and not table_is_empty(connection, table_name):
+                    print(f"Table '{table_name}' already holds rows of an interrupted import of "
+                          f"'{source_name(file_path)}'; truncate it before restarting, or resume instead.")
+                    return None
+                progress = JobProgress(connection, 'import', table_name, import_job_key(file_path)).load(True)
+            if progress.position:
+                print(f"Resuming import of '{source_name(file_path)}' after row {progress.position}.")
 
-                table_name = tables[table_idx]
-                calculate_column_correlation(connection, table_name)
+        cursor = connection.cursor()
 
-        elif choice == "7":
-            # fill values
-            if connection is None:
-                print("Please connect to MySQL first.")
+        if file_extension == 'csv':
+            # Scan the whole file first so every column gets its narrowest type
+            if table_types is not None:
+                with open_import_source(file_path) as csvfile:
+                    header = next(csv.reader(csvfile), [])
+                column_types = source_column_types(header, table_types)
             else:
-                cursor = connection.cursor()
-
-                # Get the list of tables in the database
-                cursor.execute("SHOW TABLES")
-                tables = [table[0] for table in cursor.fetchall()]
-
-                if not tables:
-                    print("No tables found in the database.")
-                    return None, None
-
-                # Choose a table
-                print("Available tables:")
-                for idx, table in enumerate(tables):
-                    print(f"{idx + 1}. {table}")
+                column_types = infer_csv_column_types(file_path, workers)
+            if not column_types:
+                print("CSV file is empty.")
+                return 0
+
+            # Create table if it doesn't exist
+            create_table_query = f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(f'{col} {column_types[col]}' for col in column_types)})"
+            cursor.execute(create_table_query)
+            schema_cache.invalidate(connection, table_name)
+            result_cache.invalidate(connection, table_name)
+            tracker = ColumnStateTracker(connection, table_name)
+            if table_types is None:
+                # import_many's workers share the table; no one of them sees every row
+                tracker.begin()
+
+            width = len(column_types)
+            non_text = [idx for idx, col in enumerate(column_types) if not column_types[col].startswith(TEXT_TYPES)]
+            # LOAD DATA is all or nothing, so it can only start a job, not resume one
+            skip = progress.position if progress is not None else 0
+            if plain_file and use_load_data and not skip and local_infile_enabled(connection):
+                total = load_data_infile(connection, cursor, table_name, file_path, column_types, progress)
+                if tracker.states is not None:
+                    # The server parsed the file, so read it once more for the states
+                    with open_import_source(file_path) as csvfile:
+                        csv_reader = csv.reader(csvfile)
+                        next(csv_reader)
+                        for _ in tracker.observe(list(column_types), (prepare_row(row, width, non_text) for row in csv_reader)):
+                            pass
+            else:
+                with open_import_source(file_path) as csvfile:
+                    csv_reader = csv.reader(csvfile)
+                    next(csv_reader)
+
+                    # Stream the file in batches, past rows an earlier run committed
+                    insert_query = f"INSERT INTO {table_name} ({', '.join(column_types)}) VALUES ({', '.join(['%s' for _ in column_types])})"
+                    rows = (prepare_row(row, width, non_text) for row in itertools.islice(csv_reader, skip, None))
+                    total = insert_batches(connection, cursor, insert_query, tracker.observe(list(column_types), rows),
+                                           batch_size, commit_every, progress)
+            tracker.commit()
+
+        elif file_extension in ('json', 'ndjson', 'jsonl'):
+            # First streaming pass: column names and types from every record
+            if table_types is not None:
+                keys = infer_record_states(iter_json_records(file_path))[0]
+                column_types = source_column_types(keys, table_types)
+            else:
+                keys, column_types = infer_record_types(iter_json_records(file_path))
+            if not keys:
+                print("JSON file is empty.")
+                return 0
+
+            # Create table if it doesn't exist
+            create_table_query = f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(f'{col} {column_types[col]}' for col in column_types)})"
+            cursor.execute(create_table_query)
+            schema_cache.invalidate(connection, table_name)
+            result_cache.invalidate(connection, table_name)
+            tracker = ColumnStateTracker(connection, table_name)
+            if table_types is None:
+                # import_many's workers share the table; no one of them sees every row
+                tracker.begin()
+
+            # Second streaming pass straight into batched inserts
+            width = len(column_types)
+            non_text = [idx for idx, col in enumerate(column_types) if not column_types[col].startswith(TEXT_TYPES)]
+            insert_query = f"INSERT INTO {table_name} ({', '.join(column_types)}) VALUES ({', '.join(['%s' for _ in column_types])})"
+            skip = progress.position if progress is not None else 0
+            rows = (
+                prepare_row(record_values(record, keys), width, non_text)
+                for record in itertools.islice(iter_json_records(file_path), skip, None)
+            )
+            total = insert_batches(connection, cursor, insert_query, tracker.observe(list(column_types), rows),
+                                   batch_size, commit_every, progress)
+            tracker.commit()
 
-                table_idx = int(input("Enter the index of the table: ")) - 1
+        else:
+            print("Unsupported file format. Only CSV, JSON and NDJSON are supported.")
+            return None
 
-                if table_idx < 0 or table_idx >= len(tables):
-                    print("Invalid table index.")
-                    return None, None
+        print(f"Data imported from {file_extension.upper()} '{source_name(file_path)}' to table '{table_name}'")
+        return total
 
-                table_name = tables[table_idx]
-                num_rows = int(input("No. of rows:"))
-                head(connection, table_name, num_rows)
+    except Error as e:
+        print(f"Error importing data: {e}")
+        return None
+    finally:
+        if 'cursor' in locals():
+            cursor.close()
 
-        elif choice == "8":
-            # fill values
-            if connection is None:
-                print("Please connect to MySQL first.")
-            else:
-                cursor = connection.cursor()
 
-                # Get the list of tables in the database
-                cursor.execute("SHOW TABLES")
-                tables = [table[0] for table in cursor.fetchall()]
+def expand_import_sources(location):
+    # A directory, a glob pattern, a .zip archive or a single (optionally .gz) file
+    if os.path.isdir(location):
+        paths = sorted(os.path.join(location, name) for name in os.listdir(location))
+    elif glob.has_magic(location):
+        paths = sorted(glob.glob(location))
+    else:
+        paths = [location]
+
+    sources = []
+    for path in paths:
+        if path.lower().endswith('.zip'):
+            with zipfile.ZipFile(path) as archive:
+                sources += [
+                    (path, member) for member in archive.namelist()
+                    if not member.endswith('/') and not member.startswith('__MACOSX/')
+                    and source_format(member)[0] in IMPORT_EXTENSIONS
+                ]
+        elif os.path.isfile(path) and source_format(path)[0] in IMPORT_EXTENSIONS:
+            sources.append(path)
+    return sources
+
+
+def table_name_for_source(source):
+    name = os.path.basename(source[1] if isinstance(source, tuple) else source)
+    return sanitize_column_names([name.split('.')[0]])[0].lower()
+
+
+def import_many(manager, location, table_name=None, workers=4, **options):
+    # Load every file/member concurrently, each worker streaming one source
+    # on its own pooled connection, so at most `workers` batches are in flight.
+    # Without a table name every source goes to a table named after it.
+    sources = expand_import_sources(location)
+    if not sources:
+        print(f"No CSV/JSON files found at '{location}'.")
+        return []
+
+    table_types = None
+    if table_name and len(sources) > 1:
+        # Each file's own narrowest types could reject another file's values,
+        # so infer every source first and create the shared table once
+        table_types = merge_source_types(infer_source_states(source) for source in sources)
+        with manager.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table_name} "
+                    f"({', '.join(f'{column} {sql_type}' for column, sql_type in table_types.items())})"
+                )
+            finally:
+                cursor.close()
+            schema_cache.invalidate(connection, table_name)
+
+    def load(source):
+        target = table_name or table_name_for_source(source)
+        start_time = time.perf_counter()
+        with manager.connection() as connection:
+            rows = import_data(connection, target, source, table_types=table_types, **options)
+        return source, target, rows, time.perf_counter() - start_time
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, manager.pool_size, len(sources)))) as executor:
+        for future in as_completed([executor.submit(load, source) for source in sources]):
+            results.append(future.result())
+
+    print(f"\n{'source':<40} {'table':<24} {'rows':>10} {'seconds':>9} {'rows/s':>10}")
+    print("=" * 97)
+    for source, target, rows, elapsed in results:
+        rate = f"{rows / elapsed:.0f}" if rows and elapsed > 0 else '-'
+        print(f"{source_name(source)[-40:]:<40} {target:<24} {rows if rows is not None else 'error':>10} {elapsed:>9.2f} {rate:>10}")
+    return results
+
+
+ARROW_INTEGER_TYPES = {'tinyint', 'smallint', 'mediumint', 'int', 'integer', 'bigint', 'bit', 'year'}
+ARROW_BINARY_TYPES = {'binary', 'varbinary', 'tinyblob', 'blob', 'mediumblob', 'longblob'}
+# Codecs the columnar writers apply inside the file (Arrow IPC only has two)
+COLUMNAR_CODECS = {
+    'parquet': ('snappy', 'gzip', 'brotli', 'zstd', 'lz4', 'none'),
+    'arrow': ('lz4', 'zstd'),
+    'feather': ('lz4', 'zstd'),
+}
+
+
+def detect_export_format(file_path):
+    # "out.csv.gz" -> ("csv", "gzip"), "out.ndjson.zst" -> ("ndjson", "zstd")
+    name = file_path.lower()
+    compression = None
+    for suffix, codec in (('.gz', 'gzip'), ('.zst', 'zstd')):
+        if name.endswith(suffix):
+            compression = codec
+            name = name[:-len(suffix)]
+    file_format = name.rsplit('.', 1)[-1]
+    if file_format == 'jsonl':
+        file_format = 'ndjson'
+    return file_format, compression
+
+
+def open_export_stream(file_path, compression=None):
+    if compression == 'gzip':
+        return gzip.open(file_path, 'wt', encoding='utf-8', newline='')
+    if compression == 'zstd':
+        import zstandard
+        raw = open(file_path, 'wb')
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(raw), encoding='utf-8', newline='')
+    return open(file_path, 'w', encoding='utf-8', newline='')
+
+
+def iter_row_batches(connection, query, params=(), batch_size=10000):
+    # Server-side (unbuffered) cursor: at most one batch is ever held in memory
+    cursor = connection.cursor(buffered=False)
+    try:
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        cursor.close()
+
+
+def write_csv_batches(batches, columns, stream):
+    writer = csv.writer(stream)
+    writer.writerow(columns)
+    total = 0
+    for rows in batches:
+        writer.writerows(rows)
+        total += len(rows)
+    return total
+
+
+def json_object(keys, row):
+    # keys are already JSON-encoded. A Decimal is written as its exact JSON
+    # number rather than a string or a rounded float
+    return '{' + ', '.join(
+        f"{key}: {value if isinstance(value, Decimal) else json.dumps(value, default=str)}"
+        for key, value in zip(keys, row)
+    ) + '}'
+
+
+def write_ndjson_batches(batches, columns, stream):
+    keys = [json.dumps(column) for column in columns]
+    total = 0
+    for rows in batches:
+        stream.write(''.join(json_object(keys, row) + '\n' for row in rows))
+        total += len(rows)
+    return total
+
+
+def write_json_batches(batches, columns, stream):
+    # One JSON array, still streamed a batch at a time
+    keys = [json.dumps(column) for column in columns]
+    total = 0
+    for rows in batches:
+        stream.write(('[\n' if total == 0 else ',\n') + ',\n'.join(json_object(keys, row) for row in rows))
+        total += len(rows)
+    stream.write('\n]\n' if total else '[]\n')
+    return total
+
+
+def arrow_schema(column_types, numeric_formats=None):
+    # DECIMAL keeps its precision and scale, FLOAT/DOUBLE become float64 and
+    # temporal/text types Arrow's own
+    import pyarrow as pa
+    numeric_formats = numeric_formats or {}
+    fields = []
+    for column_name, data_type in column_types:
+        precision, scale = numeric_formats.get(column_name, (None, None))
+        if data_type in ARROW_INTEGER_TYPES:
+            arrow_type = pa.int64()
+        elif data_type in ('decimal', 'numeric') and precision is not None:
+            arrow_type = (pa.decimal128 if precision <= 38 else pa.decimal256)(precision, scale or 0)
+        elif data_type in NUMERIC_TYPES:
+            arrow_type = pa.float64()
+        elif data_type == 'date':
+            arrow_type = pa.date32()
+        elif data_type in ('datetime', 'timestamp'):
+            arrow_type = pa.timestamp('us')
+        elif data_type in ARROW_BINARY_TYPES:
+            arrow_type = pa.binary()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column_name, arrow_type))
+    return pa.schema(fields)
 
-                if not tables:
-                    print("No tables found in the database.")
-                    return None, None
 
-                # Choose a table
-                print("Available tables:")
-                for idx, table in enumerate(tables):
-                    print(f"{idx + 1}. {table}")
+def write_arrow_batches(batches, column_types, file_path, file_format, compression=None, numeric_formats=None):
+    import pyarrow as pa
+    schema = arrow_schema(column_types, numeric_formats)
+    float_columns = [idx for idx, field in enumerate(schema) if pa.types.is_floating(field.type)]
+    text_columns = [idx for idx, field in enumerate(schema) if pa.types.is_string(field.type)]
 
-                table_idx = int(input("Enter the index of the table: ")) - 1
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(file_path, schema, compression=compression or 'snappy')
+    else:
+        options = pa.ipc.IpcWriteOptions(compression=compression) if compression else None
+        writer = pa.ipc.new_file(file_path, schema, options=options)
 
-                if table_idx < 0 or table_idx >= len(tables):
-                    print("Invalid table index.")
-                    return None, None
+    total = 0
+    try:
+        for rows in batches:
+            arrays = []
+            for idx, values in enumerate(zip(*rows)):
+                if idx in float_columns:
+                    values = [float(value) if value is not None else None for value in values]
+                elif idx in text_columns:
+                    values = [str(value) if value is not None and not isinstance(value, str) else value for value in values]
+                arrays.append(pa.array(values, type=schema.field(idx).type))
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            total += len(rows)
+    finally:
+        writer.close()
+    return total
+
+
+def export_table(connection, table_name, file_path, file_format=None, compression=None, batch_size=10000,
+                 key_range=None):
+    detected_format, detected_compression = detect_export_format(file_path)
+    file_format = file_format or detected_format
+    compression = compression or detected_compression
+    if file_format in COLUMNAR_CODECS:
+        # Parquet and Arrow compress inside the file, so a .gz/.zst name would
+        # promise an outer stream that isn't there
+        codecs = ', '.join(COLUMNAR_CODECS[file_format])
+        if detected_compression:
+            print(f"'{file_path}': {file_format} files are compressed internally; drop the compression suffix "
+                  f"and pass one of the format's codecs ({codecs}) as compression instead.")
+            return 0
+        if compression is not None and compression not in COLUMNAR_CODECS[file_format]:
+            print(f"Unsupported {file_format} compression '{compression}'. Use one of: {codecs}.")
+            return 0
+
+    column_types = schema_cache.columns(connection, table_name)
+    columns = [column_name for column_name, _ in column_types]
+    query = f"SELECT {', '.join(columns)} FROM {table_name}"
+    params = ()
+    if key_range is not None:
+        key, low, high = key_range
+        query += f" WHERE {key} >= %s AND {key} < %s"
+        params = (low, high)
+
+    start_time = time.perf_counter()
+    batches = iter_row_batches(connection, query, params, batch_size)
+    if file_format in COLUMNAR_CODECS:
+        total = write_arrow_batches(batches, column_types, file_path, file_format, compression,
+                                    schema_cache.numeric_formats(connection, table_name))
+    elif file_format in ('csv', 'ndjson', 'json'):
+        with open_export_stream(file_path, compression) as stream:
+            if file_format == 'csv':
+                total = write_csv_batches(batches, columns, stream)
+            elif file_format == 'json':
+                total = write_json_batches(batches, columns, stream)
+            else:
+                total = write_ndjson_batches(batches, columns, stream)
+    else:
+        print(f"Unsupported export format '{file_format}'. Use CSV, JSON, NDJSON, Parquet or Arrow.")
+        return 0
+
+    elapsed = time.perf_counter() - start_time
+    rate = total / elapsed if elapsed > 0 else float(total)
+    print(f"{total} rows exported to '{file_path}' in {elapsed:.2f}s ({rate:.0f} rows/s)")
+    return total
+
+
+def shard_path(file_path, idx):
+    # "out.csv.gz" -> "out.part000.csv.gz"
+    directory, name = os.path.split(file_path)
+    stem, dot, extension = name.partition('.')
+    return os.path.join(directory, f"{stem}.part{idx:03d}{dot}{extension}")
+
+
+def export_table_sharded(manager, table_name, file_path, shards=4, **options):
+    # Split an integer primary key into ranges and export each to its own file
+    with manager.connection() as connection:
+        key = get_primary_key(connection, table_name)
+        low = high = None
+        if len(key) == 1:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(f"SELECT MIN({key[0]}), MAX({key[0]}) FROM {table_name}")
+                low, high = cursor.fetchone()
+            finally:
+                cursor.close()
+        if shards <= 1 or not isinstance(low, int):
+            return export_table(connection, table_name, file_path, **options)
+
+    step = max((high - low + 1 + shards - 1) // shards, 1)
+    ranges = [(key[0], start, start + step) for start in range(low, high + 1, step)]
+
+    def export_shard(idx, key_range):
+        with manager.connection() as connection:
+            return export_table(connection, table_name, shard_path(file_path, idx), key_range=key_range, **options)
+
+    with ThreadPoolExecutor(max_workers=min(len(ranges), manager.pool_size)) as executor:
+        futures = [executor.submit(export_shard, idx, key_range) for idx, key_range in enumerate(ranges)]
+        return sum(future.result() for future in futures)
+
+
+FILL_METHODS = {'mean': '1', 'median': '2', 'mode': '3'}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='main.py',
+        description="Run PySql operations without the interactive menu. "
+                    "Chain several operations on one connection with --then."
+    )
+    parser.add_argument('--host', default=os.environ.get('MYSQL_HOST', 'localhost'))
+    parser.add_argument('--user', default=os.environ.get('MYSQL_USER', 'root'))
+    parser.add_argument('--password', default=os.environ.get('MYSQL_PWD', ''))
+    parser.add_argument('--database', default=os.environ.get('MYSQL_DATABASE'))
+    parser.add_argument('--pool-size', type=int, default=4,
+                        help='connections in the pool, at least 2 (one stays checked out for the commands)')
+    parser.add_argument('--no-cache', action='store_true', help='ignore and skip the on-disk result cache')
+    parser.add_argument('--track-states', action='store_true',
+                        help='update cached column sketches row by row during imports, fills and encodings')
+    parser.add_argument('--timings', action='store_true', help='print a per-operation timing summary to stderr')
+    parser.add_argument('--timings-json', metavar='PATH', help='write per-operation timings as JSON')
+    parser.add_argument('--slow-query-ms', type=float, help='log queries slower than this')
+    parser.add_argument('--slow-query-log', metavar='PATH', help='slow query log file (default stderr)')
+    parser.add_argument('--profile-python', action='store_true', help='cProfile each operation')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    command = commands.add_parser('import', help='load a CSV/JSON file, directory, glob or zip')
+    command.add_argument('table', nargs='?', help='target table (default: one table per file)')
+    command.add_argument('path')
+    command.add_argument('--batch-size', type=int, default=1000)
+    command.add_argument('--commit-every', type=int, default=10000)
+    command.add_argument('--load-data', action='store_true', help='use LOAD DATA LOCAL INFILE when allowed')
+    command.add_argument('--workers', type=int, default=4)
+    command.add_argument('--restart', action='store_true', help='discard the checkpoint and import from the start (into an emptied table)')
+    command.add_argument('--no-checkpoint', action='store_true', help='don\'t record progress in pysql_progress')
+
+    command = commands.add_parser('export', help='stream a table to CSV/JSON/NDJSON/Parquet/Arrow')
+    command.add_argument('table')
+    command.add_argument('path')
+    command.add_argument('--shards', type=int, default=1)
+    command.add_argument('--batch-size', type=int, default=10000)
+
+    command = commands.add_parser('describe', help='column names and types')
+    command.add_argument('table')
+
+    command = commands.add_parser('stats', help='statistics of one column')
+    command.add_argument('table')
+    command.add_argument('column')
+    command.add_argument('--no-pushdown', action='store_true', help='compute client-side')
+    command.add_argument('--sample', type=int, metavar='N', help='approximate from N sampled rows, with CIs')
+    command.add_argument('--distinct', action='store_true',
+                         help='with --sample, add a HyperLogLog distinct count (scans the whole table)')
+    command.add_argument('--decimal-policy', choices=DECIMAL_POLICIES, default='scaled',
+                         help='how client-side stats hold DECIMAL values (default: scaled int64)')
+    command.add_argument('--approximate', action='store_true',
+                         help='answer from incrementally maintained sketches when they are current')
+
+    command = commands.add_parser('profile', help='statistics of every column')
+    command.add_argument('table')
+    command.add_argument('--processes', action='store_true', help='compute client-side in worker processes')
+
+    command = commands.add_parser('schema', help='describe (or profile) every table concurrently')
+    command.add_argument('tables', nargs='*', help='tables to include (default: all)')
+    command.add_argument('--profile', action='store_true', help='statistics of every column')
+    command.add_argument('--concurrency', type=int, help='queries in flight (default: pool size)')
+
+    command = commands.add_parser('fill', help='fill NULLs with a central tendency')
+    command.add_argument('table')
+    command.add_argument('columns', nargs='+')
+    command.add_argument('--method', choices=sorted(FILL_METHODS), default='mean')
+    command.add_argument('--restart', action='store_true', help='ignore any checkpoint and fill from the start')
+    command.add_argument('--no-checkpoint', action='store_true', help='don\'t record progress in pysql_progress')
+
+    command = commands.add_parser('encode', help='categorical encoding of a column')
+    command.add_argument('table')
+    command.add_argument('column')
+    command.add_argument('new_column', help='new column name, or column prefix with --one-hot')
+    command.add_argument('--one-hot', action='store_true')
+    command.add_argument('--mapping-table', help='persist label codes in this table')
+
+    command = commands.add_parser('corr', help='Pearson correlation of numeric columns')
+    command.add_argument('table')
+    command.add_argument('--pushdown', action='store_true', help='compute the sums in SQL')
+    command.add_argument('--sample', type=int, metavar='N', help='approximate from N sampled rows')
+
+    for name in ('head', 'foot'):
+        command = commands.add_parser(name, help=f'{"first" if name == "head" else "last"} rows of a table')
+        command.add_argument('table')
+        command.add_argument('-n', '--rows', type=int, default=5)
+
+    return parser
+
+
+def run_command(manager, connection, args):
+    # Returns plain data structures; main_cli prints them as JSON
+    if args.command == 'import':
+        if args.table is None or os.path.isdir(args.path) or glob.has_magic(args.path) \
+                or args.path.lower().endswith('.zip'):
+            results = import_many(manager, args.path, args.table, args.workers, batch_size=args.batch_size,
+                                  commit_every=args.commit_every, use_load_data=args.load_data,
+                                  resumable=not args.no_checkpoint, restart=args.restart)
+            return {source_name(source): {'table': table, 'rows': rows, 'seconds': elapsed}
+                    for source, table, rows, elapsed in results}
+        return {'rows': import_data(connection, args.table, args.path, args.batch_size, args.commit_every,
+                                    args.load_data, resumable=not args.no_checkpoint, restart=args.restart)}
+    if args.command == 'export':
+        if args.shards > 1:
+            return {'rows': export_table_sharded(manager, args.table, args.path, args.shards, batch_size=args.batch_size)}
+        return {'rows': export_table(connection, args.table, args.path, batch_size=args.batch_size)}
+    if args.command == 'describe':
+        return dict(schema_cache.columns(connection, args.table))
+    if args.command == 'stats':
+        if args.sample:
+            return sampled_column_stats(connection, args.table, args.column, args.sample, distinct=args.distinct)
+        return column_stats(connection, args.table, args.column, pushdown=not args.no_pushdown,
+                            decimal_policy=args.decimal_policy, approximate=args.approximate)
+    if args.command == 'profile':
+        return profile_table(manager, args.table, use_processes=args.processes)
+    if args.command == 'schema':
+        operation = AsyncBackend.profile_schema if args.profile else AsyncBackend.describe_schema
+        result = run_async(manager, operation, args.tables or None, concurrency=args.concurrency)
+        return result if args.profile else {table: dict(columns) for table, columns in result.items()}
+    if args.command == 'fill':
+        method = FILL_METHODS[args.method]
+        return {'updated': fill_columns(connection, args.table, {column: method for column in args.columns},
+                                        resumable=not args.no_checkpoint, restart=args.restart)}
+    if args.command == 'encode':
+        if args.one_hot:
+            return {'columns': one_hot_encode_column(connection, args.table, args.column, args.new_column)}
+        label_encode_column(connection, args.table, args.column, args.new_column, args.mapping_table)
+        return {'column': args.new_column}
+    if args.command == 'corr':
+        columns, matrix = correlation_matrix(connection, args.table, args.pushdown, sample_size=args.sample)
+        return {
+            column: {other: (None if math.isnan(value) else float(value)) for other, value in zip(columns, row)}
+            for column, row in zip(columns, matrix if matrix is not None else [])
+        }
+    if args.command == 'head':
+        return head_rows(connection, args.table, args.rows)
+    if args.command == 'foot':
+        return foot_rows(connection, args.table, args.rows)
+
+
+def main_cli(argv):
+    # "--then" separates operations that share the first one's connection options
+    segments = [[]]
+    for token in argv:
+        if token == '--then':
+            segments.append([])
+        else:
+            segments[-1].append(token)
+
+    parser = build_parser()
+    parsed = [parser.parse_args(segment) for segment in segments]
+    options = parsed[0]
+    if not options.database:
+        parser.error("--database (or MYSQL_DATABASE) is required")
+    if options.pool_size < 2:
+        # main_cli keeps one connection checked out while profile, schema,
+        # directory imports and sharded exports take more from the pool, so
+        # a single-connection pool would wait forever
+        parser.error("--pool-size must be at least 2")
+
+    if options.timings or options.timings_json or options.slow_query_ms is not None or options.profile_python:
+        instrumentation.enabled = True
+    if options.slow_query_ms is not None:
+        instrumentation.slow_query_seconds = options.slow_query_ms / 1000
+    instrumentation.slow_query_log = options.slow_query_log
+    instrumentation.profile = options.profile_python
+    if options.no_cache:
+        result_cache.enabled = False
+    if options.track_states:
+        result_cache.track_states = True
+
+    load_connector()
+    try:
+        manager = ConnectionManager(options.user, options.password, options.host, options.database,
+                                    options.pool_size, allow_local_infile=any(args.command == 'import' for args in parsed))
+    except Error as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    status = 0
+    with manager.connection() as connection:
+        for args in parsed:
+            try:
+                with instrumentation.operation(args.command):
+                    result = run_command(manager, connection, args)
+                print(json.dumps(result, indent=2, default=str))
+            except (Error, OSError, ImportError) as e:
+                # OSError/ImportError: an unwritable export path or a missing pyarrow/zstandard
+                print(f"Error running {args.command}: {e}", file=sys.stderr)
+                status = 1
+    manager.close()
+
+    if options.timings:
+        instrumentation.summary(sys.stderr)
+    if options.timings_json:
+        instrumentation.to_json(options.timings_json)
+    return status
+
+
+MENU_OPERATIONS = {
+    '1': 'connect', '2': 'encode', '3': 'stats', '4': 'describe', '5': 'fill', '6': 'corr',
+    '7': 'head', '8': 'foot', '9': 'import', 'A': 'import', 'B': 'export', 'C': 'profile', 'D': 'summary',
+    'E': 'profile_schema'
+}
 
-                table_name = tables[table_idx]
-                num_rows = int(input("No. of rows:"))
-                foot(connection, table_name, num_rows)
 
-        elif choice == "9":
+def main():
+    manager = None
+    connection = None
 
-            if connection is None:
-                print("Please connect to MySQL first.")
-            else:
+    while True:
+        print("\n===== Menu =====")
+        print("1. Connect to MySQL")
+        print("2. Create a new column with categorical encoding")
+        print("3. Describe Column")
+        print("4. Describe Table")
+        print("5. fill NULL using central tendencies")
+        print("6. Correlation table")
+        print("7. Head")
+        print("8. Foot")
+        print("A. Import CSV/JSON")
+        print("B. Export CSV/JSON")
+        print("C. Profile whole table")
+        print("E. Profile whole database")
+        print("D. Timing summary")
+        print("0. Exit")
 
-                table = input("Enter table name:")
-                location = input("Enter location of file to be imported:")
-                import_data(connection, table, location)
+        choice = input("Enter your choice: ")
 
-        elif choice == "0":
-            # Exit the loop
-            print("Exiting...")
-            break
+        if connection is not None and choice not in ("0", "1"):
+            # Reconnect transparently if the session dropped while idle
+            try:
+                manager.ensure_alive(connection)
+            except Error as e:
+                print(f"Error reconnecting to MySQL: {e}")
+
+        try:
+            with instrumentation.operation(MENU_OPERATIONS.get(choice.upper(), choice)):
+                if choice == "1":
+                    # Connect to MySQL
+                    if connection is not None:
+                        print("Already connected to MySQL.")
+                    else:
+                        username = input("Enter MySQL username: ")
+                        password = input("Enter MySQL password: ")
+                        host = input("Enter MySQL host: ")
+                        database = input("Enter MySQL database: ")
+                        manager = create_connection_pool(username, password, host, database)
+                        if manager is not None:
+                            connection = manager.get_connection()
+                            print("Connected to MySQL.")
+
+                elif choice == "2":
+                    # Create a new column with categorical encoding
+                    if connection is None:
+                        print("Please connect to MySQL first.")
+                    else:
+                        create_categorical_encoding(connection)
+
+                elif choice == "3":
+                    if connection is None:
+                        print("Please connect to MySQL first.")
+                    else:
+                        table_name, column_name = get_table_and_column_names(connection)
+                        if table_name is None:
+                            continue
+                        sample_size = input("Sample size for approximate statistics (blank for exact): ").strip()
+                        if sample_size:
+                            show_sampled_column_stats(connection, table_name, column_name, int(sample_size))
+                        else:
+                            show_column_stats(connection, table_name, column_name)
+
+                elif choice == "4":
+                    # Describe a table
+                    if connection is None:
+                        print("Please connect to MySQL first.")
+                    else:
+                        table_name = input("Enter table name: ")
+                        describe_table(connection, table_name)
+
+                elif choice == "5":
+                    # fill values
+                    if connection is None:
+                        print("Please connect to MySQL first.")
+                    else:
+                        fill_missing_values(connection)
+
+                elif choice == "6":
+
+                    if connection is None:
+                        print("Please connect to MySQL first.")
+                    else:
+                        table_name = get_table_name(connection)
+                        if table_name is None:
+                            continue
+                        sample_size = input("Sample size for approximate correlation (blank for exact): ").strip()
+                        calculate_column_correlation(connection, table_name, sample_size=int(sample_size) if sample_size else None)
+
+                elif choice == "7":
+                    # fill values
+                    if connection is None:
+                        print("Please connect to MySQL first.")
+                    else:
+                        table_name = get_table_name(connection)
+                        if table_name is None:
+                            continue
+                        num_rows = int(input("No. of rows:"))
+                        key, (first_key, last_key) = head(connection, table_name, num_rows)
+                        browse_pages(connection, table_name, key, num_rows, first_key, last_key)
+
+                elif choice == "8":
+                    # fill values
+                    if connection is None:
+                        print("Please connect to MySQL first.")
+                    else:
+                        table_name = get_table_name(connection)
+                        if table_name is None:
+                            continue
+                        num_rows = int(input("No. of rows:"))
+                        key, (first_key, last_key) = foot(connection, table_name, num_rows)
+                        browse_pages(connection, table_name, key, num_rows, first_key, last_key)
+
+                elif choice == "9" or choice.upper() == "A":
+
+                    if connection is None:
+                        print("Please connect to MySQL first.")
+                    else:
+
+                        table = input("Enter table name:")
+                        location = input("Enter location of file to be imported:")
+                        if os.path.isdir(location) or glob.has_magic(location) or location.lower().endswith('.zip'):
+                            # Several files: a blank table name gives each file its own table
+                            import_many(manager, location, table or None)
+                        else:
+                            import_data(connection, table, location)
+
+                elif choice.upper() == "B":
+                    # Export a table to CSV/JSON/NDJSON/Parquet, optionally .gz/.zst compressed
+                    if connection is None:
+                        print("Please connect to MySQL first.")
+                    else:
+                        table_name = get_table_name(connection)
+                        if table_name is None:
+                            continue
+                        location = input("Enter location of file to export to (.csv, .json, .ndjson, .parquet, optional .gz/.zst): ")
+                        shards = input("Number of parallel shards (blank for 1): ").strip()
+                        try:
+                            if shards and int(shards) > 1:
+                                export_table_sharded(manager, table_name, location, int(shards))
+                            else:
+                                export_table(connection, table_name, location)
+                        except (Error, OSError, ImportError) as e:
+                            print(f"Error exporting data: {e}")
+
+                elif choice.upper() == "C":
+                    # Profile every column of a table in parallel
+                    if connection is None:
+                        print("Please connect to MySQL first.")
+                    else:
+                        table_name = get_table_name(connection)
+                        if table_name is not None:
+                            report = profile_table(manager, table_name)
+                            print_profile_report(table_name, report)
+
+                elif choice.upper() == "E":
+                    # Profile every table, columns queried concurrently across tables
+                    if connection is None:
+                        print("Please connect to MySQL first.")
+                    else:
+                        schema_report = run_async(manager, AsyncBackend.profile_schema)
+                        for table_name, report in schema_report.items():
+                            print_profile_report(table_name, report)
+
+                elif choice.upper() == "D":
+                    # Timing / query-count summary of everything run so far
+                    if instrumentation.enabled:
+                        instrumentation.summary()
+                    else:
+                        print("Instrumentation is off; start with PYSQL_INSTRUMENT=1 to enable it.")
+
+                elif choice == "0":
+                    # Exit the loop
+                    print("Exiting...")
+                    break
 
-        else:
-            print("Invalid choice. Please enter a valid option.")
+                else:
+                    print("Invalid choice. Please enter a valid option.")
+        except Exception as e:
+            # A bad entry (or any unexpected failure) ends this operation,
+            # not the whole session
+            print(f"Error: {e}")
 
-    # Close the MySQL connection before exiting
+    # Return the MySQL connection to the pool before exiting
     if connection is not None:
-        connection.close()
+        manager.release(connection)
+        manager.close()
         print("MySQL connection closed.")
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(main_cli(sys.argv[1:]))
     main()
@@ -0,0 +1,106 @@
+import itertools
+import os
+import re
+import sys
+
+import pytest
+
+# main.py lives at the repository root, which isn't a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+class FakeCursor:
+    def __init__(self, connection, **options):
+        self.connection = connection
+        self.options = options
+        self.rows = []
+        self.rowcount = -1
+
+    def execute(self, query, params=()):
+        query = ' '.join(query.split())
+        params = tuple(params or ())
+        self.connection.queries.append((query, params))
+        result = self.connection.respond(query, params)
+        if isinstance(result, int):
+            self.rows, self.rowcount = [], result
+        else:
+            self.rows = list(result or [])
+            self.rowcount = len(self.rows)
+
+    def executemany(self, query, seq_params):
+        seq_params = [tuple(params) for params in seq_params]
+        self.connection.queries.append((' '.join(query.split()), seq_params))
+        self.connection.pending.extend(seq_params)
+        self.rowcount = len(seq_params)
+
+    def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    def fetchmany(self, size=1):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def __iter__(self):
+        while self.rows:
+            yield self.rows.pop(0)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    # Scripted stand-in for a connector connection: each query is matched
+    # against (regex, result) pairs in order; a result is a list of rows, a
+    # DML rowcount, or a callable(query, params, connection) returning one
+    _ids = itertools.count(1)
+
+    def __init__(self, responses=(), database='db'):
+        self.connection_id = next(self._ids)
+        self.responses = [(re.compile(pattern, re.IGNORECASE), result) for pattern, result in responses]
+        self.database = database
+        self.queries = []
+        self.pending = []
+        self.committed = []
+        self.commits = 0
+
+    def respond(self, query, params):
+        if query == "SELECT DATABASE()":
+            return [(self.database,)]
+        for pattern, result in self.responses:
+            if pattern.search(query):
+                return result(query, params, self) if callable(result) else result
+        return []
+
+    def cursor(self, **options):
+        return FakeCursor(self, **options)
+
+    def commit(self):
+        self.commits += 1
+        self.committed.extend(self.pending)
+        self.pending = []
+
+    def rollback(self):
+        self.pending = []
+
+    def executed(self, pattern):
+        return [(query, params) for query, params in self.queries if re.search(pattern, query, re.IGNORECASE)]
+
+
+@pytest.fixture
+def fake_connection():
+    return FakeConnection
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(monkeypatch, tmp_path):
+    # Module-level caches would leak schema, results and prepared cursors
+    # between tests
+    monkeypatch.setattr(main, 'schema_cache', main.SchemaCache())
+    monkeypatch.setattr(main, 'result_cache', main.ResultCache(str(tmp_path / 'cache')))
+    monkeypatch.setattr(main, 'prepared_statements', main.PreparedStatements())
@@ -0,0 +1,45 @@
+import contextlib
+import subprocess
+import sys
+import threading
+
+import main
+
+
+class Manager:
+    # Hands every caller its own scripted connection, like the pool does
+    pool_size = 3
+
+    def __init__(self, fake_connection):
+        self.fake_connection = fake_connection
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def connection(self):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            yield self.fake_connection([
+                (r"SHOW TABLES", [('a',), ('b',), (main.PROGRESS_TABLE,)]),
+                (r"information_schema\.COLUMNS", lambda q, p, c: [('id', 'int'), (f'{p[0]}_name', 'varchar')]),
+            ])
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def test_describe_schema_skips_the_checkpoint_table(fake_connection):
+    manager = Manager(fake_connection)
+    schema = main.run_async(manager, main.AsyncBackend.describe_schema, concurrency=2)
+    assert schema == {'a': [('id', 'int'), ('a_name', 'varchar')], 'b': [('id', 'int'), ('b_name', 'varchar')]}
+    assert manager.peak <= 2
+
+
+def test_asyncio_is_imported_only_by_the_async_commands():
+    code = "import sys, main; print('asyncio' in sys.modules)"
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            cwd=main.os.path.dirname(main.__file__), check=True).stdout
+    assert output.strip() == 'False'
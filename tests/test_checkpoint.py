@@ -0,0 +1,105 @@
+import pytest
+
+import main
+
+
+class Crash(Exception):
+    pass
+
+
+def write_csv(tmp_path, count=25):
+    path = tmp_path / 'rows.csv'
+    path.write_text('id,name\n' + ''.join(f'{idx},n{idx}\n' for idx in range(count)))
+    return str(path)
+
+
+def simulated_import(fake_connection, crash_on_batch=None):
+    # Inserted rows and the checkpoint row only take effect on commit
+    state = {'progress': None, 'pending': [], 'batches': 0}
+
+    def save(query, params, connection):
+        state['pending'].append(lambda: state.update(progress=params[4]))
+        return 1
+
+    def delete(query, params, connection):
+        state['pending'].append(lambda: state.update(progress=None))
+        return 1
+
+    connection = fake_connection([
+        (r"SHOW TABLES", lambda q, p, c: [('t',), (main.PROGRESS_TABLE,)] if c.created else []),
+        (r"^CREATE TABLE IF NOT EXISTS t ", lambda q, p, c: setattr(c, 'created', True) or 0),
+        (r"SELECT position, detail FROM pysql_progress",
+         lambda q, p, c: [] if state['progress'] is None else [(state['progress'], None)]),
+        (r"^INSERT INTO pysql_progress", save),
+        (r"^DELETE FROM pysql_progress", delete),
+        (r"SELECT 1 FROM t LIMIT 1", lambda q, p, c: [(1,)] if c.committed else []),
+    ])
+    connection.created = False
+    cursor = connection.cursor
+
+    def crashing_cursor(**options):
+        opened = cursor(**options)
+        executemany = opened.executemany
+
+        def execute_batch(query, rows):
+            state['batches'] += 1
+            if state['batches'] == crash_on_batch:
+                raise Crash()
+            executemany(query, rows)
+        opened.executemany = execute_batch
+        return opened
+
+    commit, rollback = connection.commit, connection.rollback
+
+    def commit_all():
+        for apply in state['pending']:
+            apply()
+        state['pending'] = []
+        commit()
+
+    def rollback_all():
+        state['pending'] = []
+        rollback()
+
+    connection.cursor, connection.commit, connection.rollback = crashing_cursor, commit_all, rollback_all
+    return connection, state
+
+
+def test_interrupted_import_resumes_without_repeating_rows(fake_connection, tmp_path):
+    path = write_csv(tmp_path)
+    connection, state = simulated_import(fake_connection, crash_on_batch=4)
+    with pytest.raises(Crash):
+        main.import_data(connection, 't', path, batch_size=5, commit_every=10)
+    assert state['progress'] == 10
+    assert [row[0] for row in connection.committed] == [str(idx) for idx in range(10)]
+
+    connection.rollback()
+    assert main.import_data(connection, 't', path, batch_size=5, commit_every=10) == 15
+    assert [row[0] for row in connection.committed] == [str(idx) for idx in range(25)]
+    assert state['progress'] is None
+
+
+def test_restart_refuses_to_import_over_committed_rows(fake_connection, tmp_path, capsys):
+    path = write_csv(tmp_path)
+    connection, state = simulated_import(fake_connection, crash_on_batch=4)
+    with pytest.raises(Crash):
+        main.import_data(connection, 't', path, batch_size=5, commit_every=10)
+    connection.rollback()
+
+    assert main.import_data(connection, 't', path, batch_size=5, commit_every=10, restart=True) is None
+    assert "truncate it before restarting" in capsys.readouterr().out
+    assert len(connection.committed) == 10
+    assert state['progress'] == 10
+
+    # Once emptied, the restart imports every row once
+    connection.committed.clear()
+    assert main.import_data(connection, 't', path, batch_size=5, commit_every=10, restart=True) == 25
+    assert [row[0] for row in connection.committed] == [str(idx) for idx in range(25)]
+    assert state['progress'] is None
+
+
+def test_table_picker_hides_the_checkpoint_table(fake_connection, monkeypatch, capsys):
+    connection = fake_connection([(r"SHOW TABLES", [(main.PROGRESS_TABLE,), ('t',)])])
+    monkeypatch.setattr('builtins.input', lambda prompt: '1')
+    assert main.get_table_name(connection) == 't'
+    assert main.PROGRESS_TABLE not in capsys.readouterr().out
@@ -0,0 +1,55 @@
+import types
+
+import main
+
+
+def test_prepared_statements_are_reused_per_session(fake_connection):
+    statements = main.PreparedStatements(max_statements=2)
+    first, second = fake_connection(), fake_connection()
+    query = "UPDATE t SET a = %s WHERE id = %s"
+    cursor = statements.execute(first, query, (1, 2))
+    assert statements.execute(first, query, (3, 4)) is cursor
+    assert cursor.options == {'prepared': True}
+    assert statements.execute(second, query, (5, 6)) is not cursor
+
+    # A third statement on the first session evicts its oldest
+    statements.execute(first, "SELECT 1", ())
+    statements.execute(first, "SELECT 2", ())
+    assert statements.execute(first, query, (7, 8)) is not cursor
+
+
+class PooledConnection:
+    # Only what the public pooled-connection API offers
+    def __init__(self, pool):
+        self.pool = pool
+        self.connection_id = id(self)
+        self.connected = True
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        pass
+
+    def disconnect(self):
+        self.connected = False
+
+    def close(self):
+        self.pool.idle.append(self)
+
+
+class Pool:
+    def __init__(self, pool_size, **config):
+        self.idle = [PooledConnection(self) for _ in range(pool_size)]
+
+    def get_connection(self):
+        return self.idle.pop(0)
+
+
+def test_close_disconnects_idle_and_checked_out_connections(monkeypatch):
+    monkeypatch.setattr(main, 'load_connector', lambda: None)
+    monkeypatch.setattr(main, 'pooling', types.SimpleNamespace(MySQLConnectionPool=Pool), raising=False)
+    manager = main.ConnectionManager('user', '', 'localhost', 'db', pool_size=3)
+    held = manager.get_connection()
+    manager.close()
+    assert [connection.connected for connection in manager._pool.idle] == [False, False]
+    assert held.connected
+    manager.release(held)
+    assert not held.connected
@@ -0,0 +1,87 @@
+import math
+import random
+
+import pytest
+
+import main
+
+
+@pytest.fixture(autouse=True)
+def seeded():
+    random.seed(1234)
+
+
+def test_accumulate_correlation_matches_numpy():
+    np = pytest.importorskip('numpy')
+    rows = []
+    for _ in range(1000):
+        x = random.gauss(0, 1)
+        rows.append((x, 2 * x + random.gauss(0, 0.5), random.gauss(1e6, 1)))
+    chunks = [rows[offset:offset + 128] for offset in range(0, len(rows), 128)]
+    n, matrix = main.accumulate_correlation(chunks, 3)
+    assert (n == len(rows)).all()
+    assert np.allclose(matrix, np.corrcoef(np.array(rows).T), atol=1e-9)
+
+
+def test_accumulate_correlation_excludes_missing_pairwise():
+    np = pytest.importorskip('numpy')
+    rows = [(1, 2, None), (2, 4, 1), (3, 6, None), (4, 8.5, 3), (None, 1, 2)]
+    n, matrix = main.accumulate_correlation([rows], 3)
+    assert n[0, 1] == 4
+    assert n[0, 2] == 2
+    assert n[1, 2] == 3
+    assert matrix[0, 1] == pytest.approx(np.corrcoef([1, 2, 3, 4], [2, 4, 6, 8.5])[0, 1])
+    assert math.isclose(matrix[0, 2], 1.0)
+
+
+def correlated_rows(count=200):
+    rows = []
+    for _ in range(count):
+        x = random.gauss(0, 1)
+        rows.append((x, -x + random.gauss(0, 0.3), None if random.random() < 0.1 else random.gauss(5, 2)))
+    return rows
+
+
+def numeric_table(fake_connection, rows, extra=()):
+    return fake_connection([
+        (r"information_schema\.COLUMNS", [('a', 'double'), ('b', 'double'), ('label', 'varchar'), ('c', 'double')]),
+        (r"^SELECT a, b, c FROM t$", rows),
+    ] + list(extra))
+
+
+def test_streamed_correlation_reads_only_numeric_columns_in_chunks(fake_connection):
+    np = pytest.importorskip('numpy')
+    rows = correlated_rows()
+    connection = numeric_table(fake_connection, rows)
+    columns, matrix = main.correlation_matrix(connection, 't', chunk_size=16, use_cache=False)
+    assert columns == ['a', 'b', 'c']
+    assert [query for query, _ in connection.queries][-1] == "SELECT a, b, c FROM t"
+    complete = np.array([row for row in rows if None not in row], dtype=np.float64)
+    assert matrix[0, 1] == pytest.approx(np.corrcoef(np.array(rows)[:, :2].astype(float).T)[0, 1])
+    assert matrix[0, 2] == pytest.approx(np.corrcoef(complete[:, 0], complete[:, 2])[0, 1])
+
+
+def test_pushdown_correlation_assembles_the_pairwise_sums(fake_connection):
+    np = pytest.importorskip('numpy')
+    rows = correlated_rows(50)
+
+    def aggregate(query, params, connection):
+        # What the server would return: per pair (i <= j) the centred sums
+        # over the rows where both are present
+        data = np.array(rows, dtype=object)
+        means = [np.mean([value for value in data[:, idx] if value is not None]) for idx in range(3)]
+        result = []
+        for i in range(3):
+            for j in range(i, 3):
+                pairs = [(row[i] - means[i], row[j] - means[j]) for row in rows
+                         if row[i] is not None and row[j] is not None]
+                result += [len(pairs), sum(a for a, _ in pairs), sum(b for _, b in pairs),
+                           sum(a * a for a, _ in pairs), sum(b * b for _, b in pairs), sum(a * b for a, b in pairs)]
+        return [tuple(result)]
+
+    connection = numeric_table(fake_connection, rows, [(r"COUNT\(", aggregate)])
+    _, pushed = main.correlation_matrix(connection, 't', pushdown=True, use_cache=False)
+    _, streamed = main.correlation_matrix(connection, 't', use_cache=False)
+    assert len(connection.executed(r"COUNT\(")) == 1
+    assert np.allclose(pushed, streamed, atol=1e-9)
+    assert math.isclose(pushed[1, 1], 1.0)
@@ -0,0 +1,52 @@
+import re
+
+import main
+
+
+def table(fake_connection, data_type, octet_length, mapping_columns=None):
+    responses = [(r"SHOW TABLES", [('t',)] + ([('codes',)] if mapping_columns else []))]
+    if mapping_columns:
+        responses.append((r"COLUMN_NAME, DATA_TYPE .*TABLE_NAME = %s", lambda q, p, c: (
+            [(name, 'int') for name in mapping_columns] if p == ('codes',) else [('city', data_type)]
+        )))
+    responses += [
+        (r"CHARACTER_OCTET_LENGTH", [('city', octet_length)]),
+        (r"information_schema\.COLUMNS", [('city', data_type)]),
+        (r"^(CREATE|INSERT|ALTER|UPDATE|DROP)", 0),
+    ]
+    return fake_connection(responses)
+
+
+def encoded(connection):
+    return [query for query, _ in connection.executed(r"^(CREATE|INSERT|UPDATE)")]
+
+
+def test_short_varchar_joins_on_the_value(fake_connection):
+    # VARCHAR(255) in utf8mb4 is 1020 bytes, well within the index key
+    connection = table(fake_connection, 'varchar', 1020)
+    main.label_encode_column(connection, 't', 'city', 'city_code')
+    assert not any('SHA2' in query for query in encoded(connection))
+    assert re.fullmatch(
+        r"UPDATE t AS t JOIN tmp_codes_\w+ AS m ON t\.city = m\.category SET t\.city_code = m\.code",
+        connection.executed(r"^UPDATE")[0][0]
+    )
+    assert connection.commits == 1
+
+
+def test_long_varchar_and_text_are_keyed_by_hash(fake_connection):
+    for data_type, octet_length in (('varchar', 8192), ('text', 65535)):
+        connection = table(fake_connection, data_type, octet_length)
+        main.label_encode_column(connection, 't', 'city', 'city_code')
+        create = connection.executed(r"^CREATE TEMPORARY")[0][0]
+        assert "category_hash BINARY(32) NOT NULL, UNIQUE KEY (category_hash)" in create
+        assert "ON UNHEX(SHA2(t.city, 256)) = m.category_hash" in connection.executed(r"^UPDATE")[0][0]
+        main.schema_cache.invalidate()
+
+
+def test_existing_mapping_table_keeps_its_key_form(fake_connection):
+    # A hashed mapping table stays hashed even if the column is short now
+    connection = table(fake_connection, 'varchar', 100, mapping_columns=('code', 'category', 'category_hash'))
+    main.label_encode_column(connection, 't', 'city', 'city_code', mapping_table='codes')
+    assert "LEFT JOIN codes AS m ON UNHEX(SHA2(t.city, 256)) = m.category_hash" in (
+        connection.executed(r"^INSERT INTO codes")[0][0]
+    )
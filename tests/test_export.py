@@ -0,0 +1,76 @@
+import contextlib
+import datetime
+import json
+from decimal import Decimal
+
+import pytest
+
+import main
+
+
+def table(fake_connection, rows):
+    return fake_connection([
+        (r"NUMERIC_PRECISION", [('id', 10, 0), ('price', 12, 4), ('day', None, None)]),
+        (r"information_schema\.COLUMNS", [('id', 'int'), ('price', 'decimal'), ('day', 'date')]),
+        (r"^SELECT id, price, day FROM t", rows),
+    ])
+
+
+ROWS = [
+    (1, Decimal('12345678.1234'), datetime.date(2026, 1, 2)),
+    (2, None, None),
+]
+
+
+def test_json_target_is_one_array_with_exact_decimals(fake_connection, tmp_path):
+    path = tmp_path / 'out.json'
+    assert main.export_table(table(fake_connection, ROWS), 't', str(path), batch_size=1) == 2
+    records = json.loads(path.read_text(), parse_float=Decimal)
+    assert records == [
+        {'id': 1, 'price': Decimal('12345678.1234'), 'day': '2026-01-02'},
+        {'id': 2, 'price': None, 'day': None},
+    ]
+
+
+def test_empty_json_export_is_an_empty_array(fake_connection, tmp_path):
+    path = tmp_path / 'out.json'
+    assert main.export_table(table(fake_connection, []), 't', str(path)) == 0
+    assert json.loads(path.read_text()) == []
+
+
+def test_jsonl_target_gets_one_record_per_line(fake_connection, tmp_path):
+    path = tmp_path / 'out.jsonl'
+    main.export_table(table(fake_connection, ROWS), 't', str(path))
+    lines = path.read_text().splitlines()
+    assert [json.loads(line, parse_float=Decimal)['price'] for line in lines] == [Decimal('12345678.1234'), None]
+
+
+def test_parquet_keeps_decimal_precision(fake_connection, tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    pa = pytest.importorskip('pyarrow')
+    path = tmp_path / 'out.parquet'
+    main.export_table(table(fake_connection, ROWS), 't', str(path))
+    result = pq.read_table(str(path))
+    assert result.schema.field('price').type == pa.decimal128(12, 4)
+    assert result.column('price').to_pylist() == [Decimal('12345678.1234'), None]
+
+
+def test_cli_reports_export_file_errors(fake_connection, tmp_path, monkeypatch, capsys):
+    connection = table(fake_connection, ROWS)
+
+    class Manager:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        @contextlib.contextmanager
+        def connection(self):
+            yield connection
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(main, 'load_connector', lambda: None)
+    monkeypatch.setattr(main, 'ConnectionManager', Manager)
+    status = main.main_cli(['--database', 'db', 'export', 't', str(tmp_path / 'missing' / 'out.csv')])
+    assert status == 1
+    assert "Error running export:" in capsys.readouterr().err
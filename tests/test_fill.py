@@ -0,0 +1,117 @@
+import json
+import re
+
+import pytest
+
+import main
+
+
+class Crash(Exception):
+    pass
+
+
+def simulated_table(fake_connection, values, crash_on_update=None):
+    # {id: price} behind a scripted connection; UPDATEs and the checkpoint
+    # row only take effect on commit, like InnoDB
+    state = {'values': dict(values), 'progress': None, 'pending': [], 'updates': 0}
+
+    def boundary(query, params, connection):
+        offset = int(re.search(r"OFFSET (\d+)", query).group(1))
+        keys = sorted(key for key in state['values'] if key >= params[0])
+        return [(keys[offset],)] if offset < len(keys) else []
+
+    def update(query, params, connection):
+        state['updates'] += 1
+        if state['updates'] == crash_on_update:
+            raise Crash()
+        fill, start = params[0], params[1]
+        end = params[2] if len(params) > 2 else None
+        keys = [key for key, value in state['values'].items()
+                if value is None and key >= start and (end is None or key < end)]
+        state['pending'].append(lambda: state['values'].update({key: fill for key in keys}))
+        return len(keys)
+
+    def save(query, params, connection):
+        position, detail = params[4], params[5]
+        state['pending'].append(lambda: state.update(progress=(position, detail)))
+        return 1
+
+    def clear(query, params, connection):
+        state['pending'].append(lambda: state.update(progress=None))
+        return 1
+
+    connection = fake_connection([
+        (r"KEY_COLUMN_USAGE", [('id',)]),
+        (r"information_schema\.COLUMNS", [('id', 'int'), ('price', 'int')]),
+        (r"information_schema\.TABLES", [('2026-01-02 00:00:00', len(values), 16384, '2026-01-01 00:00:00')]),
+        (r"SELECT AVG\(price\)", lambda q, p, c: [(sum(v for v in state['values'].values() if v is not None)
+                                                   / sum(v is not None for v in state['values'].values()),)]),
+        (r"SELECT MIN\(id\)", lambda q, p, c: [(min(state['values']),)]),
+        (r"SELECT id FROM t WHERE id >= %s ORDER BY id LIMIT 1 OFFSET", boundary),
+        (r"^UPDATE t SET", update),
+        (r"SELECT position, detail FROM pysql_progress",
+         lambda q, p, c: [] if state['progress'] is None else [state['progress']]),
+        (r"^INSERT INTO pysql_progress", save),
+        (r"^DELETE FROM pysql_progress", clear),
+    ])
+
+    def commit():
+        for apply in state['pending']:
+            apply()
+        state['pending'] = []
+        connection.commits += 1
+
+    def rollback():
+        state['pending'] = []
+
+    connection.commit, connection.rollback = commit, rollback
+    return connection, state
+
+
+def sparse_prices():
+    # Keys spread over a huge range with large gaps, every third price missing
+    return {key * 10 ** 9 + 7: (None if key % 3 == 0 else 100) for key in range(200)}
+
+
+def test_fill_walks_sparse_keys_in_fixed_size_batches(fake_connection):
+    connection, state = simulated_table(fake_connection, sparse_prices())
+    updated = main.fill_columns(connection, 't', {'price': '1'}, batch_size=50)
+    assert updated == 67
+    assert all(value == 100 for value in state['values'].values())
+    # 200 rows in batches of 50: four UPDATEs whatever the key spread
+    ranged = connection.executed(r"^UPDATE t SET")
+    assert len(ranged) == 4
+    assert [params[1] for _, params in ranged] == [7, 50 * 10 ** 9 + 7, 100 * 10 ** 9 + 7, 150 * 10 ** 9 + 7]
+    assert state['progress'] is None
+
+
+def test_interrupted_fill_resumes_after_its_last_committed_batch(fake_connection):
+    connection, state = simulated_table(fake_connection, sparse_prices(), crash_on_update=3)
+    with pytest.raises(Crash):
+        main.fill_columns(connection, 't', {'price': '1'}, batch_size=50)
+    position, detail = state['progress']
+    assert position == 100 * 10 ** 9 + 7
+    assert json.loads(detail) == {'price': 100}
+    filled = sum(value is not None for value in state['values'].values())
+
+    connection.queries.clear()
+    state['updates'] = 0
+    updated = main.fill_columns(connection, 't', {'price': '1'}, batch_size=50)
+    assert filled + updated == 200
+    # The mean isn't recomputed over the half-filled column
+    assert not connection.executed(r"AVG\(")
+    assert connection.executed(r"^UPDATE t SET")[0][1][1] == position
+    assert state['progress'] is None
+
+
+def test_non_integer_key_fills_in_one_statement(fake_connection):
+    connection = fake_connection([
+        (r"KEY_COLUMN_USAGE", [('code',)]),
+        (r"SELECT AVG\(price\)", [(5,)]),
+        (r"SELECT MIN\(code\)", [('A100',)]),
+        (r"^UPDATE", 3),
+    ])
+    assert main.fill_columns(connection, 't', {'price': '1'}, resumable=False) == 3
+    assert [query for query, _ in connection.executed(r"^UPDATE")] == [
+        "UPDATE t SET price = COALESCE(price, %s) WHERE price IS NULL"
+    ]
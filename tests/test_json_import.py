@@ -0,0 +1,52 @@
+import gzip
+import json
+
+import pytest
+
+import main
+
+
+@pytest.mark.parametrize('text', [
+    '[{"a": 1}, {"a": 2}, {"a": 3}]',
+    '{"a": 1}\n{"a": 2}\n{"a": 3}\n',
+    '{"a": 1}{"a": 2} {"a": 3}',
+    '  [ {"a": 1} ,\n {"a": 2},{"a": 3} ]  ',
+])
+def test_iter_json_records_formats(tmp_path, text):
+    path = tmp_path / 'records.json'
+    path.write_text(text, encoding='utf-8')
+    assert [record['a'] for record in main.iter_json_records(str(path))] == [1, 2, 3]
+
+
+def test_iter_json_records_small_chunks_and_gzip(tmp_path):
+    records = [{'id': idx, 'name': f'row {idx}', 'nested': {'values': list(range(idx % 5))}} for idx in range(300)]
+    path = tmp_path / 'records.json.gz'
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump(records, f)
+    assert list(main.iter_json_records(str(path), chunk_size=7)) == records
+
+
+def test_iter_json_records_rejects_truncated_input(tmp_path):
+    path = tmp_path / 'broken.ndjson'
+    path.write_text('{"a": 1}\n{"a": ', encoding='utf-8')
+    with pytest.raises(json.JSONDecodeError):
+        list(main.iter_json_records(str(path)))
+
+
+def test_import_data_streams_json_records_into_batched_inserts(fake_connection, tmp_path):
+    path = tmp_path / 'houses.ndjson'
+    path.write_text(
+        '{"Order": 1, "Lot Area": 8450, "tags": ["a"]}\n'
+        '{"Lot Area": "NULL", "Order": 2}\n'
+        '{"Order": 3, "Lot Area": 9600, "Alley": "Grvl"}\n',
+        encoding='utf-8'
+    )
+    connection = fake_connection()
+    total = main.import_data(connection, 'houses', str(path), batch_size=2, resumable=False)
+    assert total == 3
+    create = connection.executed(r"^CREATE TABLE")[0][0]
+    assert create == ("CREATE TABLE IF NOT EXISTS houses "
+                      "(Order_ TINYINT, Lot_Area SMALLINT, tags VARCHAR(5), Alley VARCHAR(4))")
+    inserts = connection.executed(r"^INSERT INTO houses")
+    assert [len(params) for _, params in inserts] == [2, 1]
+    assert connection.committed == [(1, 8450, '["a"]', None), (2, None, None, None), (3, 9600, None, 'Grvl')]
@@ -0,0 +1,43 @@
+import main
+
+
+class FakeManager:
+    def __init__(self, connection):
+        self._connection = connection
+
+    def get_connection(self):
+        return self._connection
+
+    def ensure_alive(self, connection):
+        pass
+
+    def release(self, connection):
+        pass
+
+    def close(self):
+        pass
+
+
+def run_menu(monkeypatch, connection, answers):
+    answers = iter(answers)
+    monkeypatch.setattr('builtins.input', lambda prompt='': next(answers))
+    monkeypatch.setattr(main, 'create_connection_pool', lambda *args: FakeManager(connection))
+    main.main()
+
+
+def test_bad_table_index_returns_to_the_menu(fake_connection, monkeypatch, capsys):
+    connection = fake_connection([(r"SHOW TABLES", [('ames',)])])
+    run_menu(monkeypatch, connection, [
+        '1', 'user', 'password', 'host', 'db',
+        '5', '9',         # fill: table index out of range
+        '2', '9',         # encode: table index out of range
+        '3', '9',         # stats: table index out of range
+        '3', 'x',         # stats: not a number
+        '0',
+    ])
+    output = capsys.readouterr().out
+    assert output.count("Invalid table index.") == 3
+    assert "Error: invalid literal for int()" in output
+    assert "Exiting..." in output
+    # Nothing reached the result cache or the table
+    assert not connection.executed(r"information_schema\.TABLES|UPDATE|ALTER")
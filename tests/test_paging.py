@@ -0,0 +1,45 @@
+import main
+
+
+def keyed(fake_connection, key=('id',), rows=()):
+    return fake_connection([
+        (r"KEY_COLUMN_USAGE", [(column,) for column in key]),
+        (r"^SELECT COUNT\(\*\)", [(len(rows),)]),
+        (r"^SELECT \*", list(rows)),
+    ])
+
+
+def test_head_and_foot_use_the_primary_key_index(fake_connection):
+    connection = keyed(fake_connection, rows=[{'id': 1}, {'id': 2}])
+    assert main.head_rows(connection, 't', 2) == [{'id': 1}, {'id': 2}]
+    main.foot_rows(connection, 't', 2)
+    queries = [query for query, _ in connection.executed(r"^SELECT \*")]
+    assert queries == [
+        "SELECT * FROM t ORDER BY id LIMIT 2",
+        "SELECT * FROM (SELECT * FROM t ORDER BY id DESC LIMIT 2) AS page ORDER BY id",
+    ]
+    assert not connection.executed(r"OFFSET|COUNT")
+
+
+def test_pages_continue_from_the_boundary_keys(fake_connection):
+    connection = keyed(fake_connection, key=('year', 'id'))
+    list(main.page_rows(connection, 't', ['year', 'id'], 10, after=(2010, 7)))
+    list(main.page_rows(connection, 't', ['year', 'id'], 10, before=(2008, 3)))
+    assert connection.executed(r"^SELECT \*") == [
+        ("SELECT * FROM t WHERE (year, id) > (%s, %s) ORDER BY year, id LIMIT 10", (2010, 7)),
+        ("SELECT * FROM (SELECT * FROM t WHERE (year, id) < (%s, %s) ORDER BY year DESC, id DESC LIMIT 10) "
+         "AS page ORDER BY year, id", (2008, 3)),
+    ]
+
+
+def test_foot_without_a_key_skips_to_the_last_rows(fake_connection):
+    connection = keyed(fake_connection, key=(), rows=[{'a': idx} for idx in range(12)])
+    main.foot_rows(connection, 't', 5)
+    assert connection.executed(r"^SELECT \*")[-1][0] == "SELECT * FROM t LIMIT 5 OFFSET 7"
+
+
+def test_head_prints_rows_and_returns_the_page_keys(fake_connection, capsys):
+    connection = keyed(fake_connection, rows=[{'id': 4}, {'id': 9}])
+    key, (first_key, last_key) = main.head(connection, 't', 2)
+    assert (key, first_key, last_key) == (['id'], (4,), (9,))
+    assert "Top 2 rows of table 't':" in capsys.readouterr().out
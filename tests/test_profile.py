@@ -0,0 +1,57 @@
+import datetime
+from contextlib import contextmanager
+
+import main
+
+
+def column_types(*types):
+    return [(r"information_schema\.COLUMNS", [(name, data_type) for name, data_type in types])]
+
+
+def test_stream_column_stats_text_column(fake_connection):
+    values = [('NAmes',), ('Edwards',), ('NAmes',), ('Gilbert',), ('NAmes',)]
+    connection = fake_connection(column_types(('Neighborhood', 'varchar')) + [
+        (r"SELECT Neighborhood FROM ames", values),
+    ])
+    stats = main.stream_column_stats(connection, 'ames', 'Neighborhood')
+    assert stats['count'] == 5
+    assert stats['mode'] == 'NAmes'
+    assert stats['distinct'] == 3
+    assert (stats['min_value'], stats['max_value']) == ('Edwards', 'NAmes')
+    assert stats['median'] == 'NAmes'
+    assert stats['mean'] is None
+
+
+def test_calculate_categorical_stats_dates():
+    days = [datetime.date(2024, 1, day) for day in (3, 1, 2, 2)]
+    stats = main.calculate_categorical_stats(days + [None])
+    assert stats['count'] == 4
+    assert stats['min_value'] == datetime.date(2024, 1, 1)
+    assert stats['median'] == datetime.date(2024, 1, 2)
+    assert stats['mode'] == datetime.date(2024, 1, 2)
+    assert main.calculate_categorical_stats([])['median'] is None
+
+
+class FakeManager:
+    pool_size = 2
+    connection_config = {}
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    @contextmanager
+    def connection(self):
+        yield self._connection
+
+
+def test_profile_table_survives_a_failing_column(fake_connection, monkeypatch):
+    connection = fake_connection(column_types(('a', 'int'), ('b', 'varchar')))
+
+    def profile_column(manager, table_name, column_name):
+        if column_name == 'b':
+            raise TypeError("unsupported operand")
+        return {'count': 1}
+
+    monkeypatch.setattr(main, 'profile_column', profile_column)
+    report = main.profile_table(FakeManager(connection), 't')
+    assert report == {'a': {'count': 1}, 'b': None}
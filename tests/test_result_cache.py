@@ -0,0 +1,81 @@
+import main
+
+
+def server(update_time=None, rows=100, length=16384, uptime=1000, checksum=42):
+    # Mutable server state behind a scripted connection
+    return {'update_time': update_time, 'rows': rows, 'length': length, 'uptime': uptime, 'checksum': checksum}
+
+
+def connect(fake_connection, state):
+    return fake_connection([
+        (r"information_schema\.TABLES", lambda q, p, c: [
+            (state['update_time'], state['rows'], state['length'], '2026-01-01 00:00:00')
+        ]),
+        (r"Uptime", lambda q, p, c: [('Uptime', str(state['uptime']))]),
+        (r"CHECKSUM TABLE", lambda q, p, c: [('t', state['checksum'])]),
+        (r"information_schema\.COLUMNS", [('a', 'int')]),
+    ])
+
+
+def checksums(connection):
+    return len(connection.executed(r"CHECKSUM TABLE"))
+
+
+def test_checksum_runs_once_per_server_lifetime_across_processes(fake_connection):
+    state = server()
+    connection = connect(fake_connection, state)
+    first = main.result_cache.fingerprint(connection, 't')
+    assert main.result_cache.fingerprint(connection, 't') == first
+    assert checksums(connection) == 1
+
+    # A new process: nothing in memory, the checksum comes from disk
+    fresh = main.ResultCache(main.result_cache.directory)
+    assert fresh.fingerprint(connection, 't') == first
+    assert checksums(connection) == 1
+
+    # A restart forces a new checksum
+    state['uptime'] = 5
+    fresh.fingerprint(connection, 't')
+    assert checksums(connection) == 2
+
+
+def test_checksum_retaken_when_table_statistics_change(fake_connection):
+    state = server()
+    connection = connect(fake_connection, state)
+    first = main.result_cache.fingerprint(connection, 't')
+    state['rows'], state['checksum'] = 101, 43
+    second = main.result_cache.fingerprint(connection, 't')
+    assert second != first
+    assert checksums(connection) == 2
+
+
+def test_invalidate_and_observed_writes_drop_the_checksum(fake_connection):
+    state = server()
+    connection = connect(fake_connection, state)
+    main.result_cache.fingerprint(connection, 't')
+    main.result_cache.invalidate(connection, 't')
+    main.result_cache.fingerprint(connection, 't')
+    assert checksums(connection) == 2
+
+    # Written (UPDATE_TIME set), then evicted from the dictionary cache
+    # (UPDATE_TIME NULL again) with the same row estimate and size
+    state['update_time'] = '2026-01-02 00:00:00'
+    main.result_cache.fingerprint(connection, 't')
+    state['update_time'] = None
+    main.result_cache.fingerprint(connection, 't')
+    assert checksums(connection) == 3
+
+
+def test_cached_stats_follow_the_fingerprint(fake_connection):
+    state = server(update_time='2026-01-02 00:00:00')
+    connection = connect(fake_connection, state)
+    fingerprint = main.result_cache.fingerprint(connection, 't')
+    main.result_cache.put(connection, 't', 'stats', {'column': 'a'}, fingerprint, {'count': 3})
+    assert main.result_cache.get(connection, 't', 'stats', {'column': 'a'}, fingerprint) == {'count': 3}
+
+    state['update_time'] = '2026-01-03 00:00:00'
+    changed = main.result_cache.fingerprint(connection, 't')
+    assert main.result_cache.get(connection, 't', 'stats', {'column': 'a'}, changed) is None
+
+    main.result_cache.invalidate(connection, 't')
+    assert main.result_cache.get(connection, 't', 'stats', {'column': 'a'}, fingerprint) is None
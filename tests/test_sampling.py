@@ -0,0 +1,106 @@
+import bisect
+import hashlib
+import math
+import random
+
+import pytest
+
+import main
+
+
+@pytest.fixture(autouse=True)
+def seeded():
+    random.seed(1234)
+
+
+def test_hyperloglog_estimate_within_error():
+    hll = main.HyperLogLog(precision=12)
+    for value in range(50000):
+        hll.add(value)
+        hll.add(value)
+    assert abs(hll.count() - 50000) <= 4 * hll.relative_error() * 50000
+
+
+def test_hyperloglog_small_range_and_merge():
+    left, right = main.HyperLogLog(), main.HyperLogLog()
+    for value in range(100):
+        left.add(value)
+    for value in range(50, 150):
+        right.add(value)
+    assert left.count() == pytest.approx(100, rel=0.05)
+    assert left.merge(right).count() == pytest.approx(150, rel=0.05)
+    empty = main.HyperLogLog()
+    empty.add(None)
+    assert empty.count() == 0
+
+
+def keyed_table(fake_connection, keys):
+    # Integer primary key `id` with gaps; each probe returns the first row at
+    # or after its start key, as the index lookup would
+    def probes(query, params, connection):
+        assert query.count("UNION ALL") == len(params) - 1
+        rows = []
+        for start in params:
+            position = bisect.bisect_left(keys, start)
+            if position < len(keys):
+                rows.append((keys[position], keys[position] * 2))
+        return rows
+
+    return fake_connection([
+        (r"information_schema\.KEY_COLUMN_USAGE", [('id',)]),
+        (r"information_schema\.COLUMNS", [('id', 'int'), ('price', 'int')]),
+        (r"SELECT TABLE_ROWS", [(len(keys),)]),
+        (r"SELECT MIN\(id\), MAX\(id\)", [(keys[0], keys[-1])]),
+        (r"UNION ALL|^\(SELECT id", probes),
+    ])
+
+
+def test_sample_rows_probes_random_keys_without_duplicates(fake_connection):
+    keys = sorted(random.sample(range(10 ** 6), 5000))
+    connection = keyed_table(fake_connection, keys)
+    rows = main.sample_rows(connection, 't', ['price'], sample_size=1200, probes_per_query=500)
+    assert 0 < len(rows) <= 1200
+    assert all(price % 2 == 0 and price // 2 in keys for (price,) in rows)
+    probes = connection.executed(r"UNION ALL")
+    assert [len(params) for _, params in probes] == [500, 500, 200]
+    assert not connection.executed(r"RAND\(\)|COUNT\(")
+
+
+def test_sample_rows_falls_back_to_bernoulli_for_small_tables(fake_connection):
+    connection = keyed_table(fake_connection, list(range(100)))
+    main.sample_rows(connection, 't', ['price'], sample_size=1000)
+    assert connection.executed(r"WHERE RAND\(\) < %s LIMIT 1000")
+    assert not connection.executed(r"UNION ALL")
+
+
+def test_sampled_stats_skip_the_distinct_scan_unless_asked(fake_connection):
+    keys = list(range(0, 100000, 7))
+    connection = keyed_table(fake_connection, keys)
+    stats = main.sampled_column_stats(connection, 't', 'price', sample_size=500)
+    assert 'distinct' not in stats
+    assert not connection.executed(r"MD5\(")
+    mean, low, high = stats['mean']
+    assert low <= mean <= high
+
+
+def test_server_side_hll_matches_client_registers(fake_connection):
+    values = [f"value {idx}" for idx in range(3000)]
+    precision = 10
+    width = 32 - precision
+
+    def registers(query, params, connection):
+        ranks = {}
+        for value in values:
+            hashed = int(hashlib.md5(value.encode('utf-8')).hexdigest()[:8], 16)
+            high = hashed >> precision
+            rank = width + 1 if high == 0 else width - int(math.floor(math.log2(high)))
+            bucket = hashed & ((1 << precision) - 1)
+            ranks[bucket] = max(ranks.get(bucket, 0), rank)
+        return list(ranks.items())
+
+    connection = fake_connection([(r"MD5\(", registers)])
+    server = main.hll_distinct_count(connection, 't', 'name', precision)
+    client = main.HyperLogLog(precision)
+    for value in values:
+        client.add(value)
+    assert server.registers == client.registers
@@ -0,0 +1,43 @@
+import main
+
+
+def test_lookups_are_cached_per_database_until_invalidated(fake_connection):
+    connection = fake_connection([
+        (r"SHOW TABLES", [('a',), ('b',)]),
+        (r"information_schema\.COLUMNS", [('id', 'INT'), ('name', 'VARCHAR')]),
+    ])
+    cache = main.SchemaCache()
+    for _ in range(3):
+        assert cache.tables(connection) == ['a', 'b']
+        assert cache.columns(connection, 'a') == [('id', 'int'), ('name', 'varchar')]
+    assert len(connection.executed(r"SHOW TABLES")) == 1
+    assert len(connection.executed(r"COLUMNS")) == 1
+    assert len(connection.executed(r"^SELECT DATABASE\(\)$")) == 1
+
+    cache.invalidate(connection, 'a')
+    cache.columns(connection, 'a')
+    cache.tables(connection)
+    assert len(connection.executed(r"COLUMNS")) == 2
+    assert len(connection.executed(r"SHOW TABLES")) == 2
+
+
+def test_invalidate_from_a_fresh_connection_reaches_the_cached_entries(fake_connection):
+    reader = fake_connection([(r"information_schema\.COLUMNS", [('id', 'int')])])
+    writer = fake_connection()
+    cache = main.SchemaCache()
+    cache.columns(reader, 't')
+    # The writer never read through the cache, yet its invalidation counts
+    cache.invalidate(writer, 't')
+    cache.columns(reader, 't')
+    assert len(reader.executed(r"COLUMNS")) == 2
+
+
+def test_entries_expire_after_the_ttl(fake_connection, monkeypatch):
+    connection = fake_connection([(r"SHOW TABLES", [('a',)])])
+    cache = main.SchemaCache(ttl=10)
+    clock = iter([0.0, 5.0, 20.0, 20.0])
+    monkeypatch.setattr(main.time, 'monotonic', lambda: next(clock))
+    cache.tables(connection)
+    cache.tables(connection)
+    cache.tables(connection)
+    assert len(connection.executed(r"SHOW TABLES")) == 2
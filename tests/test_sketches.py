@@ -0,0 +1,148 @@
+import json
+import random
+import statistics
+
+import pytest
+
+import main
+
+
+@pytest.fixture(autouse=True)
+def seeded():
+    # The compactors pick their survivors at random
+    random.seed(1234)
+
+
+def test_moment_accumulator_matches_statistics():
+    values = [random.gauss(50, 12) for _ in range(2000)]
+    result = main.MomentAccumulator().update_many(values).result()
+    assert result['count'] == len(values)
+    assert result['mean'] == pytest.approx(statistics.fmean(values))
+    assert result['variance'] == pytest.approx(statistics.pvariance(values), rel=1e-9)
+    assert result['min_value'] == min(values)
+    assert result['max_value'] == max(values)
+
+
+def test_moment_accumulator_merge_equals_single_pass():
+    values = [random.expovariate(0.3) for _ in range(3000)]
+    whole = main.MomentAccumulator().update_many(values)
+    left = main.MomentAccumulator().update_many(values[:700])
+    right = main.MomentAccumulator().update_many(values[700:])
+    merged = left.merge(right)
+    for attribute in ('mean', 'm2', 'm3', 'm4'):
+        assert getattr(merged, attribute) == pytest.approx(getattr(whole, attribute), rel=1e-9)
+    assert merged.count == whole.count
+    assert (merged.min_value, merged.max_value) == (whole.min_value, whole.max_value)
+
+
+def test_moment_accumulator_merge_with_empty():
+    filled = main.MomentAccumulator().update_many([1, 2, 3])
+    assert main.MomentAccumulator().merge(filled).result() == filled.result()
+    assert filled.merge(main.MomentAccumulator()).count == 3
+
+
+def test_moment_accumulator_update_repeated():
+    repeated = main.MomentAccumulator().update_many([1, 5]).update_repeated(3, 4)
+    expanded = main.MomentAccumulator().update_many([1, 5, 3, 3, 3, 3])
+    assert repeated.count == expanded.count
+    assert repeated.mean == pytest.approx(expanded.mean)
+    assert repeated.m2 == pytest.approx(expanded.m2)
+    assert repeated.m4 == pytest.approx(expanded.m4)
+
+
+def test_quantile_sketch_exact_before_compaction():
+    values = list(range(100))
+    random.shuffle(values)
+    sketch = main.QuantileSketch().update_many(values)
+    assert sketch.quantile(0.5) == 50
+    assert sketch.value_at(0) == 0
+    assert sketch.value_at(99) == 99
+
+
+def test_quantile_sketch_rank_error_after_compaction():
+    count = 200000
+    values = list(range(count))
+    random.shuffle(values)
+    sketch = main.QuantileSketch(error=0.01).update_many(values)
+    assert sketch.size < count // 10
+    for q in (0.1, 0.25, 0.5, 0.75, 0.9):
+        assert abs(sketch.quantile(q) - q * count) <= 0.02 * count
+
+
+def test_quantile_sketch_merge_and_from_sorted():
+    values = list(range(50000))
+    left = main.QuantileSketch(error=0.01).update_many(values[::2])
+    right = main.QuantileSketch(error=0.01).update_many(values[1::2])
+    merged = left.merge(right)
+    assert merged.count == len(values)
+    assert abs(merged.quantile(0.5) - 25000) <= 0.02 * len(values)
+
+    built = main.QuantileSketch.from_sorted(values, error=0.01)
+    assert built.count == len(values)
+    assert sum(len(items) * 2 ** level for level, items in enumerate(built.compactors)) == len(values)
+    assert abs(built.quantile(0.5) - 25000) <= 0.02 * len(values)
+
+
+def test_quantile_sketch_update_repeated_keeps_weight():
+    sketch = main.QuantileSketch(error=0.01).update_repeated(7, 1000).update_repeated(9, 3000)
+    assert sketch.count == 4000
+    assert sum(len(items) * 2 ** level for level, items in enumerate(sketch.compactors)) == 4000
+    assert sketch.quantile(0.1) == 7
+    assert sketch.quantile(0.9) == 9
+
+
+def test_frequency_sketch_exact_under_capacity():
+    sketch = main.FrequencySketch(capacity=10)
+    for value in [1, 2, 2, 3, 3, 3]:
+        sketch.update(value)
+    assert sketch.mode() == 3
+    assert sketch.counts == {1: 1, 2: 2, 3: 3}
+    assert sketch.offset == 0
+
+
+def test_frequency_sketch_keeps_heavy_hitter_and_bounds_counts():
+    capacity = 32
+    values = [0] * 5000 + list(range(1, 20001))
+    random.shuffle(values)
+    sketch = main.FrequencySketch(capacity)
+    for value in values:
+        sketch.update(value)
+    assert len(sketch.counts) <= capacity
+    assert sketch.mode() == 0
+    # Misra-Gries counts are low by at most the accumulated offset
+    assert 5000 - sketch.offset <= sketch.counts[0] <= 5000
+
+
+def test_frequency_sketch_merge():
+    left, right = main.FrequencySketch(8), main.FrequencySketch(8)
+    left.update('a', 5)
+    left.update('b', 1)
+    right.update('b', 7)
+    assert left.merge(right).mode() == 'b'
+    assert left.counts['b'] == 8
+
+
+def test_frequency_sketch_all_distinct_beyond_capacity_keeps_a_mode():
+    # Every counter ties, so each purge empties the sketch
+    sketch = main.FrequencySketch(capacity=16)
+    for value in range(1000):
+        sketch.update(value)
+    assert sketch.mode() is not None
+    assert main.calculate_stats(list(range(1025)))['mode'] is not None
+
+    merged = main.FrequencySketch(capacity=16).merge(sketch)
+    assert merged.mode() is not None
+
+
+def test_frequency_sketch_round_trips_through_column_state():
+    state = main.ColumnState().update_many(range(2000))
+    restored = main.ColumnState.from_dict(json.loads(json.dumps(state.to_dict())))
+    assert restored.result()['mode'] == state.result()['mode'] is not None
+
+
+def test_calculate_stats_mode_is_bounded():
+    values = list(range(10000)) + [42] * 50
+    stats = main.calculate_stats(values, frequency_capacity=64)
+    assert stats['mode'] == 42
+    assert stats['count'] == len(values)
+    assert main.calculate_stats([])['mode'] is None
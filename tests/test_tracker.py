@@ -0,0 +1,54 @@
+import main
+
+
+def table(fake_connection, rows_present=False):
+    return fake_connection([
+        (r"NUMERIC_PRECISION", [('a', 10, 0), ('b', None, None)]),
+        (r"information_schema\.COLUMNS", [('a', 'int'), ('b', 'varchar')]),
+        (r"information_schema\.TABLES", [('2026-01-02 00:00:00', 3, 16384, '2026-01-01 00:00:00')]),
+        (r"SELECT 1 FROM t LIMIT 1", [(1,)] if rows_present else []),
+    ])
+
+
+def test_tracking_is_off_by_default(fake_connection):
+    connection = table(fake_connection)
+    tracker = main.ColumnStateTracker(connection, 't').begin()
+    rows = [(1, 'x')]
+    assert tracker.observe(['a', 'b'], rows) is rows
+    tracker.commit()
+    assert connection.queries == []
+
+
+def test_tracked_import_saves_states_without_counting_rows(fake_connection, monkeypatch):
+    monkeypatch.setattr(main.result_cache, 'track_states', True)
+    connection = table(fake_connection)
+    tracker = main.ColumnStateTracker(connection, 't').begin()
+    assert list(tracker.observe(['a', 'b'], [(1, 'x'), (None, 'y'), (5, 'z')])) == [(1, 'x'), (None, 'y'), (5, 'z')]
+    tracker.fill('a', 3)
+    tracker.commit()
+    assert not connection.executed(r"COUNT\(\*\)")
+
+    fingerprint = main.result_cache.fingerprint(connection, 't')
+    states = main.result_cache.load_states(connection, 't', fingerprint)
+    assert list(states) == ['a']
+    assert states['a'].result()['count'] == 3
+    assert states['a'].result()['mean'] == 3
+
+
+def test_untracked_rows_drop_the_states(fake_connection, monkeypatch):
+    monkeypatch.setattr(main.result_cache, 'track_states', True)
+    connection = table(fake_connection)
+    tracker = main.ColumnStateTracker(connection, 't').begin()
+    list(tracker.observe(['a'], [(1,), (2,)]))
+    # A row written around the tracker: the states no longer add up
+    tracker.rows += 1
+    tracker.commit()
+    fingerprint = main.result_cache.fingerprint(connection, 't')
+    assert main.result_cache.load_states(connection, 't', fingerprint) is None
+
+
+def test_non_empty_table_without_states_is_not_tracked(fake_connection, monkeypatch):
+    monkeypatch.setattr(main.result_cache, 'track_states', True)
+    connection = table(fake_connection, rows_present=True)
+    tracker = main.ColumnStateTracker(connection, 't').begin()
+    assert tracker.states is None
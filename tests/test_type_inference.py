@@ -0,0 +1,79 @@
+import pytest
+
+import main
+
+
+def infer(values):
+    state = main.ColumnTypeState()
+    for value in values:
+        state.update(value)
+    return state.sql_type()
+
+
+@pytest.mark.parametrize('values, expected', [
+    (['1', '2', '-3'], 'TINYINT'),
+    (['1', '70000'], 'MEDIUMINT'),
+    (['1.5', '22.25'], 'DECIMAL(4,2)'),
+    (['1e3', '2.5'], 'DOUBLE'),
+    (['2024-01-31', '2023-12-01'], 'DATE'),
+    (['2023-02-30'], 'VARCHAR(10)'),
+    (['0526301100', '1'], 'VARCHAR(10)'),
+    (['abc', 'NA'], 'VARCHAR(3)'),
+    (['', ''], 'VARCHAR(255)'),
+    ([1, 2.5, True], 'DECIMAL(2,1)'),
+])
+def test_column_type_state_sql_type(values, expected):
+    assert infer(values) == expected
+
+
+def test_column_type_state_null_markers_fit_text_columns():
+    # Stored as-is in a text column, so "NULL" needs 4 characters
+    assert infer(['a', 'NULL']) == 'VARCHAR(4)'
+    assert infer(['7', 'NULL']) == 'TINYINT'
+
+
+def test_column_type_state_merge():
+    left, right = main.ColumnTypeState(), main.ColumnTypeState()
+    left.update('12')
+    right.update('3.125')
+    assert left.merge(right).sql_type() == 'DECIMAL(5,3)'
+
+
+def test_sanitize_column_names():
+    assert main.sanitize_column_names(['Order', 'Lot Area', 'lot_area', '', '2010', 'key']) == \
+        ['Order_', 'Lot_Area', 'lot_area_', 'column_4', 'col_2010', 'key_']
+    assert len(main.sanitize_column_names(['x' * 100])[0]) == 60
+
+
+def write_quoted_csv(tmp_path):
+    # 200 records whose note spans several lines, so byte ranges land inside quotes
+    path = tmp_path / 'notes.csv'
+    path.write_bytes(b'id,note,amount\n' + b''.join(
+        b'%d,"line one\nline two, %d\nline three",%d.5\n' % (idx, idx, idx) for idx in range(200)
+    ))
+    return str(path)
+
+
+def test_chunk_ending_inside_a_quoted_newline_gives_up(tmp_path):
+    path = write_quoted_csv(tmp_path)
+    data = open(path, 'rb').read()
+    inside = data.index(b'line two, 50')
+    assert main.infer_chunk_types(path, data.index(b'\n') + 1, inside, 3) is None
+    assert main.infer_chunk_types(path, data.index(b'\n') + 1, len(data), 3) is not None
+
+
+def test_parallel_inference_falls_back_to_a_serial_read(tmp_path):
+    path = write_quoted_csv(tmp_path)
+    header, states = main.infer_csv_column_states(path, workers=4, chunk_bytes=512)
+    assert header == ['id', 'note', 'amount']
+    assert [state.sql_type() for state in states] == ['SMALLINT', 'VARCHAR(33)', 'DECIMAL(4,1)']
+
+
+def test_load_data_matches_the_file_line_ending(fake_connection, tmp_path):
+    for ending, terminator in ((b'\r\n', r"'\r\n'"), (b'\n', r"'\n'")):
+        path = tmp_path / 'rows.csv'
+        path.write_bytes(b'a,b' + ending + b'1,x' + ending)
+        connection = fake_connection([(r"^LOAD DATA", 1)])
+        cursor = connection.cursor()
+        main.load_data_infile(connection, cursor, 't', str(path), {'a': 'TINYINT', 'b': 'VARCHAR(1)'})
+        assert f"LINES TERMINATED BY {terminator} IGNORE 1 LINES" in connection.executed(r"^LOAD DATA")[0][0]